@@ -0,0 +1,346 @@
+# benchmarks/frame_bench.py
+"""
+Headless frame-time benchmark for every screen.
+
+Runs the Game under SDL's dummy video driver, drives each screen for a
+fixed number of uncapped frames and reports per-phase percentiles as JSON.
+Each render backend gets its own pass; the texture backend uses SDL's
+software renderer, so both run on machines without a GPU.
+
+    python -m benchmarks.frame_bench --frames 600 --output bench.json
+    python -m benchmarks.frame_bench --baseline bench.json --threshold 0.15
+    python -m benchmarks.frame_bench --render-backend texture --render-mode full
+"""
+import argparse
+import atexit
+import json
+import logging
+import math
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+PHASES = ('events', 'update', 'draw', 'flip', 'frame')
+
+
+def key_event(char):
+    key = pygame.K_RETURN if char == "\r" else ord(char)
+    return pygame.event.Event(pygame.KEYDOWN, key=key, unicode=char, mod=0, scancode=0)
+
+
+def typed_events(char):
+    """Events SDL sends for one keypress: KEYDOWN, plus TEXTINPUT for printable keys."""
+    if char == "\r":
+        return [key_event(char)]
+    return [key_event(char), pygame.event.Event(pygame.TEXTINPUT, text=char)]
+
+
+def motion_event(pos):
+    return pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0))
+
+
+def hover_events(buttons):
+    """Alternate the pointer between the given buttons and empty space."""
+    targets = [button.rect.center for button in buttons] + [(5, 760)]
+
+    def events_for(frame):
+        return [motion_event(targets[frame % len(targets)])]
+    return events_for
+
+
+def setup_player_select(game):
+    game.change_screen("player_select")
+    screen = game.current_screen
+    return hover_events([screen.ellie_button, screen.vivi_button, screen.back_button])
+
+
+def setup_menu(game):
+    game.change_screen("menu", player="ELLIE")
+    screen = game.current_screen
+    return hover_events([button for button, _ in screen.game_buttons])
+
+
+def make_game_setup(game_type):
+    def setup(game):
+        game.change_screen("game", game_type=game_type, player="VIVI")
+        return hover_events([game.current_screen.start_button])
+    return setup
+
+
+def setup_spelling(game):
+    game.change_screen("game", game_type="spelling", player="ELLIE")
+    screen = game.current_screen
+    screen.is_game_active = True
+    screen.start_button.visible = False
+    screen.setup_game()
+    screen.input_active = True
+    word = "orchestra"
+
+    def events_for(frame):
+        # Type a word, submit it, and repeat so feedback is always showing
+        position = frame % (len(word) + 1)
+        char = "\r" if position == len(word) else word[position]
+        return typed_events(char)
+    return events_for
+
+
+def setup_math(game):
+    game.change_screen("game", game_type="math", player="ELLIE")
+    screen = game.current_screen
+    screen.is_game_active = True
+    screen.start_button.visible = False
+    screen.setup_game()
+    typed = []
+
+    def events_for(frame):
+        # Type each answer and submit it, so a new problem is drawn every few frames
+        if not typed:
+            typed.extend(str(screen.problem.answer) + "\r")
+        return typed_events(typed.pop(0))
+    return events_for
+
+
+SCENARIOS = {
+    'player_select': setup_player_select,
+    'menu': setup_menu,
+    'game_math': make_game_setup("math"),
+    'game_science': make_game_setup("science"),
+    'spelling_active': setup_spelling,
+    'math_active': setup_math,
+}
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(pct / 100.0 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        'p50': round(percentile(ordered, 50), 4),
+        'p95': round(percentile(ordered, 95), 4),
+        'p99': round(percentile(ordered, 99), 4),
+        'mean': round(sum(ordered) / len(ordered), 4) if ordered else 0.0
+    }
+
+
+def run_frame(game, events_for, frame, timings=None):
+    """Run one uncapped frame, recording per-phase milliseconds."""
+    for event in events_for(frame):
+        pygame.event.post(event)
+
+    start = time.perf_counter()
+    game.process_events(pygame.event.get())
+    after_events = time.perf_counter()
+    game.current_screen.update()
+    after_update = time.perf_counter()
+    rects = game.render_frame()
+    after_draw = time.perf_counter()
+    game.flip(rects)
+    game.current_screen.on_presented()
+    end = time.perf_counter()
+
+    if timings is not None:
+        timings['events'].append((after_events - start) * 1000)
+        timings['update'].append((after_update - after_events) * 1000)
+        timings['draw'].append((after_draw - after_update) * 1000)
+        timings['flip'].append((end - after_draw) * 1000)
+        timings['frame'].append((end - start) * 1000)
+
+
+def run_scenario(game, setup, frames, warmup):
+    events_for = setup(game)
+    for frame in range(warmup):
+        run_frame(game, events_for, frame)
+    input_field = getattr(game.current_screen, 'input_field', None)
+    if input_field is not None:
+        input_field.latencies.clear()
+
+    # Timing pass
+    timings = {phase: [] for phase in PHASES}
+    block_deltas = []
+    for frame in range(frames):
+        blocks_before = sys.getallocatedblocks()
+        run_frame(game, events_for, frame, timings)
+        block_deltas.append(sys.getallocatedblocks() - blocks_before)
+
+    # Allocation pass, kept separate so tracing does not skew timings
+    alloc_frames = min(frames, 200)
+    alloc_bytes = []
+    tracemalloc.start()
+    try:
+        for frame in range(alloc_frames):
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            run_frame(game, events_for, frame)
+            _, peak = tracemalloc.get_traced_memory()
+            alloc_bytes.append(peak - base)
+    finally:
+        tracemalloc.stop()
+
+    result = {phase: summarize(samples) for phase, samples in timings.items()}
+    if input_field is not None:
+        result['input_latency_ms'] = input_field.get_latency_stats()
+    result['net_blocks_per_frame'] = round(sum(block_deltas) / len(block_deltas), 2)
+    result['alloc_peak_bytes_per_frame'] = summarize(alloc_bytes)
+    return result
+
+
+TRANSITION_ROUTE = [
+    ("menu", {'player': "ELLIE"}),
+    ("game", {'game_type': "spelling", 'player': "ELLIE"}),
+    ("menu", {'player': "ELLIE"}),
+    ("game", {'game_type': "math", 'player': "ELLIE"}),
+    ("menu", {'player': "ELLIE"}),
+    ("player_select", {}),
+]
+
+
+def measure_transitions(game, rounds):
+    """Time Game.change_screen on a cold screen cache and then warm."""
+    game.screens.clear()
+    cold, warm = [], []
+    for round_index in range(rounds):
+        for screen_name, kwargs in TRANSITION_ROUTE:
+            game.change_screen(screen_name, **kwargs)
+            game.present()
+            (cold if round_index == 0 else warm).append(game.last_transition_ms)
+    return {'cold_ms': summarize(cold), 'warm_ms': summarize(warm)}
+
+
+def measure_button_grid(columns=20, rows=20, events=10000):
+    """Time hover hit testing on a large grid of buttons."""
+    from utils.button_manager import Button, ButtonGroup
+
+    group = ButtonGroup()
+    for row in range(rows):
+        for column in range(columns):
+            group.add(Button(pygame.Rect(column * 50, row * 38, 46, 34), "", (255, 255, 255)))
+
+    positions = [motion_event(((i * 37) % 1000, (i * 53) % 760)) for i in range(events)]
+    start = time.perf_counter()
+    for event in positions:
+        group.handle_event(event)
+        group.changed.clear()
+    elapsed = time.perf_counter() - start
+    return {'buttons': columns * rows, 'us_per_event': round(elapsed / events * 1e6, 3)}
+
+
+def compare(results, baseline, threshold, min_delta_ms):
+    """Return a list of regressions in frame p95 against a baseline run."""
+    regressions = []
+    for name, current in results['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous:
+            continue
+        old, new = previous['frame']['p95'], current['frame']['p95']
+        if new > old * (1 + threshold) and new - old > min_delta_ms:
+            regressions.append(f"{name}: frame p95 {old:.3f} ms -> {new:.3f} ms")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Headless frame-time benchmark")
+    parser.add_argument('--frames', type=int, default=600, help="Measured frames per scenario")
+    parser.add_argument('--warmup', type=int, default=60, help="Unmeasured frames per scenario")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable, default all)")
+    parser.add_argument('--render-mode', choices=['dirty', 'full', 'both'], default='both')
+    parser.add_argument('--render-backend', choices=['surface', 'texture', 'both'], default='both',
+                        help="Software blits, SDL textures, or both side by side")
+    parser.add_argument('--transition-rounds', type=int, default=20,
+                        help="Navigation loops used to time screen transitions")
+    parser.add_argument('--output', default='frame_bench.json', help="Where to write JSON results")
+    parser.add_argument('--baseline', help="Earlier results to compare against")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="Allowed relative frame p95 increase before failing")
+    parser.add_argument('--min-delta-ms', type=float, default=0.1,
+                        help="Ignore regressions smaller than this many milliseconds")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Benchmark points, review state and answer logs go to a scratch
+    # directory, never the real saves or a score server
+    save_dir = tempfile.mkdtemp(prefix="ellievivi-bench-")
+    atexit.register(shutil.rmtree, save_dir, True)
+    os.environ["ELLIEVIVI_SAVE_DIR"] = save_dir
+    os.environ["ELLIEVIVI_SCORE_BACKEND"] = "json"
+
+    from main import Game
+
+    modes = ['dirty', 'full'] if args.render_mode == 'both' else [args.render_mode]
+    backends = ['surface', 'texture'] if args.render_backend == 'both' else [args.render_backend]
+    names = args.scenario or list(SCENARIOS)
+    results = {
+        'meta': {
+            'frames': args.frames,
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'video_driver': os.environ.get("SDL_VIDEODRIVER"),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')
+        },
+        'scenarios': {}
+    }
+
+    game = None
+    try:
+        for backend in backends:
+            if game is not None:
+                # pygame stays initialized for the next backend; only the window goes
+                game.screen.close()
+            game = Game(render_backend=backend)
+            logging.getLogger("EllieViviGame").setLevel(logging.WARNING)
+            # Surface keys stay unsuffixed so older baselines still compare
+            suffix = "" if backend == 'surface' else f"/{backend}"
+            for mode in modes:
+                game.render_mode = mode
+                for name in names:
+                    key = f"{name}/{mode}{suffix}"
+                    results['scenarios'][key] = run_scenario(game, SCENARIOS[name], args.frames, args.warmup)
+                    frame = results['scenarios'][key]['frame']
+                    print(f"{key:28s} p50 {frame['p50']:7.3f}  p95 {frame['p95']:7.3f}  p99 {frame['p99']:7.3f} ms")
+            transitions = measure_transitions(game, args.transition_rounds)
+            results['transitions' + suffix] = transitions
+            warm = transitions['warm_ms']
+            label = f"transitions{suffix} (warm)"
+            print(f"{label:28s} p50 {warm['p50']:7.3f}  p95 {warm['p95']:7.3f}  p99 {warm['p99']:7.3f} ms")
+            results['canvas' + suffix] = game.screen.get_stats()
+        results['button_grid'] = measure_button_grid()
+        print(f"{'button grid hit test':28s} {results['button_grid']['us_per_event']:.3f} us/event "
+              f"({results['button_grid']['buttons']} buttons)")
+    finally:
+        if game is not None:
+            game.cleanup()
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=4)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
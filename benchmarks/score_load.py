@@ -0,0 +1,233 @@
+# benchmarks/score_load.py
+"""
+Load test for the score server: hundreds of simulated kiosks on one machine.
+
+Starts python -m utils.score_server on a scratch database (or uses
+--address), then runs every kiosk as a ScoreClient on one event loop.
+Each kiosk has children answering at random and refreshes their stats
+periodically. With --outage the server is killed partway through and
+restarted, so batches go through the outbox. At the end every player's
+lifetime score on the server must equal the points the kiosks added.
+
+    python -m benchmarks.score_load --clients 300 --duration 20
+    python -m benchmarks.score_load --clients 200 --outage 3 --output score_load.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date
+from pathlib import Path
+
+from utils.score_client import AsyncScoreClient, ScoreClient
+
+GAMES = ("spelling", "math", "science")
+
+
+def percentiles(samples):
+    if not samples:
+        return {'count': 0}
+    ordered = sorted(samples)
+
+    def pick(fraction):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))], 3)
+    return {'count': len(ordered), 'p50': pick(0.5), 'p95': pick(0.95), 'p99': pick(0.99), 'max': round(ordered[-1], 3)}
+
+
+class TimedScoreClient(ScoreClient):
+    """ScoreClient that records how long each batch takes to be acknowledged."""
+    def __init__(self, *args, send_ms, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.send_ms = send_ms
+
+    async def _send(self, seq, adds):
+        start = time.perf_counter()
+        sent = await super()._send(seq, adds)
+        if sent:
+            self.send_ms.append((time.perf_counter() - start) * 1000)
+        return sent
+
+
+class ServerProcess:
+    """python -m utils.score_server in a child process."""
+    def __init__(self, db_path, address="127.0.0.1:0"):
+        self.db_path = db_path
+        self.address = address
+        self.process = None
+
+    def start(self):
+        root = Path(__file__).resolve().parent.parent
+        env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1",
+                   PYTHONPATH=os.pathsep.join(filter(None, [str(root), os.environ.get("PYTHONPATH")])))
+        # Run from the scratch directory so the server's logs land there too
+        output = self.db_path.with_name("server.out")
+        with open(output, 'w') as f:
+            self.process = subprocess.Popen(
+                [sys.executable, "-m", "utils.score_server", "--address", self.address, "--db", str(self.db_path)],
+                stdout=f, stderr=subprocess.STDOUT, env=env, cwd=self.db_path.parent
+            )
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline and self.process.poll() is None:
+            for line in output.read_text().splitlines():
+                if line.startswith("Score server listening on "):
+                    # Keep the port across restarts
+                    self.address = line.split()[4].rstrip(",")
+                    return self
+            time.sleep(0.05)
+        raise RuntimeError(f"Score server did not start: {output.read_text()[-500:]}")
+
+    def kill(self):
+        self.process.kill()
+        self.process.wait()
+
+    def stop(self):
+        self.process.terminate()
+        self.process.wait()
+
+
+async def kiosk(client, players, deadline, answer_interval, stats_interval, added, stats_ms, rng):
+    """One kiosk: children answer at random and their stats are re-read now and then."""
+    day = str(date.today())
+    next_stats = time.monotonic() + rng.uniform(0, stats_interval)
+    while time.monotonic() < deadline:
+        await asyncio.sleep(rng.expovariate(1 / answer_interval))
+        player, game_type = rng.choice(players), rng.choice(GAMES)
+        client.add_points(player, game_type, day, 1)
+        added[(player, game_type)] += 1
+        if time.monotonic() >= next_stats:
+            next_stats += stats_interval
+            start = time.perf_counter()
+            try:
+                await client.fetch_stats(player, game_type, day)
+                stats_ms.append((time.perf_counter() - start) * 1000)
+            except (OSError, asyncio.TimeoutError, EOFError, ValueError):
+                pass
+
+
+async def run_load(args, address, outbox_dir, server=None):
+    rng = random.Random(args.seed)
+    players = [f"CHILD{i:03}" for i in range(args.players)]
+    added = Counter()
+    send_ms, stats_ms = [], []
+    clients = [
+        TimedScoreClient(address, client_id=f"kiosk-{i:03}", outbox_dir=outbox_dir, pool_size=args.pool_size,
+                         send_ms=send_ms)
+        for i in range(args.clients)
+    ]
+    for client in clients:
+        await client.attach()
+
+    start = time.monotonic()
+    deadline = start + args.duration
+    tasks = [
+        asyncio.create_task(kiosk(
+            client, rng.sample(players, min(len(players), 8)), deadline, args.answer_interval,
+            args.stats_interval, added, stats_ms, random.Random(rng.random())
+        ))
+        for client in clients
+    ]
+
+    outage = None
+    if server is not None and args.outage:
+        await asyncio.sleep(args.duration / 3)
+        server.kill()
+        outage = {'killed_at_s': round(time.monotonic() - start, 2)}
+        await asyncio.sleep(args.outage)
+        server.start()
+        outage['restarted_at_s'] = round(time.monotonic() - start, 2)
+
+    await asyncio.gather(*tasks)
+    elapsed = time.monotonic() - start
+    # Server outages leave batches in the outboxes; closing drains them
+    for client in clients:
+        client._retry_at = 0.0
+    await asyncio.gather(*(client.aclose() for client in clients))
+
+    checker = AsyncScoreClient(address)
+    day = str(date.today())
+    mismatches = {}
+    for (player, game_type), points in sorted(added.items()):
+        response = await checker.request({'op': 'stats', 'player': player, 'game_type': game_type, 'day': day})
+        if response['stats']['lifetime_score'] != points:
+            mismatches[f"{player}/{game_type}"] = {'added': points, 'server': response['stats']['lifetime_score']}
+    info = await checker.request({'op': 'info'})
+    await checker.close()
+
+    totals = Counter()
+    for client in clients:
+        totals.update(client.counters)
+    points = sum(added.values())
+    return {
+        'clients': args.clients,
+        'players': args.players,
+        'seconds': round(elapsed, 2),
+        'add_points_calls': points,
+        'add_points_per_s': round(points / elapsed, 1),
+        'client': dict(totals, connections=sum(client.connection.connects for client in clients)),
+        'server': info,
+        'points_per_batch': round(points / max(1, totals['batches_sent']), 2),
+        'batches_per_commit': round(info['batches'] / max(1, info['commits']), 2),
+        'batch_ack_ms': percentiles(send_ms),
+        'stats_ms': percentiles(stats_ms),
+        'outage': outage,
+        'mismatches': mismatches
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Score server load test")
+    parser.add_argument("--clients", type=int, default=300, help="Simulated kiosks")
+    parser.add_argument("--players", type=int, default=120, help="Distinct children")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds of load")
+    parser.add_argument("--answer-interval", type=float, default=0.5, help="Mean seconds between answers per kiosk")
+    parser.add_argument("--stats-interval", type=float, default=2.0, help="Seconds between stats reads per kiosk")
+    parser.add_argument("--pool-size", type=int, default=2, help="Connections per kiosk")
+    parser.add_argument("--outage", type=float, default=0.0, help="Kill the server for this many seconds mid-run")
+    parser.add_argument("--address", help="Use a running server instead of starting one (no --outage)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="score_load.json")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory(prefix="ellievivi-score-load-") as scratch:
+        scratch = Path(scratch)
+        server = None
+        address = args.address
+        if address is None:
+            server = ServerProcess(scratch / "scores.db").start()
+            address = server.address
+        try:
+            results = asyncio.run(run_load(args, address, scratch / "outbox", server))
+        finally:
+            if server is not None:
+                server.stop()
+
+    print(f"{results['clients']} kiosks, {results['add_points_calls']} points in {results['seconds']} s "
+          f"({results['add_points_per_s']}/s)")
+    print(f"  {results['points_per_batch']} points per batch, {results['batches_per_commit']} batches per commit, "
+          f"{results['server']['commits']} commits")
+    for name in ('batch_ack_ms', 'stats_ms'):
+        timing = results[name]
+        if timing['count']:
+            print(f"  {name:14s} p50 {timing['p50']:8.3f}  p95 {timing['p95']:8.3f}  p99 {timing['p99']:8.3f} ms")
+    if results['outage']:
+        print(f"  outage {results['outage']}, {results['client']['outboxed']} batches went through the outbox")
+    print(f"  totals {'MISMATCH ' + str(len(results['mismatches'])) if results['mismatches'] else 'match'}")
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=4)
+    print(f"Results written to {args.output}")
+    if results['mismatches']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 # config.py
 
+import os
+import platform
 import pygame
 from pathlib import Path
 
@@ -19,5 +21,148 @@ COLORS = {
 
 # File paths
 BASE_DIR = Path(__file__).parent
-SAVE_DIR = BASE_DIR / "saves"
-SAVE_DIR.mkdir(exist_ok=True)
+# Created by the first save, not on import; replays point it at a scratch copy
+SAVE_DIR = Path(os.environ.get("ELLIEVIVI_SAVE_DIR", BASE_DIR / "saves"))
+
+# Rendered text cache
+TEXT_CACHE_MAX_BYTES = 8 * 1024 * 1024
+TEXT_CACHE_MAX_ENTRIES = 512
+
+# Fonts loaded once at startup: (path, size, bold, italic), None = default font
+FONT_SIZES = {
+    'large': 74,
+    'medium': 48,
+    'small': 36
+}
+PRELOAD_FONTS = [(None, size, False, False) for size in FONT_SIZES.values()]
+
+# Rendering mode: "dirty" redraws and pushes only changed regions,
+# "full" repaints the whole window and flips every frame
+RENDER_MODE = "dirty"
+
+# Render backend: "surface" blits in software onto the display surface,
+# "texture" uploads static surfaces once and draws them with an SDL renderer
+RENDER_BACKEND = os.environ.get("ELLIEVIVI_RENDER_BACKEND", "surface")
+TEXTURE_ACCELERATED = 0  # 0 = SDL's software renderer, -1 = prefer a GPU renderer
+TEXTURE_SHAPE_CACHE_ENTRIES = 128  # rounded rects rasterized for the texture backend
+
+# Adaptive frame scheduling: after IDLE_AFTER_MS without input and with
+# nothing left to redraw, the main loop blocks until input or a timer
+IDLE_AFTER_MS = 500
+IDLE_MAX_WAIT_MS = 1000
+
+# Posted by asset loader threads when an asset finishes decoding
+ASSET_LOADED_EVENT = pygame.USEREVENT + 1
+
+# Event types the game reacts to; everything else is dropped by SDL
+ALLOWED_EVENTS = [
+    pygame.QUIT,
+    pygame.KEYDOWN,
+    pygame.TEXTINPUT,
+    pygame.TEXTEDITING,
+    pygame.MOUSEMOTION,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEBUTTONUP,
+    pygame.VIDEOEXPOSE,
+    pygame.WINDOWEXPOSED,
+    ASSET_LOADED_EVENT
+]
+
+# Debug profiler overlay
+PROFILER_HOTKEY = pygame.K_F3
+PROFILER_WINDOW = 120  # frames of history
+PROFILER_REFRESH_MS = 250
+
+# Number of game screens kept warm for back-and-forth navigation
+GAME_SCREEN_CACHE_SIZE = 4
+
+# Logging: records are written by a background thread in batches
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUP_COUNT = 3
+LOG_BATCH_SIZE = 64
+LOG_FRAME_INTERVAL = 5.0  # seconds between repeats of a per-frame message
+
+# Cell size of the spatial grid used for button hit testing
+BUTTON_GRID_CELL_SIZE = 64
+
+# Score persistence: "snapshot" rewrites the save file on every change,
+# "journal" appends deltas and flushes them from a background thread
+SCORE_PERSISTENCE = "journal"
+SCORE_FLUSH_INTERVAL = 1.0  # seconds
+SCORE_FLUSH_BATCH = 32
+SCORE_COMPACT_EVERY = 500  # journal entries
+
+# Score backend: "json" (one save file per player and game), "sqlite", or
+# "remote" (a python -m utils.score_server shared by every kiosk)
+SCORE_BACKEND = os.environ.get("ELLIEVIVI_SCORE_BACKEND", "json")
+SCORE_DB_PATH = SAVE_DIR / "scores.db"
+
+# Score server: "host:port" or a Unix socket path
+SCORE_SERVER_ADDRESS = os.environ.get("ELLIEVIVI_SCORE_SERVER", "127.0.0.1:8765")
+SCORE_SERVER_COMMIT_INTERVAL = 0.05  # seconds of adds coalesced into one commit
+# Names this kiosk to the server, which uses it to drop resent batches;
+# it must differ between kiosks sharing a server
+SCORE_CLIENT_ID = os.environ.get("ELLIEVIVI_KIOSK_ID", platform.node() or "kiosk")
+SCORE_CLIENT_POOL_SIZE = 4  # connections each kiosk keeps open
+SCORE_CLIENT_TIMEOUT = 2.0  # seconds
+SCORE_CLIENT_FLUSH_INTERVAL = 0.25  # seconds of add_points coalesced into one request
+SCORE_CLIENT_CACHE_TTL = 5.0  # seconds before cached stats are refreshed
+SCORE_CLIENT_RETRY_INTERVAL = 5.0  # seconds between resends while the server is down
+# Batches the server has not acknowledged, kept until it comes back
+SCORE_OUTBOX_DIR = SAVE_DIR / "outbox"
+
+# Minimum seconds between save directory re-scans by the stats service
+STATS_REFRESH_INTERVAL = 2.0
+
+# Spelling word bank source; the game reads it from the content pack, and
+# python -m games.spelling.word_bank compiles it to a standalone .wbk
+WORD_BANK_SOURCE = BASE_DIR / "games" / "spelling" / "word_banks" / "words.tsv"
+
+# Content pack: authoring sources compiled into one memory-mapped file,
+# rebuilt on first use when a source is newer. Section name -> source.
+CONTENT_DIR = BASE_DIR / "content"
+CONTENT_PACK = CONTENT_DIR / "content.pak"
+CONTENT_SOURCES = {
+    'spelling': WORD_BANK_SOURCE,
+    'science': CONTENT_DIR / "science.csv",
+    'math': CONTENT_DIR / "math.json"
+}
+
+# Spelling review (Leitner boxes): answers until a word in each box is due again.
+# A missed word drops to the first box; a correct answer moves it up one box.
+REVIEW_INTERVALS = (3, 8, 20, 50, 120, 300)
+REVIEW_NEW_WORD_ATTEMPTS = 8
+
+# Spelling answers within this many edits of the word count as near misses
+FUZZY_MAX_EDITS = 2
+
+# Per-answer analytics: one file of column chunks per month, summarized by
+# python -m utils.answer_report
+ANSWER_LOG_DIR = SAVE_DIR / "answers"
+ANSWER_LOG_CHUNK_ROWS = 256  # answers buffered before a chunk is appended
+ANSWER_LATENCY_BUCKET_MS = 500  # latency histogram bucket width
+ANSWER_LATENCY_MAX_MS = 30000  # slower answers share the last bucket
+
+# Math problem bands per player live in the content pack's "math" section
+MATH_POOL_SIZE = 512  # problems kept ready for the game screen
+MATH_POOL_LOW_WATER = 128  # the background thread refills below this
+MATH_BATCH_SIZE = 256  # new problems generated per refill step
+
+# Assets listed in the manifest are decoded on a thread pool at startup
+ASSET_DIR = BASE_DIR / "assets"
+ASSET_MANIFEST = ASSET_DIR / "manifest.json"
+ASSET_WORKERS = 4
+ASSET_CONVERT_BUDGET_MS = 4  # main-thread convert() time per frame
+
+# Import every registered screen module in the background once player select shows
+SCREEN_PREWARM = True
+
+# Text fields
+TEXT_FIELD_MAX_LENGTH = 32
+TEXT_FIELD_PADDING = 12
+TEXT_FIELD_CARET_BLINK_MS = 530  # 0 keeps the caret solid
+TEXT_FIELD_KEY_REPEAT = (400, 35)  # delay and interval in ms while a field has focus
+TEXT_FIELD_LATENCY_WINDOW = 240  # input-to-display samples kept per field
+
+# Session recording (python main.py --record FILE, python -m utils.session_recording FILE)
+SESSION_SNAPSHOT_PATTERN = "*_spelling_review.bin"  # save files that change gameplay, embedded in recordings
@@ -0,0 +1,434 @@
+# games/content_pack.py
+"""
+Compiled content packs: every game's content in one memory-mapped file.
+
+Authoring sources compile into named sections by file type:
+    .tsv           spelling word bank (the .wbk image, see games.spelling.word_bank)
+    .csv           table of strings, the first row naming the columns
+    .json / .yaml  document, stored as compact JSON
+
+Opening a pack maps the file and reads the header and section directory,
+so it takes the same time for any pack size. A section is checked and
+decoded the first time it is asked for. Table cells are ids into a string
+table shared by the whole pack, so repeated values are stored once.
+
+    python -m games.content_pack compile [--output content/content.pak]
+    python -m games.content_pack info [content/content.pak]
+
+File layout (little endian):
+    header     magic, version, section count, then offset, size and
+               CRC-32 of the directory and of the string table
+    directory  per section: u16 name length, UTF-8 name, u16 kind,
+               u64 offset, u64 size, u32 CRC-32 of the section
+    strings    u32 count, (count + 1) u32 offsets into the UTF-8 data that follows
+    sections   each starting on an 8-byte boundary
+    table      u32 rows, u32 columns, column name ids, then row-major cell ids
+"""
+import argparse
+import csv
+import json
+import logging
+import mmap
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config import CONTENT_PACK, CONTENT_SOURCES
+from games.spelling.word_bank import WordBank, build_word_bank, parse_source
+
+MAGIC = b"EVP1"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIQQIQQI")
+ENTRY = struct.Struct("<HQQI")
+NAME_LENGTH = struct.Struct("<H")
+COUNT = struct.Struct("<I")
+TABLE_HEADER = struct.Struct("<II")
+
+KIND_WORD_BANK = 1
+KIND_TABLE = 2
+KIND_DOCUMENT = 3
+KIND_NAMES = {KIND_WORD_BANK: "word bank", KIND_TABLE: "table", KIND_DOCUMENT: "document"}
+
+
+def _pad(data: bytearray, alignment: int = 8):
+    data += bytes(-len(data) % alignment)
+
+
+class PackBuilder:
+    """Collects sections and strings, then encodes the pack."""
+    def __init__(self):
+        self.sections = []  # (name, kind, bytes)
+        self._strings: Dict[str, int] = {}
+
+    def intern(self, text: str) -> int:
+        """Id of a string in the shared table, adding it if new."""
+        string_id = self._strings.get(text)
+        if string_id is None:
+            string_id = self._strings[text] = len(self._strings)
+        return string_id
+
+    def add_word_bank(self, name: str, image: bytes):
+        self.sections.append((name, KIND_WORD_BANK, bytes(image)))
+
+    def add_table(self, name: str, columns: List[str], rows: List[List[str]]):
+        ids = [self.intern(column) for column in columns]
+        for line_number, row in enumerate(rows, 2):
+            if len(row) != len(columns):
+                raise ValueError(f"{name}: row {line_number} has {len(row)} fields, expected {len(columns)}")
+            ids.extend(self.intern(value) for value in row)
+        data = TABLE_HEADER.pack(len(rows), len(columns)) + struct.pack(f"<{len(ids)}I", *ids)
+        self.sections.append((name, KIND_TABLE, data))
+
+    def add_document(self, name: str, document: Any):
+        data = json.dumps(document, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        self.sections.append((name, KIND_DOCUMENT, data))
+
+    def build(self) -> bytes:
+        encoded = [text.encode('utf-8') for text in self._strings]
+        offsets = [0]
+        for value in encoded:
+            offsets.append(offsets[-1] + len(value))
+        strings = bytearray(COUNT.pack(len(encoded)) + struct.pack(f"<{len(offsets)}I", *offsets))
+        strings += b"".join(encoded)
+
+        directory_size = sum(NAME_LENGTH.size + len(name.encode('utf-8')) + ENTRY.size for name, _, _ in self.sections)
+        directory_offset = HEADER.size
+        strings_offset = directory_offset + directory_size
+        strings_offset += -strings_offset % 8
+
+        body = bytearray(strings)
+        _pad(body)
+        directory = bytearray()
+        for name, kind, data in self.sections:
+            encoded_name = name.encode('utf-8')
+            directory += NAME_LENGTH.pack(len(encoded_name)) + encoded_name
+            directory += ENTRY.pack(kind, strings_offset + len(body), len(data), zlib.crc32(data))
+            body += data
+            _pad(body)
+
+        header = HEADER.pack(
+            MAGIC, VERSION, 0, len(self.sections),
+            directory_offset, len(directory), zlib.crc32(directory),
+            strings_offset, len(strings), zlib.crc32(strings)
+        )
+        gap = bytes(strings_offset - directory_offset - len(directory))
+        return bytes(header + directory + gap + body)
+
+
+def _read_yaml(path: Path):
+    try:
+        import yaml
+    except ImportError:
+        raise ValueError(f"{path}: YAML sources need PyYAML installed") from None
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+
+def build_content_pack(sources: Dict[str, Path]) -> bytes:
+    """Encode a pack from named authoring sources, typed by file suffix."""
+    builder = PackBuilder()
+    for name, source in sources.items():
+        source = Path(source)
+        suffix = source.suffix.lower()
+        if suffix == ".tsv":
+            builder.add_word_bank(name, build_word_bank(parse_source(source)))
+        elif suffix == ".csv":
+            with open(source, 'r', encoding='utf-8', newline='') as f:
+                rows = [row for row in csv.reader(f) if row and not row[0].startswith("#")]
+            if not rows:
+                raise ValueError(f"{source}: missing header row")
+            builder.add_table(name, rows[0], rows[1:])
+        elif suffix == ".json":
+            with open(source, 'r', encoding='utf-8') as f:
+                builder.add_document(name, json.load(f))
+        elif suffix in (".yaml", ".yml"):
+            builder.add_document(name, _read_yaml(source))
+        else:
+            raise ValueError(f"{source}: unsupported content source type")
+    return builder.build()
+
+
+def compile_content_pack(sources: Dict[str, Path], target: Path) -> Path:
+    """Compile sources to a pack file, replacing it atomically."""
+    data = build_content_pack(sources)
+    target = Path(target)
+    tmp_path = target.with_name(target.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    tmp_path.replace(target)
+    return target
+
+
+class Table:
+    """Rows of strings from a table section, decoded one row at a time."""
+    def __init__(self, pack: "ContentPack", buffer):
+        self._pack = pack
+        self._buffer = buffer
+        self.row_count, column_count = TABLE_HEADER.unpack_from(buffer, 0)
+        self._row = struct.Struct(f"<{column_count}I")
+        self.columns = [pack.string(string_id) for string_id in self._row.unpack_from(buffer, TABLE_HEADER.size)]
+        self._cells_offset = TABLE_HEADER.size + self._row.size
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    def row(self, index: int) -> Dict[str, str]:
+        if not 0 <= index < self.row_count:
+            raise IndexError(index)
+        ids = self._row.unpack_from(self._buffer, self._cells_offset + index * self._row.size)
+        return dict(zip(self.columns, map(self._pack.string, ids)))
+
+    def __iter__(self):
+        return (self.row(index) for index in range(self.row_count))
+
+    def column(self, name: str) -> List[str]:
+        position = self.columns.index(name)
+        return [
+            self._pack.string(ids[position])
+            for ids in self._row.iter_unpack(self._buffer[self._cells_offset:])
+        ]
+
+
+class ContentPack:
+    """
+    Read-only view of a compiled pack. Sections are verified against their
+    checksum and decoded on first access, then cached.
+    """
+    def __init__(self, buffer, closer=None):
+        """
+        Args:
+            buffer: Object supporting the buffer protocol holding a pack image
+            closer: Optional callable run by close(), e.g. to unmap the file
+
+        Raises:
+            ValueError: If the header or directory is damaged
+        """
+        self.buffer = memoryview(buffer)
+        self._closer = closer
+        try:
+            self.entries = self._read_directory()
+        except ValueError:
+            # Released so ContentPack.open can close the map
+            self.buffer.release()
+            raise
+
+        self._string_count = None
+        self._sections: Dict[str, Any] = {}
+        self._views = []
+        # Reentrant: decoding a table reads the string table
+        self._lock = threading.RLock()
+
+    def _read_directory(self) -> Dict[str, tuple]:
+        """Check the header and return name -> (kind, offset, size, crc)."""
+        if len(self.buffer) < HEADER.size:
+            raise ValueError("Not a content pack (too short)")
+        (magic, version, _, section_count, directory_offset, directory_size, directory_crc,
+         self._strings_offset, self._strings_size, self._strings_crc) = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a content pack (bad magic or version)")
+        entries = {}
+        with self.buffer[directory_offset:directory_offset + directory_size] as directory:
+            if len(directory) != directory_size or zlib.crc32(directory) != directory_crc:
+                raise ValueError("Content pack directory is damaged")
+            position = 0
+            for _ in range(section_count):
+                (length,) = NAME_LENGTH.unpack_from(directory, position)
+                position += NAME_LENGTH.size
+                name = bytes(directory[position:position + length]).decode('utf-8')
+                position += length
+                entries[name] = ENTRY.unpack_from(directory, position)
+                position += ENTRY.size
+        return entries
+
+    @classmethod
+    def open(cls, path) -> "ContentPack":
+        """Memory-map a compiled pack file."""
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            pack = cls(mapped)
+        except ValueError:
+            mapped.close()
+            raise
+        pack._closer = mapped.close
+        return pack
+
+    def _span(self, offset, size, crc, what):
+        view = self.buffer[offset:offset + size]
+        if len(view) != size or zlib.crc32(view) != crc:
+            raise ValueError(f"Content pack {what} is damaged")
+        return view
+
+    def string(self, string_id: int) -> str:
+        """Decode one string from the shared table, checking the table on first use."""
+        if self._string_count is None:
+            with self._lock:
+                if self._string_count is None:
+                    self._span(self._strings_offset, self._strings_size, self._strings_crc, "string table").release()
+                    (self._string_count,) = COUNT.unpack_from(self.buffer, self._strings_offset)
+        if not 0 <= string_id < self._string_count:
+            raise IndexError(string_id)
+        position = self._strings_offset + COUNT.size + string_id * COUNT.size
+        start, end = struct.unpack_from("<II", self.buffer, position)
+        data_offset = self._strings_offset + COUNT.size * (self._string_count + 2)
+        return bytes(self.buffer[data_offset + start:data_offset + end]).decode('utf-8')
+
+    def section(self, name: str, kind: Optional[int] = None):
+        """
+        Decoded section: a WordBank, Table or document.
+
+        Raises:
+            KeyError: If the pack has no such section
+            ValueError: If the section is damaged or of another kind
+        """
+        if name not in self.entries:
+            raise KeyError(f"Content pack has no section {name!r}")
+        section_kind, offset, size, crc = self.entries[name]
+        if kind is not None and section_kind != kind:
+            raise ValueError(f"Section {name!r} is not a {KIND_NAMES[kind]}")
+        section = self._sections.get(name)
+        if section is not None:
+            return section
+
+        with self._lock:
+            section = self._sections.get(name)
+            if section is not None:
+                return section
+            view = self._span(offset, size, crc, f"section {name!r}")
+            if section_kind == KIND_WORD_BANK:
+                section = WordBank(view)
+            elif section_kind == KIND_TABLE:
+                section = Table(self, view)
+            elif section_kind == KIND_DOCUMENT:
+                section = json.loads(bytes(view).decode('utf-8'))
+            else:
+                raise ValueError(f"Section {name!r} has unknown kind {section_kind}")
+            self._views.append(view)
+            self._sections[name] = section
+            return section
+
+    def word_bank(self, name: str) -> WordBank:
+        return self.section(name, KIND_WORD_BANK)
+
+    def table(self, name: str) -> Table:
+        return self.section(name, KIND_TABLE)
+
+    def document(self, name: str):
+        return self.section(name, KIND_DOCUMENT)
+
+    def close(self):
+        for section in self._sections.values():
+            if isinstance(section, WordBank):
+                section.close()
+        self._sections.clear()
+        for view in self._views:
+            view.release()
+        self._views.clear()
+        self.buffer.release()
+        if self._closer is not None:
+            self._closer()
+            self._closer = None
+
+
+_packs: Dict[Path, ContentPack] = {}
+_packs_lock = threading.Lock()
+_rebuilt = set()  # paths recompiled after a bad section, to try only once
+
+
+def _is_stale(target: Path, sources: Dict[str, Path]) -> bool:
+    if not target.exists():
+        return True
+    built = target.stat().st_mtime
+    return any(Path(source).stat().st_mtime > built for source in sources.values())
+
+
+def _open_current(path: Path, sources: Dict[str, Path]) -> Optional[ContentPack]:
+    """
+    Open a pack, or return None when it is missing, older than a source,
+    damaged, from another format version or built from other sources.
+    """
+    if _is_stale(path, sources):
+        return None
+    try:
+        pack = ContentPack.open(path)
+    except ValueError as e:
+        logging.getLogger("EllieViviGame").warning(f"Recompiling content pack {path}: {e}")
+        return None
+    if set(pack.entries) != set(sources):
+        pack.close()
+        return None
+    return pack
+
+
+def _load_locked(path: Path, sources: Dict[str, Path], rebuild: bool = False) -> ContentPack:
+    try:
+        pack = None if rebuild else _open_current(path, sources)
+        if pack is None:
+            compile_content_pack(sources, path)
+            pack = ContentPack.open(path)
+    except OSError as e:
+        # Read-only install: keep the compiled image in memory instead
+        logging.getLogger("EllieViviGame").error(f"Error compiling content pack {path}: {e}")
+        pack = ContentPack(build_content_pack(sources))
+    return pack
+
+
+def load_content_pack(path: Path = CONTENT_PACK, sources: Dict[str, Path] = CONTENT_SOURCES) -> ContentPack:
+    """
+    Shared pack for a path, recompiling it first when it is missing, older
+    than one of its sources, unreadable or built from other sources.
+    """
+    path = Path(path)
+    with _packs_lock:
+        pack = _packs.get(path)
+        if pack is None:
+            pack = _packs[path] = _load_locked(path, sources)
+        return pack
+
+
+def load_section(name: str, kind: Optional[int] = None,
+                 path: Path = CONTENT_PACK, sources: Dict[str, Path] = CONTENT_SOURCES):
+    """
+    Decoded section of the shared pack. A missing or damaged section
+    recompiles the pack once per process and is read again from the new one.
+    """
+    path = Path(path)
+    pack = load_content_pack(path, sources)
+    try:
+        return pack.section(name, kind)
+    except (KeyError, ValueError) as e:
+        with _packs_lock:
+            if _packs.get(path) is pack:
+                if path in _rebuilt:
+                    raise
+                _rebuilt.add(path)
+                logging.getLogger("EllieViviGame").warning(f"Recompiling content pack {path}: {e}")
+                # Not closed: sections already handed out still read the old mapping
+                _packs[path] = _load_locked(path, sources, rebuild=True)
+            pack = _packs[path]
+        return pack.section(name, kind)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Content pack tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    compile_parser = subparsers.add_parser("compile", help="Compile CONTENT_SOURCES into a pack")
+    compile_parser.add_argument("--output", default=str(CONTENT_PACK))
+    info_parser = subparsers.add_parser("info", help="List a pack's sections")
+    info_parser.add_argument("pack", nargs="?", default=str(CONTENT_PACK))
+    args = parser.parse_args(argv)
+
+    if args.command == "compile":
+        compile_content_pack(CONTENT_SOURCES, Path(args.output))
+        args.pack = args.output
+    pack = ContentPack.open(args.pack)
+    print(f"{args.pack}: {len(pack.buffer)} bytes")
+    for name, (kind, _, size, crc) in pack.entries.items():
+        print(f"  {name:12} {KIND_NAMES.get(kind, kind):10} {size:10} bytes  crc {crc:08x}")
+    pack.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# games/math/math_game_screen.py
+from screens.text_answer_screen import TextAnswerScreen
+from config import WINDOW_HEIGHT
+from games.math.problem_engine import ProblemEngine, band_for, band_ranges, math_bands
+
+
+def prewarm():
+    """Build every player's problem band before the game is first opened."""
+    for player in math_bands():
+        band_for(player)
+
+
+class MathGameScreen(TextAnswerScreen):
+    def __init__(self, screen, change_screen_callback, player, game_type="math"):
+        super().__init__(
+            screen,
+            change_screen_callback,
+            game_type,
+            player,
+            input_width=200,
+            # Only digits int() can read; isdigit() also passes '²'
+            allowed=str.isdecimal,
+            max_length=6
+        )
+
+        # Problems come from a pool the engine refills in the background
+        self.engine = ProblemEngine(player)
+        self.problem = None
+
+        self.logger.info(f"MathGameScreen initialized for player: {player}")
+
+    def submit_answer(self):
+        """Check the typed answer, update the score and move to the next problem."""
+        try:
+            if not self.user_input or self.problem is None:
+                return
+            problem = self.problem
+            correct = int(self.user_input) == problem.answer
+            self.record_answer(problem.text[:-2], correct)
+            if correct:
+                self.add_score(1)
+                self.show_feedback("Correct!")
+            else:
+                self.show_feedback(f"Not quite! {problem.text} {problem.answer}")
+
+            self.problem = self.engine.next_problem()
+            self.prompt_shown()
+        except Exception as e:
+            self.logger.error(f"Error checking answer: {str(e)}")
+
+    def on_discard(self):
+        """Stop the engine's refill thread once the screen is evicted."""
+        super().on_discard()
+        self.engine.close()
+
+    def static_layer_key(self):
+        """The static layer also changes with the current problem."""
+        return super().static_layer_key() + (self.problem,)
+
+    def draw_game_static(self, surface):
+        """Draw the title, the current problem and the empty input box."""
+        try:
+            super().draw_game_static(surface)
+
+            if self.problem is not None:
+                self.draw_centered_text(self.problem.text, WINDOW_HEIGHT//2 - 100, self.font_large, surface=surface)
+        except Exception as e:
+            self.frame_logger.error(f"Error drawing game: {str(e)}")
+
+    def setup_game(self):
+        """Set up a new math game."""
+        try:
+            self.engine.start()
+            self.problem = self.engine.next_problem()
+            self.prompt_shown()
+            self.reset_answer()
+            self.input_active = True
+            self.logger.info("Math game setup complete")
+        except Exception as e:
+            self.logger.error(f"Error setting up game: {str(e)}")
+
+    def get_game_instructions(self):
+        """Get math-specific instructions."""
+        operators = " ".join(band_ranges(self.player))
+        return [
+            "Solve the problem and type the answer",
+            "Press Enter to check it",
+            "Get 1 point for each correct answer!",
+            f"{self.player.title()} practices: {operators}"
+        ]
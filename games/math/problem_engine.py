@@ -0,0 +1,287 @@
+# games/math/problem_engine.py
+"""
+Arithmetic problems generated in NumPy batches.
+
+A band maps operators to operand ranges (the content pack's "math" section). Its whole
+problem space is small enough to build as arrays once: every operand
+pair for every operator, with its answer. A session walks the space in
+rounds; each round is one random permutation of it, so nothing repeats
+until every problem in the band has been asked, and drawing a batch is a
+slice.
+
+A round interleaves one random permutation per operator: each step picks
+an operator uniformly from those with problems left and takes its next
+problem. Every operator is equally likely until it runs out, so a band
+with many additions keeps mixing in its few divisions until they are all
+used, and only then repeats the larger operators among themselves.
+
+    python -m games.math.problem_engine --player ELLIE --count 100000 --seed 7 --output sheet.csv
+"""
+import argparse
+import csv
+import random
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from config import MATH_POOL_SIZE, MATH_POOL_LOW_WATER, MATH_BATCH_SIZE
+from games.content_pack import KIND_DOCUMENT, load_section
+
+OPERATORS = ('+', '-', '×', '÷')
+ADD, SUBTRACT, MULTIPLY, DIVIDE = range(len(OPERATORS))
+
+# Largest problem space a band may have; it is held in memory as arrays
+MAX_BAND_PROBLEMS = 1 << 22
+
+
+class Problem(NamedTuple):
+    left: int
+    operator: str
+    right: int
+    answer: int
+
+    @property
+    def text(self) -> str:
+        return f"{self.left} {self.operator} {self.right} ="
+
+
+class ProblemBand:
+    """Every problem one player can be asked, as parallel arrays."""
+    def __init__(self, ranges: Dict[str, List[int]]):
+        """
+        Args:
+            ranges: Operator -> inclusive (low, high) operand range
+
+        Raises:
+            ValueError: For unknown operators, empty or negative ranges,
+                or more than MAX_BAND_PROBLEMS problems
+        """
+        unknown = set(ranges) - set(OPERATORS)
+        if not ranges or unknown:
+            raise ValueError(f"Bad math band operators: {sorted(unknown) or 'none'}")
+        sizes = [high - low + 1 for low, high in ranges.values()]
+        if min(low for low, _ in ranges.values()) < 0 or min(sizes) < 1 or sum(n * n for n in sizes) > MAX_BAND_PROBLEMS:
+            raise ValueError(f"Bad math band ranges: {ranges}")
+        self.ranges = dict(ranges)
+
+        columns = [self._enumerate(OPERATORS.index(op), low, high) for op, (low, high) in ranges.items()]
+        self.codes, self.left, self.right, self.answers = (
+            np.concatenate(parts) for parts in zip(*columns)
+        )
+        # (start, stop) of each operator's problems in the arrays
+        stops = np.cumsum([len(column[0]) for column in columns]).tolist()
+        self.spans = list(zip([0] + stops[:-1], stops))
+
+    @staticmethod
+    def _enumerate(code, low, high):
+        x, y = (grid.ravel() for grid in np.meshgrid(np.arange(low, high + 1), np.arange(low, high + 1)))
+        if code == SUBTRACT:
+            # Larger operand first, so answers are never negative
+            keep = x >= y
+            x, y = x[keep], y[keep]
+        if code == ADD:
+            left, right, answers = x, y, x + y
+        elif code == SUBTRACT:
+            left, right, answers = x, y, x - y
+        elif code == MULTIPLY:
+            left, right, answers = x, y, x * y
+        else:
+            # Division is multiplication read backwards: x * y ÷ x = y
+            left, right, answers = x * y, x, y
+        return np.full(len(left), code), left, right, answers
+
+    def __len__(self):
+        return len(self.codes)
+
+    def shuffled(self, rng: np.random.Generator):
+        """
+        One round: every problem once, operators interleaved uniformly.
+
+        Returns:
+            tuple: (operator codes, left operands, right operands, answers) arrays
+        """
+        remaining = np.array([stop - start for start, stop in self.spans])
+        picks = []
+        active = np.flatnonzero(remaining)
+        while len(active):
+            # Uniform picks among the operators left, kept up to the pick
+            # that uses up an operator; this many draws always reach it
+            draws = active[rng.integers(len(active), size=int(remaining[active].sum()))]
+            end = len(draws)
+            for slot in active:
+                positions = np.flatnonzero(draws == slot)
+                if len(positions) >= remaining[slot]:
+                    end = min(end, int(positions[remaining[slot] - 1]) + 1)
+            draws = draws[:end]
+            picks.append(draws)
+            remaining -= np.bincount(draws, minlength=len(remaining))
+            active = np.flatnonzero(remaining)
+
+        # The k-th pick of an operator takes the k-th problem of its permutation
+        picks = np.concatenate(picks)
+        order = np.empty(len(picks), dtype=np.int64)
+        for slot, (start, stop) in enumerate(self.spans):
+            order[picks == slot] = start + rng.permutation(stop - start)
+        return self.codes[order], self.left[order], self.right[order], self.answers[order]
+
+
+def math_bands() -> Dict[str, Dict[str, List[int]]]:
+    """Player -> operator -> [low, high], from the content pack."""
+    return load_section("math", KIND_DOCUMENT)['bands']
+
+
+def band_ranges(player: str) -> Dict[str, List[int]]:
+    """A player's operand ranges, or the default band's for unknown players."""
+    document = load_section("math", KIND_DOCUMENT)
+    bands = document['bands']
+    return bands.get(player, bands[document['default_band']])
+
+
+@lru_cache(maxsize=None)
+def band_for(player: str) -> ProblemBand:
+    """Shared, read-only band for a player."""
+    return ProblemBand(band_ranges(player))
+
+
+class ProblemEngine:
+    """
+    Seedable, session-deduplicated problem source for one player.
+
+    The game draws from a pool of ready problems; a background thread
+    refills it in batches whenever it runs low, so next_problem() is a
+    deque pop. Problems come out in the same order for a given seed no
+    matter which thread generated them.
+    """
+    def __init__(self, player: str, seed: Optional[int] = None, pool_size: int = MATH_POOL_SIZE,
+                 low_water: int = MATH_POOL_LOW_WATER, batch_size: int = MATH_BATCH_SIZE):
+        """
+        Args:
+            player: Player name, selects the band (the default band if unknown)
+            seed: Seed for the generator, drawn from `random` if None
+            pool_size: Problems the refill thread keeps ready
+            low_water: Pool size below which the refill thread wakes
+            batch_size: Problems converted per refill step
+        """
+        self.band = band_for(player)
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.rng = np.random.default_rng(self.seed)
+        self.pool_size = pool_size
+        self.low_water = low_water
+        self.batch_size = batch_size
+        self.rounds = 0
+        self.issued = 0
+        self._round = None
+        self._cursor = 0
+        self._pool = deque()
+        self._generate_lock = threading.Lock()
+        self._refill = threading.Event()
+        self._closed = False
+        self._thread = None
+
+    def generate(self, count: int):
+        """
+        Take the next `count` problems of the session, as arrays.
+        Must be called with the generate lock held, or before the refill
+        thread starts.
+
+        Returns:
+            tuple: (operator codes, left operands, right operands, answers) arrays
+        """
+        parts = []
+        while count > 0:
+            if self._round is None or self._cursor == len(self.band):
+                # Every problem has been used; start a new round
+                self._round = self.band.shuffled(self.rng)
+                self._cursor = 0
+                self.rounds += 1
+            taken = min(count, len(self.band) - self._cursor)
+            parts.append([column[self._cursor:self._cursor + taken] for column in self._round])
+            self._cursor += taken
+            count -= taken
+        return tuple(np.concatenate(columns) for columns in zip(*parts))
+
+    def _fill(self, target):
+        with self._generate_lock:
+            while len(self._pool) < target:
+                codes, left, right, answers = self.generate(self.batch_size)
+                self._pool.extend(
+                    Problem(a, OPERATORS[code], b, answer)
+                    for code, a, b, answer in zip(codes.tolist(), left.tolist(), right.tolist(), answers.tolist())
+                )
+
+    def start(self):
+        """Fill the pool and start the refill thread."""
+        if self._thread is None:
+            self._fill(self.pool_size)
+            self._thread = threading.Thread(target=self._refill_loop, name="math-problems", daemon=True)
+            self._thread.start()
+        return self
+
+    def _refill_loop(self):
+        while True:
+            self._refill.wait()
+            self._refill.clear()
+            if self._closed:
+                return
+            self._fill(self.pool_size)
+
+    def next_problem(self) -> Problem:
+        try:
+            problem = self._pool.popleft()
+        except IndexError:
+            # The refill thread fell behind; generate on this thread
+            self._fill(self.low_water)
+            problem = self._pool.popleft()
+        self.issued += 1
+        if len(self._pool) < self.low_water:
+            self._refill.set()
+        return problem
+
+    def close(self):
+        self._closed = True
+        self._refill.set()
+
+
+def export_worksheet(path, player: str, count: int, seed: Optional[int] = None) -> float:
+    """
+    Write `count` problems and their answers to a CSV file.
+
+    Returns:
+        float: Problems generated per second, excluding the file write
+    """
+    engine = ProblemEngine(player, seed)
+    start = time.perf_counter()
+    codes, left, right, answers = engine.generate(count)
+    elapsed = time.perf_counter() - start
+
+    symbols = np.array(OPERATORS)[codes]
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["number", "problem", "answer"])
+        writer.writerows(
+            (number, f"{a} {op} {b} =", answer)
+            for number, (a, op, b, answer) in enumerate(
+                zip(left.tolist(), symbols.tolist(), right.tolist(), answers.tolist()), 1
+            )
+        )
+    return count / elapsed if elapsed else float('inf')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a math worksheet")
+    parser.add_argument("--player", default="ELLIE", choices=sorted(math_bands()))
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default="worksheet.csv")
+    args = parser.parse_args(argv)
+
+    rate = export_worksheet(args.output, args.player, args.count, args.seed)
+    print(f"{args.output}: {args.count} problems, generated at {rate:,.0f} problems/s")
+
+
+if __name__ == "__main__":
+    main()
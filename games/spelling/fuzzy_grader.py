@@ -0,0 +1,208 @@
+# games/spelling/fuzzy_grader.py
+"""
+Fuzzy grading for spelling answers.
+
+Distances are optimal string alignment (Levenshtein plus adjacent
+transpositions) computed with Hyyrö's bit-parallel algorithm, one machine
+word-style step per character, and abandoned as soon as the bound can no
+longer be met.
+
+The probable word behind a misspelling comes from a symmetric-delete index:
+every bank word is stored under itself and each single-character deletion,
+so looking up the answer and its own deletions finds every word within one
+edit (including swaps) and most within two, which are then verified with
+the bounded distance.
+"""
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, NamedTuple, Optional
+
+from config import FUZZY_MAX_EDITS
+from utils.input_state import input_state
+
+EXACT = "exact"
+NEAR_MISS = "near_miss"
+WRONG = "wrong"
+
+# Delete keys are 44-bit hashes packed above a 20-bit word id
+_ID_BITS = 20
+_ID_MASK = (1 << _ID_BITS) - 1
+_HASH_MASK = (1 << 44) - 1
+
+
+def osa_distance(source: str, target: str, max_distance: Optional[int] = None) -> int:
+    """
+    Optimal string alignment distance between two strings.
+
+    Args:
+        source: First string
+        target: Second string
+        max_distance: Stop early once the distance must exceed this bound
+
+    Returns:
+        The distance, or max_distance + 1 if it exceeds max_distance
+    """
+    if len(source) < len(target):
+        source, target = target, source
+    m, n = len(target), len(source)
+    limit = n if max_distance is None else max_distance
+    if n - m > limit:
+        return limit + 1
+    if m == 0:
+        return n
+
+    # Bit i of peq[c] is set where target[i] == c
+    peq: Dict[str, int] = {}
+    for i, char in enumerate(target):
+        peq[char] = peq.get(char, 0) | (1 << i)
+
+    mask = (1 << m) - 1
+    top = 1 << (m - 1)
+    vp, vn = mask, 0
+    d0 = 0
+    pm_prev = 0
+    distance = m
+    for j, char in enumerate(source):
+        pm = peq.get(char, 0)
+        tr = (((~d0) & pm) << 1) & pm_prev
+        d0 = ((((pm & vp) + vp) ^ vp) | pm | vn | tr) & mask
+        hp = (vn | ~(d0 | vp)) & mask
+        hn = d0 & vp
+        if hp & top:
+            distance += 1
+        elif hn & top:
+            distance -= 1
+        hp = ((hp << 1) | 1) & mask
+        hn = (hn << 1) & mask
+        vp = (hn | ~(d0 | hp)) & mask
+        vn = hp & d0
+        pm_prev = pm
+        # Each remaining character can lower the distance by at most one
+        if distance - (n - j - 1) > limit:
+            return limit + 1
+    return distance if distance <= limit else limit + 1
+
+
+class Grade(NamedTuple):
+    kind: str
+    distance: int
+    # Bank word closest to the answer, if any is within FUZZY_MAX_EDITS
+    probable_word: Optional[str] = None
+
+
+def normalize(answer: str) -> str:
+    return answer.lower().strip()
+
+
+def _key(text: str) -> int:
+    return hash(text) & _HASH_MASK
+
+
+class FuzzyGrader:
+    """
+    Grades answers against a target word and finds the bank word a
+    misspelling most likely was. The delete index is built in a background
+    thread; until it is ready grading still works without suggestions.
+    """
+    def __init__(self, words, max_edits: int = FUZZY_MAX_EDITS):
+        """
+        Args:
+            words: Iterable of correctly spelled words to index
+            max_edits: Largest distance still graded as a near miss
+        """
+        self.max_edits = max_edits
+        self.words: List[str] = []
+        self._index = array('Q')
+        self._ready = threading.Event()
+        self._source = words
+
+    def start(self):
+        """Build the index in the background."""
+        threading.Thread(target=self.build, name="fuzzy-index", daemon=True).start()
+        return self
+
+    def build(self):
+        if self._ready.is_set():
+            return
+        words = sorted({normalize(word) for word in self._source})[:_ID_MASK + 1]
+        entries = []
+        for word_id, word in enumerate(words):
+            keys = {word}
+            keys.update(word[:i] + word[i + 1:] for i in range(len(word)))
+            entries.extend((_key(key) << _ID_BITS) | word_id for key in keys)
+        entries.sort()
+        self.words = words
+        self._index = array('Q', entries)
+        self._source = None
+        self._ready.set()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def _candidates(self, text: str):
+        index = self._index
+        keys = {text}
+        keys.update(text[:i] + text[i + 1:] for i in range(len(text)))
+        for key in keys:
+            prefix = _key(key) << _ID_BITS
+            position = bisect_left(index, prefix)
+            while position < len(index) and index[position] & ~_ID_MASK == prefix:
+                yield index[position] & _ID_MASK
+                position += 1
+
+    def probable_word(self, answer: str, target: Optional[str] = None,
+                      target_distance: Optional[int] = None) -> Optional[str]:
+        """
+        Closest bank word within max_edits, or None (also while indexing).
+        The target word wins ties, since that is what the child was spelling.
+        """
+        text = normalize(answer)
+        if not text:
+            return None
+        best, best_distance = None, self.max_edits + 1
+        if target is not None and target_distance is not None and target_distance <= self.max_edits:
+            best, best_distance = target, target_distance
+        if not self.ready:
+            return best
+        for word_id in set(self._candidates(text)):
+            word = self.words[word_id]
+            distance = osa_distance(text, word, self.max_edits)
+            if distance > self.max_edits:
+                continue
+            if distance < best_distance or (distance == best_distance and best is not target and word < best):
+                best, best_distance = word, distance
+        return best
+
+    def grade(self, answer: str, target: str, suggest: bool = True) -> Grade:
+        """Classify an answer as exact, a near miss (1-2 edits) or wrong."""
+        text, target = normalize(answer), normalize(target)
+        if text == target:
+            return Grade(EXACT, 0, target)
+        distance = osa_distance(text, target, self.max_edits)
+        kind = NEAR_MISS if text and distance <= self.max_edits else WRONG
+        probable = self.probable_word(text, target, distance) if suggest else None
+        return Grade(kind, distance, probable)
+
+
+_graders: Dict[tuple, FuzzyGrader] = {}
+_graders_lock = threading.Lock()
+
+
+def get_grader(word_bank, band=None, tags=()) -> FuzzyGrader:
+    """Shared grader over the words in one band/tag slice of a word bank."""
+    key = (id(word_bank), band, tuple(sorted(tags)))
+    with _graders_lock:
+        grader = _graders.get(key)
+        if grader is None:
+            members = word_bank.members(band, tags)
+            indexes = range(len(word_bank)) if members is None else members
+            words = (word_bank.record(index)[1] for index in indexes)
+            grader = _graders[key] = FuzzyGrader(words)
+            if input_state.deterministic:
+                # Recorded sessions must not depend on when the index finishes
+                grader.build()
+            else:
+                grader.start()
+        return grader
@@ -0,0 +1,199 @@
+# games/spelling/review_scheduler.py
+"""
+Leitner-box spaced repetition for spelling challenges.
+
+Time is counted in answers, so a missed word comes back a few answers
+later in the same session and well-known words drift further apart.
+Due words sit in a heap keyed by due time; words never seen are drawn
+from the word bank when nothing is due.
+
+State file layout (little endian):
+    header   magic, version, answer clock, word count
+    words    u32 record index, u32 CRC-32 of the word, u32 due, u8 box
+"""
+import atexit
+import heapq
+import os
+import random
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import REVIEW_INTERVALS, REVIEW_NEW_WORD_ATTEMPTS
+
+MAGIC = b"LTN1"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+CARD = struct.Struct("<IIIB")
+
+
+def word_checksum(word: str) -> int:
+    return zlib.crc32(word.encode('utf-8'))
+
+
+class ReviewScheduler:
+    def __init__(self, word_bank, band: Optional[str] = None, tags: Iterable[str] = (),
+                 save_file: Optional[Path] = None, rng: random.Random = random):
+        """
+        Schedule challenges from a word bank for one player.
+
+        Args:
+            word_bank: WordBank to draw records from
+            band: Age band filter for new words
+            tags: Tag filters for new words
+            save_file: Where to persist state, None to keep it in memory
+            rng: Random source used to pick new words
+        """
+        self.word_bank = word_bank
+        self.band = band
+        self.tags = tuple(tags)
+        self.save_file = Path(save_file) if save_file else None
+        self.rng = rng
+
+        self.clock = 0
+        # record index -> [box, due, word checksum]
+        self.cards: Dict[int, List[int]] = {}
+        self._heap: List[Tuple[int, int]] = []
+        self._queued = set()
+        self.pending: Optional[int] = None
+        self.unsaved = False
+        self._lock = threading.Lock()
+
+        self.load()
+
+    def load(self):
+        """Read saved state; a missing file starts fresh, a corrupt one raises ValueError."""
+        if self.save_file is None or not self.save_file.exists():
+            return
+        data = self.save_file.read_bytes()
+        magic, version, _, clock, count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION or len(data) != HEADER.size + count * CARD.size:
+            raise ValueError(f"Unreadable review state: {self.save_file}")
+
+        self.clock = clock
+        size = len(self.word_bank)
+        for index, checksum, due, box in CARD.iter_unpack(memoryview(data)[HEADER.size:]):
+            # Records past the end belong to an older, larger word bank
+            if index < size:
+                self.cards[index] = [box, due, checksum]
+        self._heap = [(card[1], index) for index, card in self.cards.items()]
+        heapq.heapify(self._heap)
+        self._queued = set(self.cards)
+
+    def save(self):
+        """Write state atomically next to the score saves."""
+        if self.save_file is None or not self.unsaved:
+            return
+        with self._lock:
+            self.unsaved = False
+            chunks = [HEADER.pack(MAGIC, VERSION, 0, self.clock, len(self.cards))]
+            chunks.extend(
+                CARD.pack(index, checksum, due, box)
+                for index, (box, due, checksum) in self.cards.items()
+            )
+        self.save_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.save_file.with_name(self.save_file.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(b"".join(chunks))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.save_file)
+
+    def _push(self, index: int):
+        if index in self.cards and index not in self._queued:
+            heapq.heappush(self._heap, (self.cards[index][1], index))
+            self._queued.add(index)
+
+    def _pop_due(self, only_due: bool) -> Optional[int]:
+        while self._heap:
+            due, index = self._heap[0]
+            card = self.cards.get(index)
+            if card is None or card[1] != due:
+                heapq.heappop(self._heap)
+                continue
+            if only_due and due > self.clock:
+                return None
+            heapq.heappop(self._heap)
+            self._queued.discard(index)
+            # Drop words whose record changed since they were scheduled
+            if word_checksum(self.word_bank.record(index)[1]) != card[2]:
+                del self.cards[index]
+                continue
+            return index
+        return None
+
+    def _new_word(self) -> Optional[int]:
+        members = self.word_bank.members(self.band, self.tags)
+        total = len(self.word_bank) if members is None else len(members)
+        if not total:
+            return None
+        for _ in range(REVIEW_NEW_WORD_ATTEMPTS):
+            position = self.rng.randrange(total)
+            index = position if members is None else members[position]
+            if index not in self.cards:
+                return index
+        return None
+
+    def next_challenge(self) -> int:
+        """
+        Record index of the next challenge: the most overdue word if any is
+        due, otherwise a word not seen yet, otherwise the next word to fall due.
+
+        Raises:
+            LookupError: If the word bank has nothing for the filters
+        """
+        with self._lock:
+            # A skipped challenge goes back in the queue unchanged
+            if self.pending is not None:
+                self._push(self.pending)
+                self.pending = None
+
+            index = self._pop_due(only_due=True)
+            if index is None:
+                index = self._new_word()
+            if index is None:
+                index = self._pop_due(only_due=False)
+            if index is None:
+                raise LookupError(f"No words for band={self.band!r} tags={list(self.tags)!r}")
+            self.pending = index
+            return index
+
+    def record_answer(self, index: int, correct: bool):
+        """Move a word between boxes and schedule its next review."""
+        with self._lock:
+            self.unsaved = True
+            self.clock += 1
+            card = self.cards.get(index)
+            if card is None:
+                card = self.cards[index] = [0, 0, word_checksum(self.word_bank.record(index)[1])]
+            elif not correct:
+                card[0] = 0
+            if correct:
+                card[0] = min(card[0] + 1, len(REVIEW_INTERVALS) - 1)
+            card[1] = self.clock + REVIEW_INTERVALS[card[0]]
+
+            if self.pending == index:
+                self.pending = None
+            self._queued.discard(index)
+            self._push(index)
+
+    def get_stats(self):
+        boxes = [0] * len(REVIEW_INTERVALS)
+        due = 0
+        for box, card_due, _ in self.cards.values():
+            boxes[box] += 1
+            due += card_due <= self.clock
+        return {'clock': self.clock, 'words_seen': len(self.cards), 'due': due, 'boxes': boxes}
+
+
+def create_review_scheduler(word_bank, band, tags, save_file) -> ReviewScheduler:
+    """Build a scheduler and save it at exit; unreadable state starts fresh."""
+    try:
+        scheduler = ReviewScheduler(word_bank, band, tags, save_file)
+    except (ValueError, struct.error):
+        scheduler = ReviewScheduler(word_bank, band, tags, None)
+        scheduler.save_file = Path(save_file)
+    atexit.register(scheduler.save)
+    return scheduler
@@ -0,0 +1,48 @@
+# games/spelling/spelling_game.py
+import random
+
+from games.content_pack import KIND_WORD_BANK, load_section
+from games.spelling.fuzzy_grader import Grade, get_grader
+from games.spelling.review_scheduler import create_review_scheduler
+
+# Age band of the word bank sentences each player practices
+AGE_BANDS = {
+    "ELLIE": "8-12",
+    "VIVI": "6-8",
+}
+
+
+class SpellingGame:
+    def __init__(self, band, tags=(), review_file=None):
+        self.band = band
+        self.word_bank = load_section("spelling", KIND_WORD_BANK)
+        self.tags = tuple(tags)
+        # Without a review file challenges are picked uniformly at random
+        self.scheduler = (
+            create_review_scheduler(self.word_bank, self.band, self.tags, review_file)
+            if review_file else None
+        )
+        self.grader = get_grader(self.word_bank, self.band, self.tags)
+        self.current_index = None
+        self.current_challenge = None
+        self.reset_challenge()
+
+    def reset_challenge(self) -> None:
+        if self.scheduler is not None:
+            self.current_index = self.scheduler.next_challenge()
+            self.current_challenge = self.word_bank.record(self.current_index)
+        else:
+            self.current_challenge = self.word_bank.sample(self.band, self.tags, random)
+
+    def record_result(self, correct: bool) -> None:
+        if self.scheduler is not None:
+            self.scheduler.record_answer(self.current_index, correct)
+
+    def get_current_sentence(self) -> str:
+        return self.current_challenge[0]
+
+    def grade_answer(self, answer: str, suggest: bool = True) -> Grade:
+        return self.grader.grade(answer, self.current_challenge[1], suggest)
+
+    def get_correct_word(self) -> str:
+        return self.current_challenge[1]
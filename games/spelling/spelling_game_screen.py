@@ -1,125 +1,112 @@
 # games/spelling/spelling_game_screen.py
-import pygame
-from screens.game_screen import GameScreen
-from games.spelling.ellie_spelling import EllieSpelling
-from games.spelling.vivi_spelling import ViviSpelling
-from config import COLORS, WINDOW_WIDTH, WINDOW_HEIGHT
+from screens.text_answer_screen import TextAnswerScreen
+from games.spelling.spelling_game import AGE_BANDS, SpellingGame
+from games.spelling.fuzzy_grader import EXACT, NEAR_MISS, WRONG, normalize, osa_distance
+from games.content_pack import KIND_WORD_BANK, load_section
+from config import COLORS, WINDOW_HEIGHT, SAVE_DIR
 
-class SpellingGameScreen(GameScreen):
-    def __init__(self, screen, change_screen_callback, player):
-        super().__init__(screen, change_screen_callback, "spelling", player)
-        
-        # Initialize the appropriate spelling game based on player
-        self.spelling_game = (
-            EllieSpelling() if player == "ELLIE" 
-            else ViviSpelling()
+
+def prewarm():
+    """Map the content pack and its word bank before the game is first opened."""
+    load_section("spelling", KIND_WORD_BANK)
+
+
+class SpellingGameScreen(TextAnswerScreen):
+    def __init__(self, screen, change_screen_callback, player, game_type="spelling"):
+        super().__init__(
+            screen,
+            change_screen_callback,
+            game_type,
+            player,
+            input_width=400,
+            # Only allow letters
+            allowed=lambda char: char.isalpha() or char.isspace(),
+            on_change=self.update_live_grade
         )
         
-        # Input handling
-        self.user_input = ""
-        self.input_active = False
-        
-        # Create input box
-        self.input_box = pygame.Rect(
-            WINDOW_WIDTH//2 - 200,
-            WINDOW_HEIGHT//2,
-            400,
-            50
+        # Words come from the player's age band
+        review_file = SAVE_DIR / f"{player}_spelling_review.bin"
+        self.spelling_game = SpellingGame(
+            AGE_BANDS.get(player, AGE_BANDS["VIVI"]),
+            review_file=review_file
         )
         
-        # Feedback messages
-        self.feedback = ""
-        self.feedback_timer = 0
-        self.feedback_duration = 2000  # 2 seconds in milliseconds
+        # Grade of the text typed so far, kept current on every keystroke
+        self.live_grade = None
         
         self.logger.info(f"SpellingGameScreen initialized for player: {player}")
 
-    def handle_event(self, event):
-        """Handle pygame events."""
-        super().handle_event(event)
-        
-        if self.is_game_active:
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                # Handle input box activation
-                self.input_active = self.input_box.collidepoint(event.pos)
-            elif event.type == pygame.KEYDOWN and self.input_active:
-                self.handle_key_input(event)
+    def update_live_grade(self):
+        """Re-grade the input after a keystroke; the box border shows an exact match."""
+        self.live_grade = self.spelling_game.grade_answer(self.user_input, suggest=False)
 
-    def handle_key_input(self, event):
-        """Handle keyboard input for the spelling game."""
-        try:
-            if not self.input_active:
-                return
-                
-            if event.key == pygame.K_RETURN:
-                self.check_spelling()
-            elif event.key == pygame.K_BACKSPACE:
-                self.user_input = self.user_input[:-1]
-            else:
-                # Only allow letters
-                if event.unicode.isalpha() or event.unicode.isspace():
-                    self.user_input += event.unicode
-        except Exception as e:
-            self.logger.error(f"Error handling key input: {str(e)}")
-
-    def check_spelling(self):
+    def submit_answer(self):
         """Check if the spelling is correct and update score."""
         try:
-            if self.spelling_game.check_answer(self.user_input):
+            grade = self.spelling_game.grade_answer(self.user_input)
+            correct = grade.kind == EXACT
+            self.spelling_game.record_result(correct)
+            correct_word = self.spelling_game.get_correct_word()
+            # A wrong grade only knows the distance is past the bound;
+            # the analytics log gets the real one
+            distance = (
+                osa_distance(normalize(self.user_input), normalize(correct_word))
+                if grade.kind == WRONG else grade.distance
+            )
+            self.record_answer(correct_word.lower(), correct, distance)
+            if correct:
                 self.add_score(1)
-                self.feedback = "Correct!"
+                self.show_feedback("Correct!")
+            elif grade.kind == NEAR_MISS:
+                self.show_feedback(f"So close! The word was: {correct_word}")
+            elif grade.probable_word and grade.probable_word != correct_word.lower():
+                self.show_feedback(f"That looks like '{grade.probable_word}'. The word was: {correct_word}")
             else:
-                correct_word = self.spelling_game.get_correct_word()
-                self.feedback = f"Not quite! The word was: {correct_word}"
+                self.show_feedback(f"Not quite! The word was: {correct_word}")
             
-            self.feedback_timer = pygame.time.get_ticks()
-            self.user_input = ""
+            self.live_grade = None
             self.spelling_game.reset_challenge()
+            self.prompt_shown()
         except Exception as e:
             self.logger.error(f"Error checking spelling: {str(e)}")
 
-    def draw_game(self):
-        """Draw the active spelling game screen."""
+    def on_exit(self):
+        """Save review progress when leaving the game."""
+        super().on_exit()
+        try:
+            if self.spelling_game.scheduler is not None:
+                self.spelling_game.scheduler.save()
+        except Exception as e:
+            self.logger.error(f"Error saving review progress: {str(e)}")
+
+    def static_layer_key(self):
+        """The static layer also changes with the current sentence."""
+        return super().static_layer_key() + (self.spelling_game.get_current_sentence(),)
+
+    def draw_game_static(self, surface):
+        """Draw the title, the current sentence and the empty input box."""
         try:
             # Draw base game elements
-            super().draw_game()
+            super().draw_game_static(surface)
             
             # Draw the current sentence
             sentence = self.spelling_game.get_current_sentence()
-            self.draw_centered_text(sentence, WINDOW_HEIGHT//2 - 100)
-            
-            # Draw input box
-            pygame.draw.rect(self.screen, COLORS['WHITE'], self.input_box, border_radius=10)
-            if self.input_active:
-                pygame.draw.rect(self.screen, COLORS['PURPLE'], self.input_box, 3, border_radius=10)
-            
-            # Draw user input
-            input_surface = self.font_medium.render(self.user_input, True, COLORS['BLACK'])
-            input_rect = input_surface.get_rect(center=self.input_box.center)
-            self.screen.blit(input_surface, input_rect)
-            
-            # Draw feedback if timer is active
-            current_time = pygame.time.get_ticks()
-            if current_time - self.feedback_timer < self.feedback_duration:
-                feedback_color = (
-                    COLORS['MINT_GREEN'] if "Correct" in self.feedback 
-                    else COLORS['PINK']
-                )
-                self.draw_centered_text(
-                    self.feedback,
-                    WINDOW_HEIGHT//2 + 100,
-                    color=feedback_color
-                )
+            self.draw_centered_text(sentence, WINDOW_HEIGHT//2 - 100, surface=surface)
         except Exception as e:
-            self.logger.error(f"Error drawing game: {str(e)}")
+            self.frame_logger.error(f"Error drawing game: {str(e)}")
+
+    def input_border_color(self):
+        """Turn the border green once the typed word is spelled right."""
+        ready = self.live_grade is not None and self.live_grade.kind == EXACT
+        return COLORS['MINT_GREEN'] if ready else COLORS['PURPLE']
 
     def setup_game(self):
         """Set up a new spelling game."""
         try:
             self.spelling_game.reset_challenge()
-            self.user_input = ""
-            self.feedback = ""
-            self.feedback_timer = 0
+            self.prompt_shown()
+            self.reset_answer()
+            self.live_grade = None
             self.logger.info("Spelling game setup complete")
         except Exception as e:
             self.logger.error(f"Error setting up game: {str(e)}")
@@ -142,11 +129,3 @@ class SpellingGameScreen(GameScreen):
             "Get 1 point for each correct spelling!",
             f"These words are chosen for {self.player.title()}'s age group"
         ]
-
-    def add_score(self, points):
-        """Add points to the score."""
-        try:
-            self.score += points
-            self.logger.info(f"Score updated: {self.score}")
-        except Exception as e:
-            self.logger.error(f"Error updating score: {str(e)}")
\ No newline at end of file
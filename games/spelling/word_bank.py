@@ -0,0 +1,241 @@
+# games/spelling/word_bank.py
+"""
+Compiled word banks for the spelling game.
+
+Sources are tab-separated `age_band  tags  sentence  word` lines. They are
+compiled to a .wbk file that is memory-mapped, so opening a bank with
+hundreds of thousands of sentences costs a header read and sampling decodes
+only the chosen record.
+
+    python -m games.spelling.word_bank compile words.tsv [words.wbk]
+
+File layout (little endian):
+    header   magic, version, record count, band count, tag count and the
+             offsets of the sections below
+    records  UTF-8 "sentence<TAB>word", back to back
+    names    u16 length + UTF-8 for each band, then each tag
+    index    (count + 1) u64 record offsets; record i spans index[i]..index[i+1]
+    bitmaps  one bit per record for each band, then each tag
+"""
+import argparse
+import mmap
+import random
+import struct
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MAGIC = b"WBK1"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIIQQQ")
+OFFSET = struct.Struct("<Q")
+NAME_LENGTH = struct.Struct("<H")
+
+# Set bit positions for every byte value, used to expand bitmaps
+_BYTE_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+
+
+def parse_source(path: Path) -> List[Tuple[str, List[str], str, str]]:
+    """Read (age_band, tags, sentence, word) rows from a TSV source."""
+    rows = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            fields = line.split("\t")
+            if len(fields) != 4:
+                raise ValueError(f"{path}:{line_number}: expected 4 tab-separated fields")
+            band, tags, sentence, word = fields
+            rows.append((band, [tag for tag in tags.split(",") if tag], sentence, word))
+    return rows
+
+
+def build_word_bank(rows: Iterable[Tuple[str, List[str], str, str]]) -> bytes:
+    """Encode rows into the .wbk format."""
+    records = bytearray()
+    offsets = []
+    bands: Dict[str, List[int]] = {}
+    tags: Dict[str, List[int]] = {}
+
+    count = 0
+    for band, row_tags, sentence, word in rows:
+        offsets.append(HEADER.size + len(records))
+        records += f"{sentence}\t{word}".encode('utf-8')
+        bands.setdefault(band, []).append(count)
+        for tag in row_tags:
+            tags.setdefault(tag, []).append(count)
+        count += 1
+    offsets.append(HEADER.size + len(records))
+
+    names = bytearray()
+    for name in list(bands) + list(tags):
+        encoded = name.encode('utf-8')
+        names += NAME_LENGTH.pack(len(encoded)) + encoded
+
+    bitmap_size = (count + 7) // 8
+    bitmaps = bytearray()
+    for members in list(bands.values()) + list(tags.values()):
+        bitmap = bytearray(bitmap_size)
+        for index in members:
+            bitmap[index >> 3] |= 1 << (index & 7)
+        bitmaps += bitmap
+
+    names_offset = HEADER.size + len(records)
+    index_offset = names_offset + len(names)
+    index_bytes = struct.pack(f"<{len(offsets)}Q", *offsets)
+    bitmap_offset = index_offset + len(index_bytes)
+
+    header = HEADER.pack(
+        MAGIC, VERSION, 0, count, len(bands), len(tags),
+        names_offset, index_offset, bitmap_offset
+    )
+    return bytes(header + records + names + index_bytes + bitmaps)
+
+
+def compile_word_bank(source: Path, target: Path) -> Path:
+    """Compile a TSV source to a .wbk file, replacing it atomically."""
+    data = build_word_bank(parse_source(source))
+    tmp_path = target.with_name(target.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    tmp_path.replace(target)
+    return target
+
+
+class WordBank:
+    """
+    Read-only view of a compiled word bank.
+    Works over any buffer (an mmap, bytes or a slice of a larger file), so
+    nothing is decoded until a record is sampled.
+    """
+    def __init__(self, buffer, closer=None):
+        """
+        Args:
+            buffer: Object supporting the buffer protocol holding a .wbk image
+            closer: Optional callable run by close(), e.g. to unmap the file
+        """
+        self.buffer = memoryview(buffer)
+        self._closer = closer
+        (magic, version, _, self.count, band_count, tag_count,
+         names_offset, self._index_offset, bitmap_offset) = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a word bank file (bad magic or version)")
+
+        names = []
+        position = names_offset
+        for _ in range(band_count + tag_count):
+            (length,) = NAME_LENGTH.unpack_from(self.buffer, position)
+            position += NAME_LENGTH.size
+            names.append(bytes(self.buffer[position:position + length]).decode('utf-8'))
+            position += length
+
+        self._bitmap_size = (self.count + 7) // 8
+        self._bitmaps = {}
+        for slot, name in enumerate(names):
+            kind = 'band' if slot < band_count else 'tag'
+            start = bitmap_offset + slot * self._bitmap_size
+            self._bitmaps[(kind, name)] = (start, start + self._bitmap_size)
+        self.bands = names[:band_count]
+        self.tags = names[band_count:]
+
+        # Members of each filter combination, expanded from bitmaps on first use
+        self._members: Dict[Tuple, array] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path) -> "WordBank":
+        """Memory-map a compiled .wbk file."""
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        bank = cls(mapped)
+        bank._closer = mapped.close
+        return bank
+
+    def __len__(self) -> int:
+        return self.count
+
+    def record(self, index: int) -> Tuple[str, str]:
+        """Decode one (sentence, word) record."""
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        position = self._index_offset + index * OFFSET.size
+        start, = OFFSET.unpack_from(self.buffer, position)
+        end, = OFFSET.unpack_from(self.buffer, position + OFFSET.size)
+        sentence, word = bytes(self.buffer[start:end]).decode('utf-8').split("\t")
+        return sentence, word
+
+    def members(self, band: Optional[str] = None, tags: Iterable[str] = ()) -> Optional[array]:
+        """Record indexes matching the band and every tag (None means all records)."""
+        keys = ([('band', band)] if band is not None else []) + [('tag', tag) for tag in sorted(tags)]
+        if not keys:
+            return None
+        cache_key = tuple(keys)
+        with self._lock:
+            cached = self._members.get(cache_key)
+            if cached is not None:
+                return cached
+
+            combined = None
+            for key in keys:
+                span = self._bitmaps.get(key)
+                if span is None:
+                    combined = 0
+                    break
+                bits = int.from_bytes(self.buffer[span[0]:span[1]], 'little')
+                combined = bits if combined is None else combined & bits
+
+            result = array('I')
+            packed = combined.to_bytes(self._bitmap_size, 'little')
+            for byte_index, value in enumerate(packed):
+                if value:
+                    base = byte_index << 3
+                    result.extend(base + bit for bit in _BYTE_BITS[value])
+            self._members[cache_key] = result
+            return result
+
+    def sample(self, band: Optional[str] = None, tags: Iterable[str] = (),
+               rng: random.Random = random) -> Tuple[str, str]:
+        """
+        Pick a random (sentence, word) matching the filters.
+
+        Raises:
+            LookupError: If no record matches
+        """
+        members = self.members(band, tags)
+        if members is None:
+            if not self.count:
+                raise LookupError("Word bank is empty")
+            return self.record(rng.randrange(self.count))
+        if not members:
+            raise LookupError(f"No words for band={band!r} tags={list(tags)!r}")
+        return self.record(members[rng.randrange(len(members))])
+
+    def close(self):
+        self._members.clear()
+        self.buffer.release()
+        if self._closer is not None:
+            self._closer()
+            self._closer = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Word bank tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    compile_parser = subparsers.add_parser("compile", help="Compile a TSV source to .wbk")
+    compile_parser.add_argument("source")
+    compile_parser.add_argument("target", nargs="?")
+    args = parser.parse_args(argv)
+
+    if args.command == "compile":
+        source = Path(args.source)
+        target = Path(args.target) if args.target else source.with_suffix(".wbk")
+        compile_word_bank(source, target)
+        bank = WordBank.open(target)
+        print(f"{target}: {len(bank)} records, bands {bank.bands}, tags {bank.tags}")
+        bank.close()
+
+
+if __name__ == "__main__":
+    main()
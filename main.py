@@ -1,26 +1,66 @@
 # main.py
+import argparse
 import pygame
+import random
 import sys
+import time
 import traceback
-from config import WINDOW_WIDTH, WINDOW_HEIGHT, FPS
-from screens.player_select import PlayerSelect
-from screens.menu_screen import MenuScreen
-from screens.game_screen import GameScreen
-from games.spelling.spelling_game_screen import SpellingGameScreen
-from utils.logger import setup_logger
+from config import (
+    WINDOW_WIDTH, WINDOW_HEIGHT, RENDER_MODE, RENDER_BACKEND, PROFILER_HOTKEY, ASSET_LOADED_EVENT, SCREEN_PREWARM,
+    SAVE_DIR, SESSION_SNAPSHOT_PATTERN
+)
+from screens.registry import screen_registry
+from screens.screen_cache import ScreenCache
+from utils.asset_manager import asset_manager
+from utils.logger import setup_logger, get_frame_logger
+from utils.font_registry import font_registry
+from utils.frame_scheduler import FrameScheduler
+from utils.input_state import input_state
+from utils.profiler import FrameProfiler
+from utils.render_backend import RENDER_BACKENDS, create_canvas
 
 class Game:
-    def __init__(self):
+    def __init__(self, render_mode=RENDER_MODE, deterministic=False, render_backend=RENDER_BACKEND):
+        """
+        Initialize the game.
+
+        Args:
+            render_mode: "dirty" or "full" redraws
+            deterministic: Finish background work synchronously so a
+                session can be recorded and replayed exactly
+            render_backend: "surface" (software blits) or "texture"
+                (SDL renderer), see utils.render_backend
+        """
         self.logger = setup_logger()
+        self.frame_logger = get_frame_logger()
         self.logger.info("Initializing game...")
+        self.render_mode = render_mode
+        self.render_backend = render_backend
         
         try:
             pygame.init()
-            self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-            pygame.display.set_caption("Ellie & Vivi's Learning Adventure!")
+            self.screen = create_canvas(
+                render_backend,
+                (WINDOW_WIDTH, WINDOW_HEIGHT),
+                "Ellie & Vivi's Learning Adventure!"
+            )
+            font_registry.preload()
+            self.assets = asset_manager
+            self.assets.start()
+            input_state.deterministic = deterministic
+            if deterministic:
+                # The loading screen must last the same number of frames every run
+                self.assets.wait()
             self.clock = pygame.time.Clock()
+            self.scheduler = FrameScheduler(self.clock)
+            self.scheduler.install_event_filter()
+            self.profiler = FrameProfiler()
             self.running = True
-            self.current_screen = PlayerSelect(self.screen, self.change_screen)
+            self.screens = ScreenCache()
+            self.registry = screen_registry
+            self.last_transition_ms = None
+            self.current_screen = None
+            self.change_screen("loading")
             self.logger.info("Game initialized successfully")
         except Exception as e:
             self.logger.error(f"Error during initialization: {str(e)}")
@@ -30,99 +70,222 @@ class Game:
     def change_screen(self, screen_name, **kwargs):
         try:
             self.logger.info(f"Changing screen to: {screen_name} with args: {kwargs}")
-            
-            if screen_name == "menu":
-                self.current_screen = MenuScreen(self.screen, self.change_screen, **kwargs)
-            elif screen_name == "player_select":
-                self.current_screen = PlayerSelect(self.screen, self.change_screen)
-            elif screen_name == "game":
-                game_type = kwargs.get('game_type')
-                if game_type == "spelling":
-                    self.current_screen = SpellingGameScreen(
-                        self.screen, 
-                        self.change_screen, 
-                        kwargs.get('player')
-                    )
-                elif game_type in ["math", "science"]:
-                    self.current_screen = GameScreen(
-                        self.screen, 
-                        self.change_screen, 
-                        **kwargs
-                    )
-                else:
-                    self.logger.warning(f"Unknown game type: {game_type}")
+            start = time.perf_counter()
+
+            screen = self.screens.get(screen_name, kwargs)
+            if screen is None:
+                screen = self.create_screen(screen_name, **kwargs)
+                if screen is None:
                     return
-                    
-            self.logger.info("Screen changed successfully")
+                self.screens.put(screen_name, kwargs, screen)
+
+            if screen is not self.current_screen:
+                if self.current_screen is not None:
+                    self.current_screen.on_exit()
+                self.current_screen = screen
+                screen.on_enter()
+                if screen_name == "player_select" and SCREEN_PREWARM:
+                    self.registry.prewarm()
+
+            self.last_transition_ms = (time.perf_counter() - start) * 1000
+            self.profiler.record_transition(self.last_transition_ms)
+            self.logger.info(f"Screen changed successfully in {self.last_transition_ms:.2f} ms")
         except Exception as e:
             self.logger.error(f"Error changing screen: {str(e)}")
             self.logger.error(traceback.format_exc())
             # Try to recover
-            self.current_screen = PlayerSelect(self.screen, self.change_screen)
+            self.screens.clear()
+            self.current_screen = self.registry.resolve("player_select")(self.screen, self.change_screen)
+
+    def create_screen(self, screen_name, **kwargs):
+        """Build a new screen instance, or return None for an unknown target."""
+        screen_class = self.registry.resolve(screen_name, kwargs.get('game_type'))
+        if screen_class is None:
+            if screen_name == "game":
+                self.logger.warning(f"Unknown game type: {kwargs.get('game_type')}")
+            else:
+                self.logger.warning(f"Unknown screen: {screen_name}")
+            return None
+        return screen_class(self.screen, self.change_screen, **kwargs)
 
     def update(self):
         try:
             self.current_screen.update()
         except Exception as e:
-            self.logger.error(f"Error in update: {str(e)}")
-            self.logger.error(traceback.format_exc())
+            self.frame_logger.error(f"Error in update: {str(e)}")
+            self.frame_logger.error(traceback.format_exc())
 
     def draw(self):
         try:
-            self.current_screen.draw()
-            pygame.display.flip()
+            self.present()
         except Exception as e:
-            self.logger.error(f"Error in draw: {str(e)}")
-            self.logger.error(traceback.format_exc())
+            self.frame_logger.error(f"Error in draw: {str(e)}")
+            self.frame_logger.error(traceback.format_exc())
+
+    def present(self):
+        """Draw the current screen and push the changed pixels to the display."""
+        self.profiler.prepare(self.current_screen)
+        rects = self.render_frame()
+        self.profiler.mark('draw')
+        rects = self.profiler.draw_overlay(self.screen, rects)
+        self.flip(rects)
+        self.current_screen.on_presented()
+        self.profiler.mark('flip')
+        self.profiler.end_frame(rects)
+
+    def render_frame(self):
+        """
+        Draw the current screen.
+
+        Returns:
+            list: Changed display rects, or None after a full redraw
+        """
+        if self.render_mode == "dirty":
+            return self.current_screen.render()
+        self.current_screen.draw()
+        return None
+
+    def flip(self, rects):
+        """Push rendered pixels to the display."""
+        self.screen.present(rects)
+
+    def process_events(self, events):
+        """
+        Dispatch a frame's events to the current screen.
+
+        Returns:
+            bool: False if the game should quit
+        """
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.logger.info("Quit event received")
+                return False
+            if event.type == ASSET_LOADED_EVENT:
+                self.assets.poll()
+                continue
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.current_screen.mark_all_dirty()
+            if event.type == pygame.KEYDOWN and event.key == PROFILER_HOTKEY:
+                self.profiler.toggle(self.current_screen)
+                continue
+            if not self.current_screen.handle_event(event):
+                return False
+        return True
 
     def cleanup(self):
         try:
             self.logger.info("Cleaning up game resources...")
+            self.logger.info(f"Frame scheduler stats: {self.scheduler.get_stats()}")
+            self.logger.info(f"Render backend stats: {self.screen.get_stats()}")
+            self.assets.shutdown()
+            self.screens.clear()
+            self.screen.close()
             pygame.quit()
             self.logger.info("Cleanup completed")
         except Exception as e:
             self.logger.error(f"Error during cleanup: {str(e)}")
             self.logger.error(traceback.format_exc())
 
-    def run(self):
+    def run(self, recorder=None):
+        """
+        Run the game until it quits.
+
+        Args:
+            recorder: Optional SessionRecorder that gets every frame's input
+        """
         self.logger.info("Starting game loop")
         try:
+            if recorder is not None:
+                random.seed(recorder.seed)
             while self.running:
-                self.clock.tick(FPS)
-                
-                # Handle events
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        self.logger.info("Quit event received")
-                        self.running = False
-                        break
-                    if not self.current_screen.handle_event(event):
-                        self.running = False
-                        break
-
-                if not self.running:
-                    break
+                events = self.scheduler.next_events(
+                    self.current_screen,
+                    keep_awake=self.profiler.enabled
+                )
+                if recorder is not None:
+                    recorder.record_frame(input_state.latch(), events)
+                self.running = self.step(events)
 
-                # Update and check if we should continue
-                if not self.current_screen.update():
-                    self.logger.info("Screen update signaled quit")
-                    self.running = False
-                    break
+        except Exception as e:
+            self.logger.error(f"Error in game loop: {str(e)}")
+            self.logger.error(traceback.format_exc())
+        finally:
+            if recorder is not None:
+                recorder.close()
+                self.logger.info(f"Recorded {recorder.frames} frames to {recorder.path}")
+            input_state.release()
+            self.cleanup()
 
-                # Draw
-                self.current_screen.draw()
-                pygame.display.flip()
+    def replay(self, session):
+        """
+        Run a recorded session as fast as possible, without the frame cap
+        or idle waits.
 
+        Returns:
+            list: Milliseconds spent on each replayed frame
+        """
+        self.logger.info(f"Replaying {len(session.frames)} frames")
+        frame_times = []
+        try:
+            random.seed(session.seed)
+            for frame in session.frames:
+                start = time.perf_counter()
+                input_state.latch(frame.ticks, frame.pos, frame.buttons)
+                # Drop live events such as asset notifications; the recording has the real ones
+                pygame.event.clear()
+                running = self.step(frame.events)
+                frame_times.append((time.perf_counter() - start) * 1000)
+                if not running:
+                    break
         except Exception as e:
-            self.logger.error(f"Error in game loop: {str(e)}")
+            self.logger.error(f"Error in replay: {str(e)}")
             self.logger.error(traceback.format_exc())
         finally:
+            input_state.release()
             self.cleanup()
+        return frame_times
+
+    def step(self, events):
+        """
+        Run one frame: dispatch events, update and present.
+
+        Returns:
+            bool: False if the game should quit
+        """
+        self.profiler.begin_frame()
+
+        # Handle events
+        if not self.process_events(events):
+            return False
+        self.profiler.mark('events')
+
+        # Update and check if we should continue
+        if not self.current_screen.update():
+            self.logger.info("Screen update signaled quit")
+            return False
+        self.profiler.mark('update')
+
+        # Draw
+        self.present()
+        return True
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ellie & Vivi's Learning Adventure")
+    parser.add_argument("--record", metavar="FILE",
+                        help="Record the session's input for python -m utils.session_recording")
+    parser.add_argument("--render-backend", choices=RENDER_BACKENDS, default=RENDER_BACKEND,
+                        help="Draw with software blits or an SDL texture renderer")
+    args = parser.parse_args()
     try:
-        game = Game()
-        game.run()
+        recorder = None
+        if args.record:
+            from utils.session_recording import SessionRecorder
+            recorder = SessionRecorder(
+                args.record, SAVE_DIR, SESSION_SNAPSHOT_PATTERN,
+                skip_types=(ASSET_LOADED_EVENT,), render_mode=RENDER_MODE
+            )
+        game = Game(deterministic=recorder is not None, render_backend=args.render_backend)
+        game.run(recorder)
     except Exception as e:
         logger = setup_logger()
         logger.critical(f"Fatal error: {str(e)}")
@@ -1,17 +1,26 @@
 # screens/base_screen.py
 import pygame
-from utils.button_manager import Button
-from config import COLORS, WINDOW_WIDTH
-from utils.logger import setup_logger
+from utils.button_manager import Button, ButtonGroup
+from config import COLORS, WINDOW_WIDTH, FONT_SIZES
+from utils.font_registry import get_font
+from utils.input_state import input_state
+from utils.layers import Layer
+from utils.logger import setup_logger, get_frame_logger
+from utils.text_cache import render_text
 
 class BaseScreen:
+    """
+    Base of every screen. `screen` is the canvas from utils.render_backend,
+    so screens draw the same way on either render backend.
+    """
     def __init__(self, screen, change_screen_callback):
         self.screen = screen
         self.change_screen = change_screen_callback
-        self.font_large = pygame.font.Font(None, 74)
-        self.font_medium = pygame.font.Font(None, 48)
-        self.font_small = pygame.font.Font(None, 36)
+        self.font_large = get_font(None, FONT_SIZES['large'])
+        self.font_medium = get_font(None, FONT_SIZES['medium'])
+        self.font_small = get_font(None, FONT_SIZES['small'])
         self.logger = setup_logger()  # Initialize logger in base class
+        self.frame_logger = get_frame_logger()  # Rate limited, for update/draw
         
         # Create back button
         self.back_button = Button(
@@ -22,39 +31,156 @@ class BaseScreen:
             border_radius=8
         )
 
+        self.buttons = ButtonGroup()
+        self.buttons.add(self.back_button)
+
+        # Dirty-rect rendering state
+        self.widgets = []
+        self.dirty_rects = []
+        self.needs_full_redraw = True
+
+        # Background, title and button faces, composited once per key change
+        self.static_layer = Layer(
+            screen.get_size(),
+            self.draw_static,
+            self.static_layer_key,
+            reference=screen.reference
+        )
+
     def handle_event(self, event):
         """Base event handler that all screens should implement or inherit."""
+        clicked = self.buttons.handle_event(event)
+        if clicked is not None:
+            return self.on_button_click(clicked)
+        return True
+
+    def on_button_click(self, button):
+        """React to a clicked button; return False to quit the game."""
+        if button is self.back_button:
+            return self.handle_back()
         return True
 
     def update(self):
-        """Update screen state."""
-        try:
-            mouse_pos = pygame.mouse.get_pos()
-            if self.back_button.update(mouse_pos):
-                return self.handle_back()
-            return True
-        except Exception as e:
-            self.logger.error(f"Error in base update: {str(e)}")
-            return True
+        """Update screen state. Buttons are driven by handle_event."""
+        return True
 
     def draw(self):
-        """Base draw method that all screens must implement."""
-        raise NotImplementedError("Screens must implement draw method")
+        """Blit the pre-composited static layer, then draw the dynamic content."""
+        self.static_layer.blit(self.screen)
+        self.draw_dynamic()
+
+    def static_layer_key(self):
+        """Inputs of the static layer; override when static content can change."""
+        return ()
+
+    def draw_static(self, surface):
+        """Draw content that only changes with static_layer_key()."""
+        surface.fill(COLORS['LIGHT_BLUE'])
+        self.back_button.draw_face(surface)
+
+    def draw_dynamic(self):
+        """Draw per-frame content on top of the static layer."""
+        hovered = self.buttons.hovered
+        if hovered is not None and hovered.visible:
+            hovered.draw_hover(self.screen)
 
     def handle_back(self):
         """Default back behavior - should be overridden."""
         return True
 
-    def draw_title(self, text):
-        title = self.font_large.render(text, True, COLORS['PURPLE'])
+    def on_enter(self):
+        """Called when the screen becomes current, including on reuse."""
+        self.buttons.set_hovered(None)
+        self.buttons.refresh_hover(input_state.get_mouse_pos())
+        self.buttons.changed.clear()
+        self.mark_all_dirty()
+
+    def on_exit(self):
+        """Called when another screen replaces this one."""
+        pass
+
+    def on_discard(self):
+        """Called when the screen cache drops this instance for good."""
+        pass
+
+    def mark_dirty(self, rect):
+        """Report a region of the display that must be redrawn."""
+        self.dirty_rects.append(pygame.Rect(rect))
+
+    def mark_all_dirty(self):
+        """Request a full redraw on the next frame."""
+        self.needs_full_redraw = True
+
+    def has_pending_redraw(self):
+        """Whether the next render() would push any pixels."""
+        return (
+            self.needs_full_redraw
+            or bool(self.dirty_rects)
+            or bool(self.buttons.changed)
+            or any(widget.dirty for widget in self.widgets)
+            or self.static_layer.is_stale()
+        )
+
+    def next_wakeup(self):
+        """Tick count at which the screen next needs an update, or None."""
+        return None
+
+    def on_presented(self):
+        """Called after a rendered frame reached the display."""
+        for widget in self.widgets:
+            if hasattr(widget, "on_presented"):
+                widget.on_presented()
+
+    def render(self):
+        """
+        Redraw only the regions that changed since the last frame.
+
+        Returns:
+            list: Display rects that were redrawn (empty when idle)
+        """
+        for button in self.buttons.changed:
+            self.mark_dirty(button.rect)
+        self.buttons.changed.clear()
+        for widget in self.widgets:
+            if widget.dirty:
+                self.mark_dirty(widget.rect)
+                widget.dirty = False
+
+        if self.needs_full_redraw or self.static_layer.is_stale():
+            self.needs_full_redraw = False
+            self.dirty_rects = []
+            self.draw()
+            return [self.screen.get_rect()]
+
+        if not self.dirty_rects:
+            return []
+
+        if not self.screen.partial_updates:
+            # The canvas keeps nothing between frames, so any change repaints it all
+            self.dirty_rects = []
+            self.draw()
+            return [self.screen.get_rect()]
+
+        rects = merge_rects(self.dirty_rects)
+        self.dirty_rects = []
+        for rect in rects:
+            self.screen.set_clip(rect)
+            self.draw()
+        self.screen.set_clip(None)
+        return rects
+
+    def draw_title(self, text, surface=None):
+        surface = surface or self.screen
+        title = render_text(self.font_large, text, COLORS['PURPLE'])
         title_rect = title.get_rect(center=(WINDOW_WIDTH//2, 100))
-        self.screen.blit(title, title_rect)
+        surface.blit(title, title_rect)
 
-    def draw_centered_text(self, text, y_position, font=None, color=COLORS['BLACK']):
+    def draw_centered_text(self, text, y_position, font=None, color=COLORS['BLACK'], surface=None):
+        surface = surface or self.screen
         font = font or self.font_medium
-        text_surface = font.render(text, True, color)
+        text_surface = render_text(font, text, color)
         text_rect = text_surface.get_rect(center=(WINDOW_WIDTH//2, y_position))
-        self.screen.blit(text_surface, text_rect)
+        surface.blit(text_surface, text_rect)
 
     def create_button(self, text, y_position, width=300, height=80, color=COLORS['MINT_GREEN']):
         """
@@ -80,4 +206,16 @@ class BaseScreen:
             text,
             color,
             self.font_medium
-        )
\ No newline at end of file
+        )
+
+def merge_rects(rects):
+    """Merge overlapping rects so each region is redrawn once."""
+    merged = []
+    for rect in rects:
+        rect = rect.copy()
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
@@ -3,6 +3,10 @@ import pygame
 from screens.base_screen import BaseScreen
 from utils.button_manager import Button
 from config import COLORS, WINDOW_WIDTH, WINDOW_HEIGHT
+from utils.text_cache import render_text
+from utils.answer_log import get_answer_log
+from utils.input_state import input_state
+from utils.score_manager import get_score_manager
 
 class GameScreen(BaseScreen):
     def __init__(self, screen, change_screen_callback, game_type=None, player=None):
@@ -11,6 +15,10 @@ class GameScreen(BaseScreen):
         self.game_type = game_type
         self.player = player
         self.score = 0
+
+        # Every answer is logged with how long the prompt was on screen
+        self.answer_log = get_answer_log()
+        self.prompt_ticks = None
         
         # Game state
         self.is_game_active = False
@@ -28,42 +36,52 @@ class GameScreen(BaseScreen):
             COLORS['MINT_GREEN'],
             self.font_medium
         )
+        self.buttons.add(self.start_button)
+
+        # Region redrawn when the score changes
+        self.score_rect = pygame.Rect(20, 80, 300, self.font_medium.get_linesize())
         
         self.logger.info(f"GameScreen initialized with type: {game_type} for player: {player}")
 
-    def update(self):
-        """Update game state."""
-        try:
-            super().update()
-            mouse_pos = pygame.mouse.get_pos()
-            
+    def on_button_click(self, button):
+        """Start the game when the start button is clicked."""
+        if button is self.start_button:
             if not self.is_game_active:
-                if self.start_button.update(mouse_pos):
-                    self.is_game_active = True
-                    self.setup_game()
-        except Exception as e:
-            self.logger.error(f"Error in game screen update: {str(e)}")
+                self.is_game_active = True
+                self.start_button.visible = False
+                self.setup_game()
+            return True
+        return super().on_button_click(button)
+
+    def static_layer_key(self):
+        """The static layer changes with the game state."""
+        return (self.is_game_active, self.show_results, self.show_results and self.score)
 
-    def draw(self):
-        """Draw the game screen."""
+    def draw_static(self, surface):
+        """Draw the parts of the game screen that only change with its state."""
         try:
-            self.screen.fill(COLORS['LIGHT_BLUE'])
-            self.back_button.draw(self.screen)
+            super().draw_static(surface)
             
             if self.is_game_active:
-                self.draw_game()
+                self.draw_game_static(surface)
             elif self.show_results:
-                self.draw_results()
+                self.draw_results(surface)
             else:
-                self.draw_start_screen()
+                self.draw_start_screen(surface)
         except Exception as e:
-            self.logger.error(f"Error in game screen draw: {str(e)}")
+            self.frame_logger.error(f"Error in game screen draw: {str(e)}")
+
+    def draw_dynamic(self):
+        """Draw hover states and, while playing, the live game elements."""
+        super().draw_dynamic()
+        if self.is_game_active:
+            self.draw_game()
 
-    def draw_start_screen(self):
+    def draw_start_screen(self, surface):
         """Draw the initial game screen with start button."""
         try:
-            self.draw_title(f"Welcome to {self.game_type.title()}!")
-            self.start_button.draw(self.screen)
+            self.draw_title(f"Welcome to {self.game_type.title()}!", surface)
+            self.start_button.draw_face(surface)
             
             # Draw instructions
             instructions = self.get_game_instructions()
@@ -71,52 +89,91 @@ class GameScreen(BaseScreen):
                 self.draw_centered_text(
                     line,
                     WINDOW_HEIGHT // 2 + 100 + (i * 40),
-                    self.font_small
+                    self.font_small,
+                    surface=surface
                 )
         except Exception as e:
-            self.logger.error(f"Error drawing start screen: {str(e)}")
+            self.frame_logger.error(f"Error drawing start screen: {str(e)}")
+
+    def draw_game_static(self, surface):
+        """Draw the static parts of the active game screen."""
+        try:
+            self.draw_title(f"{self.player}'s {self.game_type.title()} Game", surface)
+        except Exception as e:
+            self.frame_logger.error(f"Error drawing game screen: {str(e)}")
 
     def draw_game(self):
-        """Draw the active game screen."""
+        """Draw the dynamic parts of the active game screen."""
         try:
-            self.draw_title(f"{self.player}'s {self.game_type.title()} Game")
             self.draw_score()
         except Exception as e:
-            self.logger.error(f"Error drawing game screen: {str(e)}")
+            self.frame_logger.error(f"Error drawing game screen: {str(e)}")
 
     def draw_score(self):
         """Draw the current score."""
         try:
             score_text = f"Score: {self.score}"
-            score_surface = self.font_medium.render(score_text, True, COLORS['BLACK'])
-            score_rect = score_surface.get_rect(topleft=(20, 80))
+            score_surface = render_text(self.font_medium, score_text, COLORS['BLACK'])
+            score_rect = score_surface.get_rect(topleft=self.score_rect.topleft)
             self.screen.blit(score_surface, score_rect)
         except Exception as e:
-            self.logger.error(f"Error drawing score: {str(e)}")
+            self.frame_logger.error(f"Error drawing score: {str(e)}")
 
-    def draw_results(self):
+    def draw_results(self, surface):
         """Draw the game results screen."""
         try:
-            self.draw_title("Game Over!")
+            self.draw_title("Game Over!", surface)
             self.draw_centered_text(
                 f"Final Score: {self.score}",
-                WINDOW_HEIGHT // 2
+                WINDOW_HEIGHT // 2,
+                surface=surface
             )
         except Exception as e:
-            self.logger.error(f"Error drawing results: {str(e)}")
+            self.frame_logger.error(f"Error drawing results: {str(e)}")
 
     def setup_game(self):
         """Set up the game state. Should be overridden by specific game implementations."""
         pass
 
     def add_score(self, points):
-        """Add points to the score."""
+        """Add points to the score and to the player's saved scores."""
         try:
             self.score += points
+            self.mark_dirty(self.score_rect)
             self.logger.info(f"Score updated: {self.score}")
+            # SCORE_BACKEND decides where the points go: JSON, SQLite or the score server
+            get_score_manager(self.player, self.game_type).add_points(points)
         except Exception as e:
             self.logger.error(f"Error updating score: {str(e)}")
 
+    def prompt_shown(self):
+        """Start timing the answer to a prompt that just appeared."""
+        self.prompt_ticks = input_state.get_ticks()
+
+    def record_answer(self, item, correct, distance=None):
+        """
+        Log one answer to the analytics log.
+
+        Args:
+            item: Word or problem that was answered
+            correct: Whether the answer was right
+            distance: Edit distance from the right answer, if graded that way
+        """
+        try:
+            now = input_state.get_ticks()
+            latency = now - self.prompt_ticks if self.prompt_ticks is not None else 0
+            self.answer_log.record(self.player, self.game_type, item, latency, correct, distance)
+        except Exception as e:
+            self.logger.error(f"Error logging answer: {str(e)}")
+
+    def on_exit(self):
+        """Write buffered answers when leaving the game."""
+        super().on_exit()
+        try:
+            self.answer_log.flush()
+        except Exception as e:
+            self.logger.error(f"Error flushing answer log: {str(e)}")
+
     def get_game_instructions(self):
         """Get game-specific instructions."""
         return ["Instructions coming soon!"]
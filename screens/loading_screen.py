@@ -0,0 +1,52 @@
+# screens/loading_screen.py
+import pygame
+from screens.base_screen import BaseScreen
+from config import COLORS, WINDOW_WIDTH, WINDOW_HEIGHT
+from utils.asset_manager import asset_manager
+
+class LoadingScreen(BaseScreen):
+    """
+    Progress bar shown while the asset manager works through its manifest.
+    Moves on to player select as soon as every asset is finished.
+    """
+    def __init__(self, screen, change_screen_callback, assets=None, next_screen="player_select"):
+        super().__init__(screen, change_screen_callback)
+        self.assets = assets or asset_manager
+        self.next_screen = next_screen
+        self.back_button.visible = False
+
+        bar_width = 500
+        self.bar_rect = pygame.Rect(
+            (WINDOW_WIDTH - bar_width) // 2,
+            WINDOW_HEIGHT // 2,
+            bar_width,
+            40
+        )
+        self.shown_loaded = -1
+
+    def update(self):
+        """Finish decoded assets and leave once everything is loaded."""
+        try:
+            self.assets.poll()
+            if self.assets.loaded != self.shown_loaded:
+                self.shown_loaded = self.assets.loaded
+                self.mark_dirty(self.bar_rect)
+            if self.assets.is_done():
+                self.logger.info(f"Assets loaded ({len(self.assets.failed)} failed)")
+                self.change_screen(self.next_screen)
+        except Exception as e:
+            self.frame_logger.error(f"Error updating loading screen: {str(e)}")
+        return True
+
+    def draw_static(self, surface):
+        """Draw the background, title and empty progress bar."""
+        surface.fill(COLORS['LIGHT_BLUE'])
+        self.draw_title("Loading...", surface=surface)
+        pygame.draw.rect(surface, COLORS['WHITE'], self.bar_rect, border_radius=10)
+
+    def draw_dynamic(self):
+        """Draw the filled part of the progress bar."""
+        filled = self.bar_rect.copy()
+        filled.width = int(self.bar_rect.width * self.assets.progress())
+        if filled.width:
+            self.screen.draw_rect(COLORS['PURPLE'], filled, border_radius=10)
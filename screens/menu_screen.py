@@ -36,38 +36,32 @@ class MenuScreen(BaseScreen):
                 self.font_medium
             )
             self.game_buttons.append((button, game_type))
+            self.buttons.add(button)
 
     def handle_event(self, event):
         """Handle events specific to menu screen."""
-        super().handle_event(event)
-        return True
+        return super().handle_event(event)
 
-    def update(self):
-        """Update menu screen state."""
-        if not super().update():
-            return False
-            
-        mouse_pos = pygame.mouse.get_pos()
-        
-        for button, game_type in self.game_buttons:
-            if button.update(mouse_pos):
+    def on_button_click(self, button):
+        """Start the game behind the clicked button."""
+        for game_button, game_type in self.game_buttons:
+            if button is game_button:
                 self.change_screen("game", game_type=game_type, player=self.player)
-                
-        return True
+                return True
+        return super().on_button_click(button)
 
     def handle_back(self):
         """Handle back button in menu screen."""
         self.change_screen("player_select")
         return True
 
-    def draw(self):
-        """Draw the menu screen."""
-        self.screen.fill(COLORS['LIGHT_BLUE'])
-        self.back_button.draw(self.screen)
-        self.draw_title(f"{self.player}'s Learning Adventure!")
+    def draw_static(self, surface):
+        """Draw the menu background, title and button faces."""
+        super().draw_static(surface)
+        self.draw_title(f"{self.player}'s Learning Adventure!", surface)
         
         for button, _ in self.game_buttons:
-            button.draw(self.screen)
+            button.draw_face(surface)
 
     def handle_back(self):
         """Handle back button in menu screen"""
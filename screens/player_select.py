@@ -39,37 +39,33 @@ class PlayerSelect(BaseScreen):
             COLORS['MINT_GREEN'],
             self.font_medium
         )
+        self.buttons.add(self.ellie_button)
+        self.buttons.add(self.vivi_button)
 
     def handle_event(self, event):
         """Handle events specific to player select screen."""
-        super().handle_event(event)
-        return True
+        return super().handle_event(event)
 
-    def update(self):
-        """Update player select screen state."""
-        if not super().update():
-            return False
-            
-        mouse_pos = pygame.mouse.get_pos()
-        
-        if self.ellie_button.update(mouse_pos):
+    def on_button_click(self, button):
+        """Pick a player."""
+        if button is self.ellie_button:
             self.change_screen("menu", player="ELLIE")
-        elif self.vivi_button.update(mouse_pos):
+        elif button is self.vivi_button:
             self.change_screen("menu", player="VIVI")
-            
+        else:
+            return super().on_button_click(button)
         return True
 
     def handle_back(self):
         """Handle back button in player select screen."""
         return False  # Signal to quit game
 
-    def draw(self):
-        """Draw the player select screen."""
-        self.screen.fill(COLORS['LIGHT_BLUE'])
-        self.back_button.draw(self.screen)
-        self.draw_title("Who's Playing Today?")
-        self.ellie_button.draw(self.screen)
-        self.vivi_button.draw(self.screen)
+    def draw_static(self, surface):
+        """Draw the player select background, title and button faces."""
+        super().draw_static(surface)
+        self.draw_title("Who's Playing Today?", surface)
+        self.ellie_button.draw_face(surface)
+        self.vivi_button.draw_face(surface)
 
     def handle_back(self):
         """Handle back button in player select screen"""
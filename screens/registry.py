@@ -0,0 +1,90 @@
+# screens/registry.py
+import importlib
+import logging
+import sys
+import threading
+import time
+
+
+class ScreenRegistry:
+    """
+    Maps screen names and game types to "module:Class" targets.
+    A target's module is imported the first time it is needed, so a game's
+    code and content cost nothing at startup. prewarm() imports the rest
+    in the background once the game is up.
+    """
+    def __init__(self):
+        self.screens = {}
+        self.games = {}
+        self.import_times = {}  # module -> milliseconds spent importing it
+        self.logger = logging.getLogger("EllieViviGame")
+        self._lock = threading.Lock()
+        self._prewarm_thread = None
+
+    def register_screen(self, name, target):
+        self.screens[name] = target
+
+    def register_game(self, game_type, target):
+        self.games[game_type] = target
+
+    def resolve(self, screen_name, game_type=None):
+        """
+        Return the class for a screen, importing its module if needed.
+
+        Returns:
+            type: Screen class, or None if nothing is registered
+        """
+        target = self.games.get(game_type) if screen_name == "game" else self.screens.get(screen_name)
+        if target is None:
+            return None
+        module_name, class_name = target.split(":")
+        return getattr(self.load_module(module_name), class_name)
+
+    def load_module(self, module_name):
+        """Import a module once, recording how long the import took."""
+        if module_name in self.import_times:
+            # Recorded only after the import finished, so the module is complete
+            return sys.modules[module_name]
+        # Python's import lock already serializes two imports of one module;
+        # holding ours here would stall the game thread behind a prewarm
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        elapsed = (time.perf_counter() - start) * 1000
+        with self._lock:
+            if module_name not in self.import_times:
+                self.import_times[module_name] = elapsed
+                self.logger.info(f"Loaded {module_name} in {elapsed:.1f} ms")
+        return module
+
+    def modules(self):
+        targets = list(self.screens.values()) + list(self.games.values())
+        return list(dict.fromkeys(target.split(":")[0] for target in targets))
+
+    def prewarm(self):
+        """
+        Import every registered module on a background thread, then run
+        each module's optional prewarm() to load its content.
+        """
+        if self._prewarm_thread is not None:
+            return
+        self._prewarm_thread = threading.Thread(target=self._prewarm, name="screen-prewarm", daemon=True)
+        self._prewarm_thread.start()
+
+    def _prewarm(self):
+        for module_name in self.modules():
+            try:
+                module = self.load_module(module_name)
+                hook = getattr(module, "prewarm", None)
+                if hook is not None:
+                    hook()
+            except Exception as e:
+                self.logger.error(f"Error prewarming {module_name}: {str(e)}")
+
+
+screen_registry = ScreenRegistry()
+screen_registry.register_screen("loading", "screens.loading_screen:LoadingScreen")
+screen_registry.register_screen("player_select", "screens.player_select:PlayerSelect")
+screen_registry.register_screen("menu", "screens.menu_screen:MenuScreen")
+screen_registry.register_game("spelling", "games.spelling.spelling_game_screen:SpellingGameScreen")
+screen_registry.register_game("math", "games.math.math_game_screen:MathGameScreen")
+screen_registry.register_game("science", "screens.game_screen:GameScreen")
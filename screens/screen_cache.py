@@ -0,0 +1,68 @@
+# screens/screen_cache.py
+from collections import OrderedDict
+
+from config import GAME_SCREEN_CACHE_SIZE
+
+
+class ScreenCache:
+    """
+    Keeps screen instances alive between visits.
+    Menu-style screens are kept for the whole session; game screens are
+    heavier and live in a bounded LRU.
+    """
+    def __init__(self, max_game_screens=GAME_SCREEN_CACHE_SIZE, heavy_screens=("game",)):
+        """
+        Initialize the cache.
+
+        Args:
+            max_game_screens: How many heavy screens to keep warm
+            heavy_screens: Screen names that are subject to LRU eviction
+        """
+        self.max_game_screens = max_game_screens
+        self.heavy_screens = set(heavy_screens)
+        self._screens = {}
+        self._game_screens = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(screen_name, kwargs):
+        return (screen_name, tuple(sorted(kwargs.items())))
+
+    def get(self, screen_name, kwargs):
+        """Return a warm screen instance, or None if it must be built."""
+        key = self.make_key(screen_name, kwargs)
+        if screen_name in self.heavy_screens:
+            screen = self._game_screens.get(key)
+            if screen is not None:
+                self._game_screens.move_to_end(key)
+        else:
+            screen = self._screens.get(key)
+
+        if screen is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return screen
+
+    def put(self, screen_name, kwargs, screen):
+        key = self.make_key(screen_name, kwargs)
+        if screen_name not in self.heavy_screens:
+            self._screens[key] = screen
+            return
+
+        self._game_screens[key] = screen
+        self._game_screens.move_to_end(key)
+        while len(self._game_screens) > self.max_game_screens:
+            _, evicted = self._game_screens.popitem(last=False)
+            evicted.on_discard()
+
+    def clear(self):
+        screens = list(self._screens.values()) + list(self._game_screens.values())
+        self._screens.clear()
+        self._game_screens.clear()
+        for screen in screens:
+            screen.on_discard()
+
+    def __len__(self):
+        return len(self._screens) + len(self._game_screens)
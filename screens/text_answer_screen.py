@@ -0,0 +1,177 @@
+# screens/text_answer_screen.py
+import pygame
+from screens.game_screen import GameScreen
+from config import COLORS, WINDOW_WIDTH, WINDOW_HEIGHT
+from utils.input_state import input_state
+from utils.text_field import TextField
+
+
+class TextAnswerScreen(GameScreen):
+    """
+    Game screen where the player types an answer and presses Enter.
+    Owns the input field and the feedback message shown after each answer;
+    games pick the prompt in setup_game and grade it in submit_answer.
+    """
+    def __init__(self, screen, change_screen_callback, game_type, player,
+                 input_width, allowed=None, max_length=None, on_change=None):
+        """
+        Initialize the answer field and feedback state.
+
+        Args:
+            screen: Canvas to draw on
+            change_screen_callback: Called to switch screens
+            game_type: Game identifier
+            player: Player name
+            input_width: Width of the centered input box
+            allowed: Predicate for accepted characters (None accepts all)
+            max_length: Longest accepted answer (None for the field default)
+            on_change: Called with no arguments after every text change
+        """
+        super().__init__(screen, change_screen_callback, game_type, player)
+
+        # Create input box
+        self.input_box = pygame.Rect(
+            WINDOW_WIDTH//2 - input_width//2,
+            WINDOW_HEIGHT//2,
+            input_width,
+            50
+        )
+        field_options = {} if max_length is None else {'max_length': max_length}
+        self.input_field = TextField(
+            self.input_box,
+            self.font_medium,
+            allowed=allowed,
+            on_change=on_change,
+            **field_options
+        )
+        self.widgets.append(self.input_field)
+
+        # Feedback messages
+        self.feedback = ""
+        self.feedback_timer = 0
+        self.feedback_duration = 2000  # 2 seconds in milliseconds
+        self.feedback_visible = False
+
+        # Region redrawn when the feedback changes
+        self.feedback_rect = pygame.Rect(0, WINDOW_HEIGHT//2 + 75, WINDOW_WIDTH, 50)
+
+    @property
+    def user_input(self):
+        return self.input_field.text
+
+    @user_input.setter
+    def user_input(self, text):
+        self.input_field.set_text(text)
+
+    @property
+    def input_active(self):
+        return self.input_field.active
+
+    @input_active.setter
+    def input_active(self, active):
+        self.input_field.set_active(active)
+
+    def handle_event(self, event):
+        """Handle pygame events."""
+        result = super().handle_event(event)
+
+        if self.is_game_active:
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                # Handle input box activation
+                self.input_field.handle_event(event)
+            elif event.type in (pygame.KEYDOWN, pygame.TEXTINPUT, pygame.TEXTEDITING) and self.input_active:
+                self.handle_key_input(event)
+        return result
+
+    def handle_key_input(self, event):
+        """Submit on Enter; every other key goes to the input field."""
+        try:
+            if event.type == pygame.KEYDOWN and event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+                self.submit_answer()
+            else:
+                self.input_field.handle_event(event)
+        except Exception as e:
+            self.logger.error(f"Error handling key input: {str(e)}")
+
+    def submit_answer(self):
+        """Grade the typed answer. Should be overridden by specific games."""
+        pass
+
+    def show_feedback(self, message):
+        """Show the verdict on an answer and clear the field for the next one."""
+        self.feedback = message
+        self.feedback_timer = input_state.get_ticks()
+        self.feedback_visible = True
+        self.user_input = ""
+        # The next prompt invalidates the static layer; the input and
+        # feedback are dynamic and need their own regions redrawn
+        self.mark_dirty(self.input_box)
+        self.mark_dirty(self.feedback_rect)
+
+    def reset_answer(self):
+        """Clear the input and any feedback for a new game."""
+        self.user_input = ""
+        self.feedback = ""
+        self.feedback_timer = 0
+        self.feedback_visible = False
+
+    def on_exit(self):
+        """Drop keyboard focus when leaving the game."""
+        super().on_exit()
+        self.input_active = False
+        self.logger.info(f"Typing latency: {self.input_field.get_latency_stats()}")
+
+    def update(self):
+        """Update game state and expire the feedback message."""
+        result = super().update()
+        self.input_field.update()
+        if self.feedback_visible:
+            elapsed = input_state.get_ticks() - self.feedback_timer
+            if elapsed >= self.feedback_duration:
+                self.feedback_visible = False
+                self.mark_dirty(self.feedback_rect)
+        return result
+
+    def next_wakeup(self):
+        """Wake the main loop when the feedback expires or the caret blinks."""
+        wakeups = [self.input_field.next_wakeup()]
+        if self.feedback_visible:
+            wakeups.append(self.feedback_timer + self.feedback_duration)
+        wakeups = [wakeup for wakeup in wakeups if wakeup is not None]
+        return min(wakeups) if wakeups else None
+
+    def draw_game_static(self, surface):
+        """Draw the title and the empty input box."""
+        try:
+            super().draw_game_static(surface)
+            pygame.draw.rect(surface, COLORS['WHITE'], self.input_box, border_radius=10)
+        except Exception as e:
+            self.frame_logger.error(f"Error drawing game: {str(e)}")
+
+    def input_border_color(self):
+        """Color of the focused input box border."""
+        return COLORS['PURPLE']
+
+    def draw_game(self):
+        """Draw the score, the typed answer and the feedback message."""
+        try:
+            super().draw_game()
+
+            if self.input_active:
+                self.screen.draw_rect(self.input_border_color(), self.input_box, 3, border_radius=10)
+
+            # Draw user input; the field re-renders only when its text changes
+            self.input_field.draw(self.screen)
+
+            if self.feedback_visible:
+                feedback_color = (
+                    COLORS['MINT_GREEN'] if "Correct" in self.feedback
+                    else COLORS['PINK']
+                )
+                self.draw_centered_text(
+                    self.feedback,
+                    WINDOW_HEIGHT//2 + 100,
+                    color=feedback_color
+                )
+        except Exception as e:
+            self.frame_logger.error(f"Error drawing game: {str(e)}")
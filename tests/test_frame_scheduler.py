@@ -0,0 +1,36 @@
+# tests/test_frame_scheduler.py
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from utils.frame_scheduler import FrameScheduler
+
+
+class _DueScreen:
+    """Screen whose next timer is already overdue."""
+    def __init__(self, wakeup):
+        self.wakeup = wakeup
+
+    def next_wakeup(self):
+        return self.wakeup
+
+
+def test_wait_returns_at_once_when_wakeup_is_past():
+    pygame.init()
+    try:
+        pygame.display.set_mode((1, 1))
+        pygame.event.clear()
+        scheduler = FrameScheduler(pygame.time.Clock(), max_wait_ms=2000)
+        now = pygame.time.get_ticks()
+
+        start = time.perf_counter()
+        events = scheduler._wait(_DueScreen(now - 50), now)
+
+        assert events == []
+        assert time.perf_counter() - start < 0.5
+    finally:
+        pygame.quit()
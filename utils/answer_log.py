@@ -0,0 +1,279 @@
+# utils/answer_log.py
+"""
+Per-answer analytics log.
+
+Every graded answer becomes one row of fixed-width columns. Rows are
+buffered in arrays and appended as a chunk, one file per month
+(answers-YYYY-MM.evl), so months of logs can be streamed chunk by chunk
+and reduced with NumPy without loading them whole.
+
+Chunk layout (little endian):
+    header   magic, version, row count, name count, payload size, CRC-32 of the payload
+    names    u16 length + UTF-8 for each name the chunk uses
+    columns  each column's values for every row, back to back, in COLUMNS order
+
+Players, games and items are stored as ids into the chunk's own name
+list, so every chunk can be read on its own. A torn final chunk from a
+crash is skipped by readers and cut off when the writer first opens that
+file, so later chunks never land behind it.
+"""
+import atexit
+import logging
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from config import ANSWER_LOG_DIR, ANSWER_LOG_CHUNK_ROWS
+
+MAGIC = b"EVA1"
+VERSION = 1
+CHUNK = struct.Struct("<4sHHIIII")
+NAME_LENGTH = struct.Struct("<H")
+
+# (name, array typecode, NumPy dtype)
+COLUMNS = (
+    ('timestamp_ms', 'q', '<i8'),  # Unix time of the answer
+    ('latency_ms', 'I', '<u4'),    # prompt shown to answer submitted
+    ('item', 'I', '<u4'),          # name id of the word or problem
+    ('player', 'H', '<u2'),        # name id
+    ('game', 'H', '<u2'),          # name id
+    ('correct', 'B', 'u1'),
+    ('distance', 'B', 'u1'),       # edit distance from the answer, NO_DISTANCE if not graded that way
+)
+NO_DISTANCE = 255
+_WIDTHS = {'q': 8, 'I': 4, 'H': 2, 'B': 1}
+
+
+def log_path(log_dir: Path, timestamp_ms: int) -> Path:
+    month = time.strftime("%Y-%m", time.localtime(timestamp_ms / 1000))
+    return Path(log_dir) / f"answers-{month}.evl"
+
+
+class AnswerLog:
+    """
+    Buffers answer rows and appends them to the monthly log as chunks.
+    Chunks are encoded on the caller's thread and written and fsynced by a
+    background writer, so a flush on the game thread never waits on disk.
+    """
+    _STOP = object()
+
+    def __init__(self, log_dir: Path = ANSWER_LOG_DIR, chunk_rows: int = ANSWER_LOG_CHUNK_ROWS):
+        """
+        Args:
+            log_dir: Directory of the monthly log files
+            chunk_rows: Rows buffered before a chunk is written
+        """
+        self.log_dir = Path(log_dir)
+        self.chunk_rows = chunk_rows
+        self.rows_written = 0
+        self._lock = threading.Lock()
+        self._reset()
+
+        # Background writer state; the open file belongs to the writer
+        self._queue = queue.SimpleQueue()
+        self._writer = None
+        self._file = None
+        self._file_path = None
+
+    def _reset(self):
+        self._columns = {name: array(code) for name, code, _ in COLUMNS}
+        self._names: Dict[str, int] = {}
+        self._path = None
+
+    def _name_id(self, name: str) -> int:
+        name_id = self._names.get(name)
+        if name_id is None:
+            name_id = self._names[name] = len(self._names)
+        return name_id
+
+    def record(self, player: str, game: str, item: str, latency_ms: int, correct: bool,
+               distance: Optional[int] = None, timestamp_ms: Optional[int] = None):
+        """
+        Append one answer.
+
+        Args:
+            player: Player name
+            game: Game type
+            item: Word or problem the answer was for
+            latency_ms: Milliseconds from showing the prompt to submitting
+            correct: Whether the answer was right
+            distance: Edit distance from the right answer, if graded that way
+            timestamp_ms: Unix time in milliseconds, now if None
+        """
+        timestamp_ms = int(time.time() * 1000) if timestamp_ms is None else timestamp_ms
+        path = log_path(self.log_dir, timestamp_ms)
+        with self._lock:
+            if self._path is not None and path != self._path:
+                # A chunk never spans two monthly files
+                self._flush_locked()
+            self._path = path
+            columns = self._columns
+            columns['timestamp_ms'].append(timestamp_ms)
+            columns['latency_ms'].append(max(0, min(int(latency_ms), 0xFFFFFFFF)))
+            columns['item'].append(self._name_id(item))
+            columns['player'].append(self._name_id(player))
+            columns['game'].append(self._name_id(game))
+            columns['correct'].append(1 if correct else 0)
+            columns['distance'].append(NO_DISTANCE if distance is None else min(distance, NO_DISTANCE - 1))
+            full = len(columns['timestamp_ms']) >= self.chunk_rows
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Hand buffered rows to the writer as one chunk."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        count = len(self._columns['timestamp_ms'])
+        if not count:
+            return
+        payload = bytearray()
+        for name in self._names:
+            encoded = name.encode('utf-8')
+            payload += NAME_LENGTH.pack(len(encoded)) + encoded
+        for name, _, _ in COLUMNS:
+            column = self._columns[name]
+            if sys.byteorder != 'little':
+                column.byteswap()
+            payload += column.tobytes()
+        header = CHUNK.pack(MAGIC, VERSION, 0, count, len(self._names), len(payload), zlib.crc32(payload))
+
+        path = self._path
+        self._reset()
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._writer_loop, name="answer-log", daemon=True)
+            self._writer.start()
+        self._queue.put((path, header + payload, count))
+
+    def _writer_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = self._STOP in batch
+            try:
+                self._write([chunk for chunk in batch if chunk is not self._STOP])
+            except OSError as e:
+                logging.getLogger("EllieViviGame").error(f"Error writing answer log: {str(e)}")
+            if stop:
+                return
+
+    def _write(self, chunks):
+        """Append chunks in order, with one fsync per file touched."""
+        for path, data, count in chunks:
+            if path != self._file_path:
+                self._sync()
+                self._open(path)
+            self._file.write(data)
+            self.rows_written += count
+        self._sync()
+
+    def _open(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # First time this file is opened: cut off a chunk torn by a crash
+        truncate_torn_tail(path)
+        self._file = open(path, 'ab')
+        self._file_path = path
+
+    def _sync(self):
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        """Write every buffered row and stop the writer."""
+        self.flush()
+        if self._writer is not None:
+            self._queue.put(self._STOP)
+            self._writer.join()
+            self._writer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._file_path = None
+
+
+def _intact_chunks(f) -> Iterator[Tuple[int, int, bytes]]:
+    """Yield (row count, name count, payload) up to the first torn or foreign chunk."""
+    while True:
+        header = f.read(CHUNK.size)
+        if len(header) < CHUNK.size:
+            return
+        magic, version, _, count, name_count, size, crc = CHUNK.unpack(header)
+        payload = f.read(size)
+        if magic != MAGIC or version != VERSION or len(payload) != size or zlib.crc32(payload) != crc:
+            # Torn or foreign data; nothing after it can be trusted
+            return
+        yield count, name_count, payload
+
+
+def truncate_torn_tail(path: Path) -> int:
+    """
+    Cut a log file back to its last intact chunk.
+
+    Returns:
+        int: Bytes removed (0 when the file is intact or missing)
+    """
+    try:
+        f = open(path, 'r+b')
+    except FileNotFoundError:
+        return 0
+    with f:
+        end = 0
+        for _ in _intact_chunks(f):
+            end = f.tell()
+        size = f.seek(0, os.SEEK_END)
+        if size > end:
+            f.truncate(end)
+            f.flush()
+            os.fsync(f.fileno())
+        return size - end
+
+
+def read_chunks(path: Path) -> Iterator[Tuple[List[str], Dict[str, memoryview]]]:
+    """
+    Yield (names, columns) for each intact chunk of a log file, reading
+    one chunk at a time. Columns are raw little-endian bytes per COLUMNS.
+    """
+    with open(path, 'rb') as f:
+        for count, name_count, payload in _intact_chunks(f):
+            view = memoryview(payload)
+            names = []
+            position = 0
+            for _ in range(name_count):
+                (length,) = NAME_LENGTH.unpack_from(view, position)
+                position += NAME_LENGTH.size
+                names.append(bytes(view[position:position + length]).decode('utf-8'))
+                position += length
+            columns = {}
+            for name, code, _ in COLUMNS:
+                width = _WIDTHS[code] * count
+                columns[name] = view[position:position + width]
+                position += width
+            yield names, columns
+
+
+_answer_log = None
+_answer_log_lock = threading.Lock()
+
+
+def get_answer_log() -> AnswerLog:
+    """Shared log, flushed at exit."""
+    global _answer_log
+    with _answer_log_lock:
+        if _answer_log is None:
+            _answer_log = AnswerLog()
+            atexit.register(_answer_log.close)
+        return _answer_log
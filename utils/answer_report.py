@@ -0,0 +1,301 @@
+# utils/answer_report.py
+"""
+Summarize the per-answer analytics logs.
+
+    python -m utils.answer_report [--since 2026-01-01] [--until 2026-06-30]
+                                  [--player ELLIE] [--game spelling] [--top 20] [--json]
+
+Logs are streamed one chunk at a time; each chunk's columns become NumPy
+arrays that are filtered and reduced into running totals, so memory stays
+flat however many months are read. Reports per-item error rates, latency
+histograms per game and daily progress per player and game.
+"""
+import argparse
+import json
+import os
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# config imports pygame, whose banner would corrupt --json output
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from config import ANSWER_LOG_DIR, ANSWER_LATENCY_BUCKET_MS, ANSWER_LATENCY_MAX_MS, FUZZY_MAX_EDITS
+from utils.answer_log import COLUMNS, read_chunks
+
+DAY_MS = 86_400_000
+
+
+class _Names:
+    """Global ids for names, so chunks with their own name lists can be combined."""
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def map(self, names: List[str]) -> np.ndarray:
+        """Array translating a chunk's name ids to global ids."""
+        mapping = np.empty(len(names), dtype=np.int64)
+        for local_id, name in enumerate(names):
+            global_id = self.ids.get(name)
+            if global_id is None:
+                global_id = self.ids[name] = len(self.names)
+                self.names.append(name)
+            mapping[local_id] = global_id
+        return mapping
+
+
+def _grow(totals: np.ndarray, size: int) -> np.ndarray:
+    if len(totals) >= size:
+        return totals
+    return np.concatenate([totals, np.zeros(size - len(totals), dtype=totals.dtype)])
+
+
+class AnswerReport:
+    """Running aggregates over streamed answer chunks."""
+    def __init__(self, since_ms: Optional[int] = None, until_ms: Optional[int] = None,
+                 player: Optional[str] = None, game: Optional[str] = None,
+                 bucket_ms: int = ANSWER_LATENCY_BUCKET_MS, max_ms: int = ANSWER_LATENCY_MAX_MS):
+        """
+        Args:
+            since_ms: Only answers at or after this Unix time in milliseconds
+            until_ms: Only answers before this Unix time in milliseconds
+            player: Only this player's answers
+            game: Only this game's answers
+            bucket_ms: Latency histogram bucket width
+            max_ms: Latency of the last bucket; slower answers are counted in it
+        """
+        self.since_ms = since_ms
+        self.until_ms = until_ms
+        self.player = player
+        self.game = game
+        self.names = _Names()
+        self.rows = 0
+        self.chunks = 0
+
+        # Per (game, item) pair, indexed by pair id
+        self._pairs: Dict[int, int] = {}
+        self._pair_keys: List[int] = []
+        self.item_attempts = np.zeros(0, dtype=np.int64)
+        self.item_errors = np.zeros(0, dtype=np.int64)
+        self.item_near_misses = np.zeros(0, dtype=np.int64)
+
+        # Per game id: latency bucket counts
+        self.edges = np.arange(0, max_ms + bucket_ms, bucket_ms)
+        self.histograms: Dict[int, np.ndarray] = {}
+
+        # Per (player, game, local day): [attempts, correct, latency sum]
+        self.days: Dict[tuple, np.ndarray] = {}
+        self._utc_offset_ms = int(datetime.now().astimezone().utcoffset().total_seconds() * 1000)
+
+    def add_chunk(self, names: List[str], raw_columns):
+        """Filter one chunk and fold it into the totals."""
+        columns = {
+            name: np.frombuffer(raw_columns[name], dtype=dtype)
+            for name, _, dtype in COLUMNS
+        }
+        mapping = self.names.map(names)
+        mask = np.ones(len(columns['timestamp_ms']), dtype=bool)
+        if self.since_ms is not None:
+            mask &= columns['timestamp_ms'] >= self.since_ms
+        if self.until_ms is not None:
+            mask &= columns['timestamp_ms'] < self.until_ms
+        for name, wanted in (('player', self.player), ('game', self.game)):
+            if wanted is not None:
+                local_id = names.index(wanted) if wanted in names else -1
+                mask &= columns[name] == local_id
+        if not mask.any():
+            return
+        self.chunks += 1
+
+        timestamps = columns['timestamp_ms'][mask]
+        latency = columns['latency_ms'][mask].astype(np.int64)
+        correct = columns['correct'][mask].astype(np.int64)
+        distance = columns['distance'][mask]
+        player = mapping[columns['player'][mask]]
+        game = mapping[columns['game'][mask]]
+        item = mapping[columns['item'][mask]]
+        self.rows += len(timestamps)
+
+        self._add_items(game, item, correct, distance)
+        self._add_latency(game, latency)
+        self._add_days(player, game, timestamps, correct, latency)
+
+    def _add_items(self, game, item, correct, distance):
+        keys = (game << 32) | item
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        pair_ids = np.empty(len(unique_keys), dtype=np.int64)
+        for index, key in enumerate(unique_keys.tolist()):
+            pair_id = self._pairs.get(key)
+            if pair_id is None:
+                pair_id = self._pairs[key] = len(self._pair_keys)
+                self._pair_keys.append(key)
+            pair_ids[index] = pair_id
+        rows = pair_ids[inverse]
+        size = len(self._pair_keys)
+        # Wrong answers the grader would call a near miss
+        near = (correct == 0) & (distance > 0) & (distance <= FUZZY_MAX_EDITS)
+        self.item_attempts = _grow(self.item_attempts, size) + np.bincount(rows, minlength=size)
+        self.item_errors = _grow(self.item_errors, size) + np.bincount(rows, weights=1 - correct, minlength=size).astype(np.int64)
+        self.item_near_misses = _grow(self.item_near_misses, size) + np.bincount(rows, weights=near, minlength=size).astype(np.int64)
+
+    def _add_latency(self, game, latency):
+        clipped = np.minimum(latency, self.edges[-1] - 1)
+        for game_id in np.unique(game).tolist():
+            counts, _ = np.histogram(clipped[game == game_id], bins=self.edges)
+            totals = self.histograms.get(game_id)
+            self.histograms[game_id] = counts if totals is None else totals + counts
+
+    def _add_days(self, player, game, timestamps, correct, latency):
+        day = (timestamps + self._utc_offset_ms) // DAY_MS
+        keys = (player << 48) | (game << 32) | day
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        attempts = np.bincount(inverse, minlength=len(unique_keys))
+        right = np.bincount(inverse, weights=correct, minlength=len(unique_keys))
+        latency_sum = np.bincount(inverse, weights=latency, minlength=len(unique_keys))
+        for index, key in enumerate(unique_keys.tolist()):
+            group = (key >> 48, (key >> 32) & 0xFFFF, key & 0xFFFFFFFF)
+            values = np.array([attempts[index], right[index], latency_sum[index]], dtype=np.float64)
+            totals = self.days.get(group)
+            self.days[group] = values if totals is None else totals + values
+
+    def add_file(self, path: Path):
+        for names, columns in read_chunks(path):
+            self.add_chunk(names, columns)
+
+    # Results
+
+    def item_error_rates(self, min_attempts: int = 3, top: int = 20) -> List[Dict]:
+        """Items with the highest error rate among those tried at least min_attempts times."""
+        attempts = self.item_attempts
+        eligible = np.flatnonzero(attempts >= min_attempts)
+        rates = self.item_errors[eligible] / attempts[eligible]
+        order = eligible[np.lexsort((-attempts[eligible], -rates))][:top]
+        results = []
+        for pair_id in order.tolist():
+            key = self._pair_keys[pair_id]
+            results.append({
+                'game': self.names.names[key >> 32],
+                'item': self.names.names[key & 0xFFFFFFFF],
+                'attempts': int(attempts[pair_id]),
+                'error_rate': round(float(self.item_errors[pair_id] / attempts[pair_id]), 3),
+                'near_misses': int(self.item_near_misses[pair_id])
+            })
+        return results
+
+    def latency_histograms(self) -> Dict[str, Dict]:
+        results = {}
+        for game_id, counts in self.histograms.items():
+            total = int(counts.sum())
+            cumulative = np.cumsum(counts)
+            # Bucket upper edges at the median and 90th percentile
+            p50 = int(self.edges[1 + np.searchsorted(cumulative, total * 0.5)])
+            p90 = int(self.edges[1 + np.searchsorted(cumulative, total * 0.9)])
+            results[self.names.names[game_id]] = {
+                'answers': total,
+                'bucket_ms': int(self.edges[1] - self.edges[0]),
+                'counts': counts.tolist(),
+                'p50_ms_at_most': p50,
+                'p90_ms_at_most': p90
+            }
+        return results
+
+    def progress_curves(self) -> Dict[str, List[Dict]]:
+        curves: Dict[str, List[Dict]] = {}
+        epoch = date(1970, 1, 1)
+        for (player_id, game_id, day), (attempts, right, latency_sum) in sorted(self.days.items()):
+            key = f"{self.names.names[player_id]}/{self.names.names[game_id]}"
+            curves.setdefault(key, []).append({
+                'day': str(epoch + timedelta(days=int(day))),
+                'attempts': int(attempts),
+                'accuracy': round(right / attempts, 3),
+                'mean_latency_ms': int(latency_sum / attempts)
+            })
+        return curves
+
+    def summary(self, min_attempts: int = 3, top: int = 20) -> Dict:
+        return {
+            'answers': self.rows,
+            'chunks': self.chunks,
+            'hardest_items': self.item_error_rates(min_attempts, top),
+            'latency': self.latency_histograms(),
+            'progress': self.progress_curves()
+        }
+
+
+def _day_ms(text: str) -> int:
+    return int(time.mktime(date.fromisoformat(text).timetuple()) * 1000)
+
+
+def log_files(log_dir: Path, since: Optional[str] = None, until: Optional[str] = None) -> List[Path]:
+    """Monthly log files that can hold answers in [since, until]."""
+    files = []
+    for path in sorted(Path(log_dir).glob("answers-*.evl")):
+        month = path.stem.split("-", 1)[1]
+        if since is not None and month < since[:7]:
+            continue
+        if until is not None and month > until[:7]:
+            continue
+        files.append(path)
+    return files
+
+
+def print_summary(summary: Dict):
+    print(f"{summary['answers']} answers in {summary['chunks']} chunks")
+
+    print("\nHardest items")
+    for row in summary['hardest_items']:
+        print(f"  {row['error_rate']:6.1%}  {row['attempts']:6}  {row['near_misses']:5} close  "
+              f"{row['game']}: {row['item']}")
+
+    for game, histogram in summary['latency'].items():
+        print(f"\nLatency, {game}: {histogram['answers']} answers, "
+              f"median <= {histogram['p50_ms_at_most']} ms, p90 <= {histogram['p90_ms_at_most']} ms")
+        counts = histogram['counts']
+        peak = max(counts) or 1
+        width = histogram['bucket_ms']
+        last = max((i for i, count in enumerate(counts) if count), default=0)
+        for i, count in enumerate(counts[:last + 1]):
+            print(f"  {i * width:6}-{(i + 1) * width:<6} {count:7}  {'#' * round(40 * count / peak)}")
+
+    for key, days in summary['progress'].items():
+        print(f"\nProgress, {key}")
+        for row in days:
+            print(f"  {row['day']}  {row['attempts']:5} answers  {row['accuracy']:6.1%}  {row['mean_latency_ms']:6} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize per-answer analytics logs")
+    parser.add_argument("--dir", default=str(ANSWER_LOG_DIR))
+    parser.add_argument("--since", help="First day, YYYY-MM-DD")
+    parser.add_argument("--until", help="Last day, YYYY-MM-DD")
+    parser.add_argument("--player")
+    parser.add_argument("--game")
+    parser.add_argument("--min-attempts", type=int, default=3)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    report = AnswerReport(
+        since_ms=_day_ms(args.since) if args.since else None,
+        until_ms=_day_ms(args.until) + 86_400_000 if args.until else None,
+        player=args.player,
+        game=args.game
+    )
+    start = time.perf_counter()
+    files = log_files(args.dir, args.since, args.until)
+    for path in files:
+        report.add_file(path)
+    summary = report.summary(args.min_attempts, args.top)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary)
+        print(f"\nRead {len(files)} files in {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# utils/asset_manager.py
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+
+import pygame
+
+from config import (
+    ASSET_DIR, ASSET_MANIFEST, ASSET_WORKERS, ASSET_CONVERT_BUDGET_MS, ASSET_LOADED_EVENT
+)
+from utils.font_registry import font_registry
+
+
+def _load_image(path):
+    return pygame.image.load(str(path))
+
+
+def _load_sound(path):
+    if not pygame.mixer.get_init():
+        raise RuntimeError("audio mixer is not available")
+    return pygame.mixer.Sound(str(path))
+
+
+def _load_font(spec):
+    return font_registry.get(
+        ASSET_DIR / spec['path'] if spec.get('path') else None,
+        spec.get('size', 48),
+        spec.get('bold', False),
+        spec.get('italic', False)
+    )
+
+
+class AssetManager:
+    """
+    Loads the asset manifest in the background.
+    Files are read and decoded on a thread pool; images then get their
+    convert() on the main thread in poll(), a few per frame, because pixel
+    format conversion needs the display. Screens ask for assets by key and
+    are called back once an asset is ready, so nothing waits on disk.
+    """
+    def __init__(self, manifest_path=ASSET_MANIFEST, max_workers=ASSET_WORKERS):
+        self.manifest_path = Path(manifest_path)
+        self.max_workers = max_workers
+        self.logger = logging.getLogger("EllieViviGame")
+        self.total = 0
+        self.failed = []
+        self._assets = {}
+        self._futures = {}  # key -> (kind, Future) for assets still in flight
+        self._waiters = {}
+        self._executor = None
+
+    def start(self):
+        """Read the manifest and queue every asset on the worker pool."""
+        if self._executor is not None:
+            return
+        try:
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Error reading asset manifest {self.manifest_path}: {str(e)}")
+            manifest = {}
+
+        loaders = {'images': _load_image, 'sounds': _load_sound, 'fonts': _load_font}
+        self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="assets")
+        for kind, loader in loaders.items():
+            for key, entry in manifest.get(kind, {}).items():
+                source = entry if kind == 'fonts' else ASSET_DIR / entry
+                future = self._executor.submit(loader, source)
+                future.add_done_callback(self._notify)
+                self._futures[key] = (kind, future)
+        self.total = len(self._futures)
+        self.logger.info(f"Loading {self.total} assets on {self.max_workers} threads")
+
+    def _notify(self, future):
+        """Wake the main loop; runs on the worker that finished."""
+        try:
+            pygame.event.post(pygame.event.Event(ASSET_LOADED_EVENT))
+        except pygame.error:
+            pass
+
+    def poll(self, budget_ms=ASSET_CONVERT_BUDGET_MS):
+        """
+        Finish loaded assets on the main thread and run their callbacks.
+
+        Returns:
+            int: Number of assets finished by this call
+        """
+        deadline = time.perf_counter() + budget_ms / 1000
+        finished = 0
+        for key, (kind, future) in list(self._futures.items()):
+            if not future.done():
+                continue
+            if finished and time.perf_counter() > deadline:
+                # Out of budget; pick the rest up next frame
+                self._notify(future)
+                break
+            del self._futures[key]
+            finished += 1
+            try:
+                asset = future.result()
+                # The texture backend has no display surface; its renderer converts on upload
+                if kind == 'images' and pygame.display.get_surface() is not None:
+                    asset = asset.convert_alpha() if asset.get_alpha() is not None else asset.convert()
+            except Exception as e:
+                self.logger.error(f"Error loading asset '{key}': {str(e)}")
+                self.failed.append(key)
+                asset = None
+            self._assets[key] = asset
+            for callback in self._waiters.pop(key, ()):
+                callback(asset)
+        return finished
+
+    @property
+    def loaded(self):
+        return self.total - len(self._futures)
+
+    def progress(self):
+        """Fraction of manifest assets finished, 1.0 when there are none."""
+        return self.loaded / self.total if self.total else 1.0
+
+    def is_done(self):
+        return not self._futures
+
+    def get(self, key, default=None):
+        """Return a finished asset without waiting, or default."""
+        asset = self._assets.get(key)
+        return default if asset is None else asset
+
+    def request(self, key, callback):
+        """
+        Call callback(asset) once the asset is ready, immediately if it
+        already is. Failed or unknown assets are reported as None.
+        """
+        if key in self._assets or key not in self._futures:
+            callback(self._assets.get(key))
+        else:
+            self._waiters.setdefault(key, []).append(callback)
+
+    def wait(self):
+        """Block until every asset is finished, then finish them all."""
+        wait([future for _, future in self._futures.values()])
+        self.poll(budget_ms=float('inf'))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+asset_manager = AssetManager()
@@ -1,6 +1,9 @@
 # utils/button_manager.py
 import pygame
-from config import COLORS
+from config import COLORS, FONT_SIZES, BUTTON_GRID_CELL_SIZE
+from utils.asset_manager import asset_manager
+from utils.font_registry import get_font
+from utils.text_cache import render_text
 
 class Button:
     """
@@ -15,80 +18,149 @@ class Button:
             rect: Pygame Rect defining button position and size
             text: Button text
             color: Button background color
-            font: Font to use for text (defaults to system font if None)
+            font: Font to use for text (defaults to the shared default font if None)
             border_radius: Radius for rounded corners
             hover_color: Color of border when button is hovered
         """
         self.rect = rect
         self.text = text
         self.color = color
-        self.font = font or pygame.font.Font(None, 48)
+        self.font = font or get_font(None, FONT_SIZES['medium'])
         self.border_radius = border_radius
         self.hover_color = hover_color
         self.is_hovered = False
         self.click_sound = None
-        self.was_pressed = False
+        self.visible = True
+        # Face and hover border are rasterized once and then only blitted,
+        # so a texture canvas uploads each of them a single time
+        self._face = None
+        self._face_key = None
+        self._hover = None
+        self._hover_key = None
 
     def draw(self, screen):
-        pygame.draw.rect(
-            screen, 
-            self.color, 
-            self.rect, 
-            border_radius=self.border_radius
-        )
-        
+        self.draw_face(screen)
         if self.is_hovered:
-            pygame.draw.rect(
-                screen,
-                self.hover_color,
-                self.rect,
-                3,
-                border_radius=self.border_radius
-            )
-        
-        text_surface = self.font.render(self.text, True, COLORS['BLACK'])
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+            self.draw_hover(screen)
 
-    def update(self, mouse_pos):
-        previous_hover = self.is_hovered
-        self.is_hovered = self.rect.collidepoint(mouse_pos)
-        
-        mouse_pressed = pygame.mouse.get_pressed()[0]
-        
-        if self.is_hovered and mouse_pressed and not self.was_pressed:
-            self.was_pressed = True
-            return True
-            
-        if not mouse_pressed:
-            self.was_pressed = False
-            
-        return False
+    def draw_face(self, screen):
+        """Draw the button background and label without hover state."""
+        screen.blit(self.get_face(), self.rect)
+
+    def draw_hover(self, screen):
+        """Draw the hover border on top of the button face."""
+        screen.blit(self.get_hover(), self.rect)
+
+    def get_face(self):
+        """Return the background and label, re-rendered only when they change."""
+        key = (self.rect.size, tuple(self.color), self.text, self.font, self.border_radius)
+        if key != self._face_key:
+            face = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+            pygame.draw.rect(face, self.color, face.get_rect(), border_radius=self.border_radius)
+            text_surface = render_text(self.font, self.text, COLORS['BLACK'])
+            face.blit(text_surface, text_surface.get_rect(center=face.get_rect().center))
+            self._face = face
+            self._face_key = key
+        return self._face
+
+    def get_hover(self):
+        """Return the hover border, re-rendered only when it changes."""
+        key = (self.rect.size, tuple(self.hover_color), self.border_radius)
+        if key != self._hover_key:
+            hover = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+            pygame.draw.rect(hover, self.hover_color, hover.get_rect(), 3, border_radius=self.border_radius)
+            self._hover = hover
+            self._hover_key = key
+        return self._hover
 
 class ButtonGroup:
     """
     Manages a group of related buttons.
     Useful for menu screens or button layouts.
+
+    Hover and click state is driven by mouse events. Buttons are indexed
+    in a uniform grid so each event only tests the buttons in one cell,
+    and only the buttons the pointer entered or left are touched.
     """
-    def __init__(self):
+    def __init__(self, cell_size=BUTTON_GRID_CELL_SIZE):
         self.buttons = []
+        self.cell_size = cell_size
+        self._grid = {}
+        self.hovered = None
+        self.changed = []
+        # Played on click by buttons without a click_sound of their own;
+        # None falls back to the shared "click" asset once it has loaded
+        self.click_sound = None
 
     def add(self, button):
         self.buttons.append(button)
+        self._index(button)
+
+    def _cells(self, rect):
+        size = self.cell_size
+        for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield (cx, cy)
+
+    def _index(self, button):
+        for cell in self._cells(button.rect):
+            self._grid.setdefault(cell, []).append(button)
+
+    def rebuild_index(self):
+        """Re-index after button rects were moved or resized."""
+        self._grid = {}
+        for button in self.buttons:
+            self._index(button)
+
+    def button_at(self, pos):
+        """Return the topmost visible button under pos, or None."""
+        cell = (pos[0] // self.cell_size, pos[1] // self.cell_size)
+        for button in reversed(self._grid.get(cell, ())):
+            if button.visible and button.rect.collidepoint(pos):
+                return button
+        return None
+
+    def set_hovered(self, button):
+        """Move hover state, flagging only the buttons entered and left."""
+        if button is self.hovered:
+            return
+        if self.hovered is not None:
+            self.hovered.is_hovered = False
+            self.changed.append(self.hovered)
+        if button is not None:
+            button.is_hovered = True
+            self.changed.append(button)
+        self.hovered = button
+
+    def refresh_hover(self, mouse_pos):
+        self.set_hovered(self.button_at(mouse_pos))
+
+    def handle_event(self, event):
+        """
+        Update hover state from a mouse event.
+
+        Returns:
+            Button: The button clicked by this event, or None
+        """
+        if event.type == pygame.MOUSEMOTION:
+            self.set_hovered(self.button_at(event.pos))
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            target = self.button_at(event.pos)
+            self.set_hovered(target)
+            if target is not None:
+                sound = target.click_sound or self.click_sound or asset_manager.get("click")
+                if sound is not None:
+                    sound.play()
+            return target
+        return None
 
     def draw(self, screen):
         for button in self.buttons:
             button.draw(screen)
 
-    def update(self, mouse_pos):
-        clicked = []
-        for i, button in enumerate(self.buttons):
-            if button.update(mouse_pos):
-                clicked.append(i)
-        return clicked
-
     def arrange_vertical(self, start_y, spacing):
         current_y = start_y
         for button in self.buttons:
             button.rect.y = current_y
-            current_y += button.rect.height + spacing
\ No newline at end of file
+            current_y += button.rect.height + spacing
+        self.rebuild_index()
@@ -0,0 +1,61 @@
+# utils/font_registry.py
+import threading
+
+import pygame
+
+from config import PRELOAD_FONTS
+
+
+class FontRegistry:
+    """
+    Process-wide store of loaded fonts.
+    Each (path, size, bold, italic) combination is loaded from disk once
+    and shared by every screen and button. Safe to call from the asset
+    loader threads.
+    """
+    def __init__(self):
+        self._fonts = {}
+        self.loads = 0
+        self._lock = threading.Lock()
+
+    def get(self, path=None, size=48, bold=False, italic=False):
+        """
+        Get a font, loading it on first use.
+
+        Args:
+            path: Font file path (None for pygame's default font)
+            size: Point size
+            bold: Apply synthetic bold
+            italic: Apply synthetic italic
+
+        Returns:
+            pygame.font.Font: Shared font instance
+        """
+        key = (str(path) if path else None, size, bold, italic)
+        font = self._fonts.get(key)
+        if font is None:
+            with self._lock:
+                font = self._fonts.get(key)
+                if font is None:
+                    font = pygame.font.Font(path, size)
+                    font.set_bold(bold)
+                    font.set_italic(italic)
+                    self._fonts[key] = font
+                    self.loads += 1
+        return font
+
+    def preload(self, specs=PRELOAD_FONTS):
+        """Load a set of (path, size, bold, italic) font specs up front."""
+        for path, size, bold, italic in specs:
+            self.get(path, size, bold, italic)
+
+    def clear(self):
+        self._fonts.clear()
+
+
+font_registry = FontRegistry()
+
+
+def get_font(path=None, size=48, bold=False, italic=False):
+    """Get a shared font from the process-wide registry."""
+    return font_registry.get(path, size, bold, italic)
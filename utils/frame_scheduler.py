@@ -0,0 +1,144 @@
+# utils/frame_scheduler.py
+import time
+import pygame
+
+from config import FPS, IDLE_AFTER_MS, IDLE_MAX_WAIT_MS, ALLOWED_EVENTS
+
+
+class FrameScheduler:
+    """
+    Decides how long the main loop sleeps between frames.
+    Runs at a fixed frame rate while the screen is changing and blocks on
+    pygame.event.wait once the screen is idle, waking on input or on the
+    screen's next pending timer.
+    """
+    def __init__(self, clock, fps=FPS, idle_after_ms=IDLE_AFTER_MS, max_wait_ms=IDLE_MAX_WAIT_MS):
+        """
+        Initialize the scheduler.
+
+        Args:
+            clock: pygame Clock used while frames are running
+            fps: Frame rate cap while the screen is busy
+            idle_after_ms: Quiet time without input before blocking
+            max_wait_ms: Longest single blocking wait
+        """
+        self.clock = clock
+        self.fps = fps
+        self.idle_after_ms = idle_after_ms
+        self.max_wait_ms = max_wait_ms
+        self.last_input_ticks = pygame.time.get_ticks()
+        self.is_idle = False
+
+        # Statistics
+        self.idle_wall_time = 0.0
+        self.idle_cpu_time = 0.0
+        self.idle_waits = 0
+        self.timer_wakes = 0
+        self.timer_lateness_ms = 0.0
+        self.coalesced_motion = 0
+        self._idle_mark = None
+
+    def install_event_filter(self, allowed_events=ALLOWED_EVENTS):
+        """Block every event type no screen uses so it never wakes the loop."""
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(list(allowed_events))
+
+    def next_events(self, screen, keep_awake=False):
+        """
+        Wait for the next frame and return its events.
+
+        Args:
+            screen: Current screen, asked whether it has pending work
+            keep_awake: Run at the full frame rate even if the screen is idle
+
+        Returns:
+            list: Events for this frame, with mouse-motion bursts coalesced
+        """
+        now = pygame.time.get_ticks()
+        idle = (
+            not keep_awake
+            and now - self.last_input_ticks >= self.idle_after_ms
+            and not screen.has_pending_redraw()
+        )
+        self._account_idle_time(idle)
+
+        if idle:
+            events = self._wait(screen, now)
+        else:
+            self.clock.tick(self.fps)
+            events = pygame.event.get()
+
+        if events:
+            self.last_input_ticks = pygame.time.get_ticks()
+        return self.coalesce_motion(events)
+
+    def _wait(self, screen, now):
+        timeout = self.max_wait_ms
+        wakeup = screen.next_wakeup()
+        if wakeup is not None:
+            if wakeup <= now:
+                # Already due; pygame.event.wait(0) would block with no timeout
+                return pygame.event.get()
+            timeout = max(1, min(timeout, wakeup - now))
+
+        self.idle_waits += 1
+        event = pygame.event.wait(timeout)
+        events = [] if event.type == pygame.NOEVENT else [event]
+        events.extend(pygame.event.get())
+
+        if not events and wakeup is not None and timeout < self.max_wait_ms:
+            self.timer_wakes += 1
+            self.timer_lateness_ms += max(0, pygame.time.get_ticks() - wakeup)
+        return events
+
+    def _account_idle_time(self, idle):
+        """Accumulate wall and CPU time spent in idle mode."""
+        wall, cpu = time.perf_counter(), time.process_time()
+        if self.is_idle and self._idle_mark is not None:
+            self.idle_wall_time += wall - self._idle_mark[0]
+            self.idle_cpu_time += cpu - self._idle_mark[1]
+        self.is_idle = idle
+        self._idle_mark = (wall, cpu)
+
+    def coalesce_motion(self, events):
+        """Merge runs of consecutive MOUSEMOTION events into one event."""
+        if len(events) < 2:
+            return events
+
+        coalesced = []
+        for event in events:
+            previous = coalesced[-1] if coalesced else None
+            if (
+                event.type == pygame.MOUSEMOTION
+                and previous is not None
+                and previous.type == pygame.MOUSEMOTION
+            ):
+                coalesced[-1] = pygame.event.Event(
+                    pygame.MOUSEMOTION,
+                    pos=event.pos,
+                    rel=(previous.rel[0] + event.rel[0], previous.rel[1] + event.rel[1]),
+                    buttons=event.buttons,
+                    touch=getattr(event, 'touch', False)
+                )
+                self.coalesced_motion += 1
+            else:
+                coalesced.append(event)
+        return coalesced
+
+    def get_stats(self):
+        idle_cpu_percent = (
+            100.0 * self.idle_cpu_time / self.idle_wall_time
+            if self.idle_wall_time else 0.0
+        )
+        timer_lateness = (
+            self.timer_lateness_ms / self.timer_wakes
+            if self.timer_wakes else 0.0
+        )
+        return {
+            'idle_seconds': round(self.idle_wall_time, 3),
+            'idle_cpu_percent': round(idle_cpu_percent, 2),
+            'idle_waits': self.idle_waits,
+            'timer_wakes': self.timer_wakes,
+            'avg_timer_lateness_ms': round(timer_lateness, 2),
+            'coalesced_motion_events': self.coalesced_motion
+        }
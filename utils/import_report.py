@@ -0,0 +1,135 @@
+# utils/import_report.py
+"""
+Import-time report for the project's own modules, like `python -X importtime`
+but limited to code under the project directory.
+
+    python -m utils.import_report            # cost of `import main`
+    python -m utils.import_report screens.registry games.spelling.spelling_game_screen
+    python -m utils.import_report --game     # also construct Game() and report lazy loads
+
+Self time excludes nested project imports; cumulative time includes them
+and any third-party modules they pull in.
+"""
+import argparse
+import importlib
+import os
+import sys
+import time
+from importlib.abc import MetaPathFinder
+from pathlib import Path
+
+# Not taken from config: importing config here would hide its own cost
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+class _TimedLoader:
+    """Wraps a module loader to time exec_module."""
+    def __init__(self, loader, timer, name):
+        self._loader = loader
+        self._timer = timer
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._timer.enter(self._name)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer.leave()
+
+
+class ImportTimer(MetaPathFinder):
+    """
+    Meta path finder that times the first import of every module whose
+    file lives under `root`.
+    """
+    def __init__(self, root=PROJECT_DIR):
+        self.root = Path(root).resolve()
+        self.records = []  # (name, self_ms, cumulative_ms, depth), in import order
+        self._stack = []
+
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is None or not spec.has_location or not self._in_project(spec.origin):
+            return None
+        spec.loader = _TimedLoader(spec.loader, self, name)
+        return spec
+
+    def _in_project(self, origin):
+        try:
+            return Path(origin).resolve().is_relative_to(self.root)
+        except (OSError, ValueError):
+            return False
+
+    def enter(self, name):
+        # [name, start, time spent in nested project imports, depth, record slot]
+        self.records.append(None)
+        self._stack.append([name, time.perf_counter(), 0.0, len(self._stack), len(self.records) - 1])
+
+    def leave(self):
+        name, start, nested, depth, slot = self._stack.pop()
+        cumulative = time.perf_counter() - start
+        if self._stack:
+            self._stack[-1][2] += cumulative
+        self.records[slot] = (name, (cumulative - nested) * 1000, cumulative * 1000, depth)
+
+    def report(self, limit=None):
+        """Format the records as a table in import order, nested imports indented."""
+        lines = [f"{'self ms':>9} {'cumul ms':>9}  module"]
+        for name, self_ms, cumulative_ms, depth in self.records[:limit]:
+            lines.append(f"{self_ms:9.2f} {cumulative_ms:9.2f}  {'  ' * depth}{name}")
+        total = sum(record[2] for record in self.records if record[3] == 0)
+        lines.append(f"{'':9} {total:9.2f}  total ({len(self.records)} project modules)")
+        return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Project-scoped import time report")
+    parser.add_argument("modules", nargs="*", default=["main"], help="Modules to import")
+    parser.add_argument("--game", action="store_true",
+                        help="Also construct Game() and list modules loaded lazily by the screen registry")
+    args = parser.parse_args(argv)
+
+    timer = ImportTimer()
+    timer.install()
+    try:
+        for module_name in args.modules:
+            importlib.import_module(module_name)
+    finally:
+        timer.uninstall()
+    print(timer.report())
+
+    if args.game:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        from main import Game
+        start = time.perf_counter()
+        game = Game()
+        print(f"\nGame() constructed in {(time.perf_counter() - start) * 1000:.2f} ms")
+        for module_name, elapsed in game.registry.import_times.items():
+            print(f"{elapsed:9.2f} ms  lazy {module_name}")
+        game.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# utils/input_state.py
+import pygame
+
+
+class InputState:
+    """
+    The clock and mouse polls the game makes outside its event queue.
+
+    Live, every read goes straight to pygame. While a session is recorded
+    or replayed the game loop latches one snapshot per frame, so every read
+    within a frame sees the same values and a replay sees exactly what the
+    recording saw.
+    """
+    def __init__(self):
+        self.latched = False
+        # Recording or replaying: background work that could change game
+        # state (asset loading, index builds) runs synchronously instead
+        self.deterministic = False
+        self.ticks = 0
+        self.pos = (0, 0)
+        self.buttons = (False, False, False)
+
+    def latch(self, ticks=None, pos=None, buttons=None):
+        """
+        Freeze the poll results for this frame.
+
+        Args:
+            ticks: Millisecond tick count, None to read the live clock
+            pos: Mouse position, None to read the live mouse
+            buttons: Mouse button states, None to read the live mouse
+
+        Returns:
+            tuple: (ticks, pos, buttons) as latched
+        """
+        self.ticks = pygame.time.get_ticks() if ticks is None else ticks
+        self.pos = tuple(pygame.mouse.get_pos() if pos is None else pos)
+        self.buttons = tuple(pygame.mouse.get_pressed() if buttons is None else buttons)
+        self.latched = True
+        return self.ticks, self.pos, self.buttons
+
+    def release(self):
+        """Return to live polling."""
+        self.latched = False
+
+    def get_ticks(self):
+        return self.ticks if self.latched else pygame.time.get_ticks()
+
+    def get_mouse_pos(self):
+        return self.pos if self.latched else pygame.mouse.get_pos()
+
+    def get_mouse_pressed(self):
+        return self.buttons if self.latched else pygame.mouse.get_pressed()
+
+
+input_state = InputState()
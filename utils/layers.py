@@ -0,0 +1,55 @@
+# utils/layers.py
+import pygame
+
+
+class Layer:
+    """
+    An offscreen surface that is re-rendered only when its inputs change.
+    The inputs are described by a key function; while the key stays the
+    same, the pre-composited surface is reused every frame.
+    """
+    def __init__(self, size, render_fn, key_fn=None, reference=None):
+        """
+        Initialize a layer.
+
+        Args:
+            size: (width, height) of the offscreen surface
+            render_fn: Callable drawing the layer content onto a surface
+            key_fn: Callable returning a hashable description of the inputs
+            reference: Surface whose pixel format the layer should match
+        """
+        self.size = size
+        self.render_fn = render_fn
+        self.key_fn = key_fn or (lambda: None)
+        self.reference = reference
+        self.surface = None
+        self.key = None
+        self.renders = 0
+
+    def is_stale(self):
+        return self.surface is None or self.key_fn() != self.key
+
+    def invalidate(self):
+        self.surface = None
+
+    def get_surface(self):
+        """Return the layer surface, re-rendering it if its inputs changed."""
+        key = self.key_fn()
+        if self.surface is None or key != self.key:
+            if self.surface is None:
+                if self.reference is not None:
+                    self.surface = pygame.Surface(self.size, 0, self.reference)
+                else:
+                    self.surface = pygame.Surface(self.size)
+            self.render_fn(self.surface)
+            self.key = key
+            self.renders += 1
+        return self.surface
+
+    def blit(self, target, dest=(0, 0)):
+        """Draw the layer onto a canvas, telling it when the pixels changed."""
+        renders = self.renders
+        surface = self.get_surface()
+        if self.renders != renders:
+            target.invalidate(surface)
+        target.blit(surface, dest)
@@ -1,22 +1,172 @@
 # utils/logger.py
+import atexit
 import logging
+import queue
 import sys
+import threading
+import time
+from logging.handlers import QueueHandler, RotatingFileHandler
 from pathlib import Path
 
+from config import (
+    LOG_BACKUP_COUNT, LOG_BATCH_SIZE, LOG_FRAME_INTERVAL, LOG_MAX_BYTES
+)
+
+LOGGER_NAME = "EllieViviGame"
+FRAME_LOGGER_NAME = LOGGER_NAME + ".frame"
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener = None
+_setup_lock = threading.Lock()
+
+
+class _DeferredFlushMixin:
+    """Skip the per-record flush; the log writer flushes once per batch."""
+    deferring = False
+
+    def flush(self):
+        if not self.deferring:
+            super().flush()
+
+
+class BatchedFileHandler(_DeferredFlushMixin, RotatingFileHandler):
+    pass
+
+
+class BatchedStreamHandler(_DeferredFlushMixin, logging.StreamHandler):
+    pass
+
+
+class BatchingLogWriter:
+    """
+    Background thread that drains the log queue.
+    Records are handled in batches and each handler is flushed once per
+    batch, so the frame loop only ever pays for a queue put.
+    """
+    _STOP = object()
+
+    def __init__(self, log_queue, handlers, batch_size=LOG_BATCH_SIZE):
+        self.queue = log_queue
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self.queue.put(self._STOP)
+        self._thread.join()
+        self._thread = None
+        for handler in self.handlers:
+            handler.close()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = self._STOP in batch
+            self._write([record for record in batch if record is not self._STOP])
+            if stop:
+                return
+
+    def _write(self, records):
+        for handler in self.handlers:
+            handler.deferring = True
+        try:
+            for record in records:
+                for handler in self.handlers:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+        finally:
+            for handler in self.handlers:
+                handler.deferring = False
+                handler.flush()
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Let through at most one record per call site every `interval` seconds.
+    The next record that passes reports how many were dropped meanwhile.
+    """
+    def __init__(self, interval=LOG_FRAME_INTERVAL):
+        super().__init__()
+        self.interval = interval
+        self._sites = {}
+
+    def filter(self, record):
+        site = (record.pathname, record.lineno)
+        now = time.monotonic()
+        last_time, suppressed = self._sites.get(site, (None, 0))
+        if last_time is not None and now - last_time < self.interval:
+            self._sites[site] = (last_time, suppressed + 1)
+            return False
+
+        self._sites[site] = (now, 0)
+        if suppressed:
+            record.msg = f"{record.msg} (suppressed {suppressed} similar messages)"
+        return True
+
+
 def setup_logger():
-    """Set up logging configuration"""
-    # Create logs directory if it doesn't exist
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
-    
-    # Configure logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_dir / "game.log"),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
-    
-    return logging.getLogger("EllieViviGame")
\ No newline at end of file
+    """Set up logging configuration (safe to call repeatedly)"""
+    global _listener
+    logger = logging.getLogger(LOGGER_NAME)
+
+    with _setup_lock:
+        if _listener is None:
+            # Create logs directory if it doesn't exist
+            log_dir = Path("logs")
+            log_dir.mkdir(exist_ok=True)
+
+            formatter = logging.Formatter(LOG_FORMAT)
+            file_handler = BatchedFileHandler(
+                log_dir / "game.log",
+                maxBytes=LOG_MAX_BYTES,
+                backupCount=LOG_BACKUP_COUNT
+            )
+            stream_handler = BatchedStreamHandler(sys.stdout)
+            for handler in (file_handler, stream_handler):
+                handler.setFormatter(formatter)
+
+            log_queue = queue.SimpleQueue()
+            _listener = BatchingLogWriter(log_queue, [file_handler, stream_handler])
+            _listener.start()
+            atexit.register(shutdown_logging)
+
+            logger.setLevel(logging.INFO)
+            logger.addHandler(QueueHandler(log_queue))
+            logger.propagate = False
+
+            frame_logger = logging.getLogger(FRAME_LOGGER_NAME)
+            frame_logger.addFilter(RateLimitFilter())
+
+    return logger
+
+
+def get_frame_logger():
+    """Logger for messages emitted from update/draw, rate limited per call site."""
+    setup_logger()
+    return logging.getLogger(FRAME_LOGGER_NAME)
+
+
+def shutdown_logging():
+    """Flush and stop the background log writer."""
+    global _listener
+    with _setup_lock:
+        if _listener is None:
+            return
+        logger = logging.getLogger(LOGGER_NAME)
+        for handler in list(logger.handlers):
+            if isinstance(handler, QueueHandler):
+                logger.removeHandler(handler)
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,172 @@
+# utils/profiler.py
+import logging
+import time
+from collections import deque
+
+import pygame
+
+from config import COLORS, FPS, PROFILER_WINDOW, PROFILER_REFRESH_MS
+from utils.font_registry import get_font
+from utils.text_cache import text_cache
+
+PHASES = ('events', 'update', 'draw', 'flip')
+
+
+class _RecordCounter(logging.Handler):
+    """Counts log records while the overlay is visible."""
+    def __init__(self):
+        super().__init__(level=logging.DEBUG)
+        self.count = 0
+
+    def emit(self, record):
+        self.count += 1
+
+
+class FrameProfiler:
+    """
+    Toggleable debug overlay with rolling per-phase frame timings.
+    When disabled every hook returns immediately, so the main loop only
+    pays for a few attribute checks per frame.
+    """
+    def __init__(self, logger_name="EllieViviGame", window=PROFILER_WINDOW):
+        self.enabled = False
+        self.window = window
+        self.logger = logging.getLogger(logger_name)
+        self.font = None
+        self.overlay_rect = pygame.Rect(0, 0, 0, 0)
+        self._record_counter = _RecordCounter()
+        self._reset()
+
+    def _reset(self):
+        self.phase_times = {phase: deque(maxlen=self.window) for phase in PHASES}
+        self.frame_times = deque(maxlen=self.window)
+        self.frame_starts = deque(maxlen=self.window)
+        self.counters = deque(maxlen=self.window)
+        self.last_transition_ms = None
+        self._overlay = None
+        self._overlay_rendered_at = 0.0
+        self._phase_start = None
+        self._frame_start = None
+        self._frame_phases = {}
+        self._snapshot = None
+
+    def toggle(self, screen):
+        """Show or hide the overlay; the screen redraws what it covered."""
+        self.enabled = not self.enabled
+        if self.enabled:
+            self._reset()
+            self.font = get_font(None, 24)
+            self.logger.addHandler(self._record_counter)
+        else:
+            self.logger.removeHandler(self._record_counter)
+            screen.mark_dirty(self.overlay_rect)
+
+    def record_transition(self, milliseconds):
+        self.last_transition_ms = milliseconds
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._frame_start = self._phase_start = now
+        self.frame_starts.append(now)
+        self._frame_phases = {}
+        self._snapshot = (
+            text_cache.misses,
+            text_cache.hits + text_cache.misses,
+            self._record_counter.count
+        )
+
+    def mark(self, phase):
+        """Close the timing of the phase that just finished."""
+        if not self.enabled or self._phase_start is None:
+            return
+        now = time.perf_counter()
+        self._frame_phases[phase] = (now - self._phase_start) * 1000
+        self._phase_start = now
+
+    def end_frame(self, rects):
+        if not self.enabled or self._frame_start is None:
+            return
+        for phase in PHASES:
+            self.phase_times[phase].append(self._frame_phases.get(phase, 0.0))
+        self.frame_times.append((time.perf_counter() - self._frame_start) * 1000)
+
+        renders, lookups, records = self._snapshot
+        pixels = sum(rect.width * rect.height for rect in rects) if rects else 0
+        self.counters.append({
+            'text_renders': text_cache.misses - renders,
+            'text_blits': text_cache.hits + text_cache.misses - lookups,
+            'log_records': self._record_counter.count - records,
+            'update_rects': len(rects) if rects else 0,
+            'pixels': pixels
+        })
+
+    def prepare(self, screen):
+        """Ask the screen to repaint the area under the overlay this frame."""
+        if self.enabled and self.overlay_rect.width:
+            screen.mark_dirty(self.overlay_rect)
+
+    def draw_overlay(self, surface, rects):
+        """
+        Draw the overlay on top of the rendered frame.
+
+        Args:
+            surface: Display surface
+            rects: Rects the screen changed this frame (None for a full flip)
+
+        Returns:
+            list: Rects to push, including the overlay
+        """
+        if not self.enabled:
+            return rects
+        now = time.perf_counter()
+        if self._overlay is None or (now - self._overlay_rendered_at) * 1000 >= PROFILER_REFRESH_MS:
+            self._overlay = self._render_overlay()
+            self._overlay_rendered_at = now
+        self.overlay_rect = self._overlay.get_rect(topright=(surface.get_width() - 10, 10))
+        surface.blit(self._overlay, self.overlay_rect)
+        if rects is None:
+            return None
+        return list(rects) + [self.overlay_rect]
+
+    def _average(self, values):
+        return sum(values) / len(values) if values else 0.0
+
+    def _render_overlay(self):
+        budget = 1000.0 / FPS
+        frame_avg = self._average(self.frame_times)
+        frame_max = max(self.frame_times) if self.frame_times else 0.0
+        elapsed = self.frame_starts[-1] - self.frame_starts[0] if len(self.frame_starts) > 1 else 0.0
+        fps = (len(self.frame_starts) - 1) / elapsed if elapsed else 0.0
+        counters = {
+            name: self._average([frame[name] for frame in self.counters])
+            for name in ('text_renders', 'text_blits', 'log_records', 'update_rects', 'pixels')
+        }
+
+        lines = [
+            (f"FPS {fps:5.1f} / {FPS}", COLORS['WHITE']),
+            (f"frame {frame_avg:5.2f} ms  max {frame_max:5.2f} ms",
+             COLORS['PINK'] if frame_max > budget else COLORS['MINT_GREEN']),
+        ]
+        for phase in PHASES:
+            average = self._average(self.phase_times[phase])
+            color = COLORS['PINK'] if average > budget / 2 else COLORS['WHITE']
+            lines.append((f"{phase:7s} {average:6.2f} ms", color))
+        lines.extend([
+            (f"text renders {counters['text_renders']:.1f}  blits {counters['text_blits']:.1f}", COLORS['WHITE']),
+            (f"log records {counters['log_records']:.1f}", COLORS['WHITE']),
+            (f"update rects {counters['update_rects']:.1f}  px {counters['pixels']:.0f}", COLORS['WHITE']),
+        ])
+        if self.last_transition_ms is not None:
+            lines.append((f"last transition {self.last_transition_ms:.1f} ms", COLORS['WHITE']))
+
+        # Rendered directly so overlay numbers do not churn the shared text cache
+        line_height = self.font.get_linesize()
+        surfaces = [self.font.render(text, True, color) for text, color in lines]
+        width = max(text.get_width() for text in surfaces) + 20
+        overlay = pygame.Surface((width, line_height * len(surfaces) + 16))
+        overlay.fill(COLORS['BLACK'])
+        for i, text in enumerate(surfaces):
+            overlay.blit(text, (10, 8 + i * line_height))
+        return overlay
@@ -0,0 +1,260 @@
+# utils/render_backend.py
+import weakref
+from collections import OrderedDict
+
+import pygame
+
+from config import TEXTURE_ACCELERATED, TEXTURE_SHAPE_CACHE_ENTRIES
+
+RENDER_BACKENDS = ('surface', 'texture')
+
+
+class SurfaceCanvas:
+    """
+    Draw target backed by the display surface.
+    Every call is a software blit or pygame.draw call, and only the rects
+    a frame changed need to be pushed to the window.
+    """
+    partial_updates = True
+
+    def __init__(self, surface):
+        """
+        Initialize the canvas.
+
+        Args:
+            surface: Display surface returned by pygame.display.set_mode
+        """
+        self.surface = surface
+        # Offscreen surfaces made to match this one blit fastest
+        self.reference = surface
+
+    def blit(self, source, dest, area=None):
+        return self.surface.blit(source, dest, area)
+
+    def fill(self, color, rect=None):
+        return self.surface.fill(color, rect)
+
+    def draw_rect(self, color, rect, width=0, border_radius=0):
+        return pygame.draw.rect(self.surface, color, rect, width, border_radius=border_radius)
+
+    def draw_line(self, color, start, end, width=1):
+        return pygame.draw.line(self.surface, color, start, end, width)
+
+    def get_clip(self):
+        return self.surface.get_clip()
+
+    def set_clip(self, rect):
+        self.surface.set_clip(rect)
+
+    def get_rect(self, **kwargs):
+        return self.surface.get_rect(**kwargs)
+
+    def get_size(self):
+        return self.surface.get_size()
+
+    def get_width(self):
+        return self.surface.get_width()
+
+    def get_height(self):
+        return self.surface.get_height()
+
+    def invalidate(self, surface):
+        """Pixels of a surface changed in place; blits always read them fresh."""
+        pass
+
+    def present(self, rects):
+        """Push rendered pixels to the window (rects None = everything)."""
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+
+    def get_stats(self):
+        return {'backend': 'surface'}
+
+    def close(self):
+        pass
+
+
+class TextureCanvas:
+    """
+    Draw target backed by an SDL renderer (pygame._sdl2.video).
+    Surfaces handed to blit() are uploaded as textures the first time
+    they are seen and reused for as long as the surface lives, so cached
+    text, button faces and static layers cost one upload and then a draw
+    call per frame. Rounded rects, which the renderer cannot draw, are
+    rasterized once per shape and drawn the same way.
+
+    The renderer's back buffer does not survive present(), so a frame
+    that changes anything is drawn in full. Clipping is done here, on
+    the source and destination rects of each draw call.
+    """
+    partial_updates = False
+
+    def __init__(self, size, title="", accelerated=TEXTURE_ACCELERATED,
+                 max_shapes=TEXTURE_SHAPE_CACHE_ENTRIES):
+        """
+        Open a window and its renderer.
+
+        Args:
+            size: (width, height) of the window
+            title: Window title
+            accelerated: 0 for SDL's software renderer, 1 for a GPU
+                renderer, -1 to let SDL prefer a GPU renderer
+            max_shapes: Rasterized rounded rects kept for reuse
+        """
+        from pygame._sdl2.video import Renderer, Texture, Window
+
+        self._texture_class = Texture
+        self.window = Window(title, size=size)
+        self.renderer = Renderer(self.window, accelerated=accelerated)
+        self.rect = pygame.Rect((0, 0), size)
+        self.reference = pygame.Surface((1, 1), 0, 32)
+        self.max_shapes = max_shapes
+        # Textures die with their surface, e.g. when the text cache evicts it
+        self._textures = weakref.WeakKeyDictionary()
+        self._shapes = OrderedDict()
+        self._clip = self.rect.copy()
+        self.uploads = 0
+        self.draw_calls = 0
+
+    def texture_for(self, surface):
+        """Return the texture of a surface, uploading it on first use."""
+        texture = self._textures.get(surface)
+        if texture is None:
+            texture = self._texture_class.from_surface(self.renderer, surface)
+            self._textures[surface] = texture
+            self.uploads += 1
+        return texture
+
+    def invalidate(self, surface):
+        """Pixels of a surface changed in place; upload it again on next use."""
+        self._textures.pop(surface, None)
+
+    def blit(self, source, dest, area=None):
+        area = source.get_rect() if area is None else pygame.Rect(area).clip(source.get_rect())
+        target = pygame.Rect((dest[0], dest[1]), area.size)
+        visible = target.clip(self._clip)
+        if not visible.width or not visible.height:
+            return pygame.Rect(target.topleft, (0, 0))
+        src = visible.move(area.x - target.x, area.y - target.y)
+        self.texture_for(source).draw(src, visible)
+        self.draw_calls += 1
+        return visible
+
+    def fill(self, color, rect=None):
+        rect = self._clip if rect is None else pygame.Rect(rect).clip(self._clip)
+        if rect.width and rect.height:
+            self.renderer.draw_color = pygame.Color(color)
+            self.renderer.fill_rect(rect)
+            self.draw_calls += 1
+        return rect
+
+    def draw_rect(self, color, rect, width=0, border_radius=0):
+        rect = pygame.Rect(rect)
+        if border_radius > 0:
+            return self.blit(self._shape(rect.size, color, width, border_radius), rect)
+        if width <= 0:
+            return self.fill(color, rect)
+        # Outline as four filled edges, so any width matches pygame.draw.rect
+        width = min(width, rect.width // 2 or 1, rect.height // 2 or 1)
+        for edge in (
+            (rect.left, rect.top, rect.width, width),
+            (rect.left, rect.bottom - width, rect.width, width),
+            (rect.left, rect.top + width, width, rect.height - 2 * width),
+            (rect.right - width, rect.top + width, width, rect.height - 2 * width),
+        ):
+            self.fill(color, edge)
+        return rect.clip(self._clip)
+
+    def draw_line(self, color, start, end, width=1):
+        (x1, y1), (x2, y2) = start, end
+        if width > 1 and (x1 == x2 or y1 == y2):
+            # Thick axis-aligned lines, laid out the way pygame.draw.line does
+            offset = (width - 1) // 2
+            if x1 == x2:
+                rect = pygame.Rect(x1 - offset, min(y1, y2), width, abs(y2 - y1) + 1)
+            else:
+                rect = pygame.Rect(min(x1, x2), y1 - offset, abs(x2 - x1) + 1, width)
+            return self.fill(color, rect)
+        clipped = self._clip.clipline(start, end)
+        if clipped:
+            self.renderer.draw_color = pygame.Color(color)
+            self.renderer.draw_line(*clipped)
+            self.draw_calls += 1
+        return pygame.Rect(min(x1, x2), min(y1, y2), abs(x2 - x1) + 1, abs(y2 - y1) + 1)
+
+    def _shape(self, size, color, width, border_radius):
+        """Return a surface holding one rounded rect, rasterized once per look."""
+        key = (size, tuple(color), width, border_radius)
+        shape = self._shapes.get(key)
+        if shape is not None:
+            self._shapes.move_to_end(key)
+            return shape
+        shape = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.rect(shape, color, shape.get_rect(), width, border_radius=border_radius)
+        self._shapes[key] = shape
+        if len(self._shapes) > self.max_shapes:
+            self._shapes.popitem(last=False)
+        return shape
+
+    def get_clip(self):
+        return self._clip.copy()
+
+    def set_clip(self, rect):
+        self._clip = self.rect.copy() if rect is None else pygame.Rect(rect).clip(self.rect)
+
+    def get_rect(self, **kwargs):
+        rect = self.rect.copy()
+        for name, value in kwargs.items():
+            setattr(rect, name, value)
+        return rect
+
+    def get_size(self):
+        return self.rect.size
+
+    def get_width(self):
+        return self.rect.width
+
+    def get_height(self):
+        return self.rect.height
+
+    def present(self, rects):
+        """Show the frame unless nothing was drawn (rects == [])."""
+        if rects is None or rects:
+            self.renderer.present()
+
+    def get_stats(self):
+        return {
+            'backend': 'texture',
+            'uploads': self.uploads,
+            'textures': len(self._textures),
+            'shapes': len(self._shapes),
+            'draw_calls': self.draw_calls
+        }
+
+    def close(self):
+        self._textures.clear()
+        self._shapes.clear()
+        self.window.destroy()
+
+
+def create_canvas(backend, size, title=""):
+    """
+    Open the game window with the chosen render backend.
+
+    Args:
+        backend: "surface" or "texture"
+        size: (width, height) of the window
+        title: Window title
+
+    Returns:
+        SurfaceCanvas or TextureCanvas
+    """
+    if backend == 'surface':
+        surface = pygame.display.set_mode(size)
+        pygame.display.set_caption(title)
+        return SurfaceCanvas(surface)
+    if backend == 'texture':
+        return TextureCanvas(size, title)
+    raise ValueError(f"Unknown render backend: {backend!r} (expected one of {RENDER_BACKENDS})")
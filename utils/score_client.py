@@ -0,0 +1,527 @@
+# utils/score_client.py
+"""
+Kiosk side of the score service (see utils.score_server).
+
+add_points never waits on the network. Points are coalesced per player,
+game and day and sent as one numbered batch every
+SCORE_CLIENT_FLUSH_INTERVAL over a small pool of persistent connections.
+A batch the server does not acknowledge is appended to this kiosk's
+outbox file and resent in order once the server answers again, so points
+survive a server outage and a kiosk restart; the server drops batches it
+has already applied. Batch numbers continue from the last one this kiosk
+used (kept next to the outbox) or the server accepted, whichever is
+higher, so they keep rising even if the kiosk clock is set back.
+
+Stats are cached for SCORE_CLIENT_CACHE_TTL and refreshed in the
+background; reads never wait on the server. Points the server has not
+counted yet are added on top, so a child always sees their latest score,
+even offline.
+"""
+import asyncio
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import suppress
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from config import (
+    SCORE_SERVER_ADDRESS, SCORE_CLIENT_ID, SCORE_CLIENT_POOL_SIZE, SCORE_CLIENT_TIMEOUT,
+    SCORE_CLIENT_FLUSH_INTERVAL, SCORE_CLIENT_CACHE_TTL, SCORE_CLIENT_RETRY_INTERVAL, SCORE_OUTBOX_DIR
+)
+from utils.score_manager import atomic_write_json, empty_scores
+from utils.score_server import MAX_MESSAGE, encode_message, parse_address
+
+# Errors meaning the server could not be reached or did not answer in time
+UNREACHABLE = (OSError, asyncio.TimeoutError, EOFError)
+
+
+def _offline_stats() -> Dict[str, Any]:
+    scores = empty_scores()
+    return {
+        'today_score': 0,
+        'lifetime_score': scores['lifetime_score'],
+        'best_day_score': scores['best_day_score'],
+        'best_day_date': scores['best_day_date']
+    }
+
+
+def _add_to_stats(stats: Dict[str, Any], player: str, game_type: str, day: str, adds: Dict[Tuple[str, str, str], int]):
+    """Fold a batch's points for one player's game into stats for `day`."""
+    for (add_player, add_game, add_day), points in adds.items():
+        if add_player != player or add_game != game_type:
+            continue
+        stats['lifetime_score'] += points
+        if add_day == day:
+            stats['today_score'] += points
+    if stats['today_score'] > stats['best_day_score']:
+        stats['best_day_score'] = stats['today_score']
+        stats['best_day_date'] = day
+
+
+def read_outbox(outbox_file: Path) -> Iterator[Tuple[int, Dict[Tuple[str, str, str], int]]]:
+    """Yield (seq, adds) outbox entries, oldest first; a torn final line is ignored."""
+    if not outbox_file.exists():
+        return
+    entries = []
+    with open(outbox_file, 'r') as f:
+        for line in f:
+            try:
+                seq, adds = json.loads(line)
+            except ValueError:
+                break
+            entries.append((seq, {(player, game_type, day): points for player, game_type, day, points in adds}))
+    yield from sorted(entries)
+
+
+def read_seq(seq_file: Path) -> int:
+    """Last batch seq a kiosk numbered, or 0 if it never kept one."""
+    try:
+        with open(seq_file, 'r') as f:
+            return int(json.load(f))
+    except (OSError, ValueError, TypeError):
+        return 0
+
+
+class AsyncScoreClient:
+    """Pooled, persistent connections to a score server, used from one event loop."""
+    def __init__(self, address: str = SCORE_SERVER_ADDRESS, pool_size: int = SCORE_CLIENT_POOL_SIZE,
+                 timeout: float = SCORE_CLIENT_TIMEOUT):
+        """
+        Args:
+            address: "host:port" or a Unix socket path
+            pool_size: Most connections open, and requests in flight, at once
+            timeout: Seconds to wait for a connection or a response
+        """
+        self.address = address
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.connects = 0
+        self._idle = []
+        # Created on first use, on the loop that uses it
+        self._slots = None
+
+    async def _connect(self):
+        target = parse_address(self.address)
+        if isinstance(target, str):
+            opening = asyncio.open_unix_connection(target, limit=MAX_MESSAGE)
+        else:
+            opening = asyncio.open_connection(*target, limit=MAX_MESSAGE)
+        connection = await asyncio.wait_for(opening, self.timeout)
+        self.connects += 1
+        return connection
+
+    @staticmethod
+    async def _exchange(reader, writer, data):
+        writer.write(data)
+        await writer.drain()
+        line = await reader.readline()
+        if not line:
+            raise EOFError("Score server closed the connection")
+        return line
+
+    async def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send one request and wait for its response.
+
+        Raises:
+            OSError, asyncio.TimeoutError, EOFError: The server is unreachable
+            ValueError: The server refused the request
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool_size)
+        data = encode_message(message)
+        async with self._slots:
+            for attempt in range(2):
+                reused = bool(self._idle)
+                reader, writer = self._idle.pop() if reused else await self._connect()
+                try:
+                    line = await asyncio.wait_for(self._exchange(reader, writer, data), self.timeout)
+                except (ConnectionError, EOFError):
+                    writer.close()
+                    # A pooled connection may have gone stale while idle,
+                    # e.g. across a server restart; retry once on a new one
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+                self._idle.append((reader, writer))
+                break
+        response = json.loads(line)
+        if not response.get('ok'):
+            raise ValueError(response.get('error', "Score server refused the request"))
+        return response
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+
+
+class ScoreClient:
+    """
+    One kiosk's connection to the score server, shared by all its score managers.
+
+    The synchronous methods are safe to call from the game thread; the
+    network runs on the client's own event loop thread (start), or on
+    the caller's loop (attach).
+    """
+    def __init__(self, address: str = SCORE_SERVER_ADDRESS, client_id: str = SCORE_CLIENT_ID,
+                 outbox_dir: Path = SCORE_OUTBOX_DIR, pool_size: int = SCORE_CLIENT_POOL_SIZE,
+                 timeout: float = SCORE_CLIENT_TIMEOUT, flush_interval: float = SCORE_CLIENT_FLUSH_INTERVAL,
+                 cache_ttl: float = SCORE_CLIENT_CACHE_TTL, retry_interval: float = SCORE_CLIENT_RETRY_INTERVAL):
+        """
+        Args:
+            address: "host:port" or a Unix socket path
+            client_id: Unique per kiosk; names the outbox and lets the server drop resent batches
+            outbox_dir: Directory of the outbox file
+            pool_size: Connections kept open to the server
+            timeout: Seconds to wait for the server
+            flush_interval: Seconds points are coalesced before being sent
+            cache_ttl: Seconds before cached stats are refreshed
+            retry_interval: Seconds between resends while the server is down
+        """
+        self.connection = AsyncScoreClient(address, pool_size, timeout)
+        self.client_id = client_id
+        self.outbox_file = Path(outbox_dir) / f"{client_id}.journal"
+        self.seq_file = Path(outbox_dir) / f"{client_id}.seq"
+        self.timeout = timeout
+        self.flush_interval = flush_interval
+        self.cache_ttl = cache_ttl
+        self.retry_interval = retry_interval
+        self.logger = logging.getLogger("EllieViviGame")
+        self.online = None
+        self.counters = {'batches_sent': 0, 'duplicates': 0, 'outboxed': 0, 'refused': 0}
+
+        self._lock = threading.Lock()
+        # Coalesced points not yet given a seq
+        self._pending: Dict[Tuple[str, str, str], int] = {}
+        # seq -> points, numbered but not acknowledged by the server
+        self._unacked: Dict[int, Dict[Tuple[str, str, str], int]] = {}
+        # (player, game_type, day) -> (fetched at, server's seq for us, stats)
+        self._cache: Dict[Tuple[str, str, str], Tuple[float, int, Dict[str, Any]]] = {}
+        self._refreshing = set()
+        self._last_seq = read_seq(self.seq_file)
+        # Whether the server's last accepted seq for us has been read
+        self._seq_synced = False
+
+        # Outbox seqs, oldest first; only touched on the event loop
+        self._outbox = []
+        self._retry_at = 0.0
+        for seq, adds in read_outbox(self.outbox_file):
+            self._unacked[seq] = adds
+            self._outbox.append(seq)
+            self._last_seq = max(self._last_seq, seq)
+
+        self._loop = None
+        self._thread = None
+        self._wake = None
+        self._flush_lock = None
+        self._flush_task = None
+        self._closed = False
+
+    # Event loop
+
+    async def attach(self):
+        """Run the client on the current event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        if self._outbox:
+            self._wake.set()
+        return self
+
+    def start(self):
+        """Run the client on its own event loop thread."""
+        if self._thread is None:
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.run_until_complete(self.attach())
+                ready.set()
+                loop.run_forever()
+
+            self._thread = threading.Thread(target=run, name="score-client", daemon=True)
+            self._thread.start()
+            ready.wait()
+            atexit.register(self.close)
+        return self
+
+    def _call(self, coroutine, timeout):
+        """Run a coroutine on the client's loop from another thread."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(timeout)
+
+    # Writes
+
+    def add_points(self, player: str, game_type: str, day: str, points: int):
+        """Queue points for the next batch; never blocks on the network."""
+        with self._lock:
+            key = (player, game_type, day)
+            first = not self._pending
+            self._pending[key] = self._pending.get(key, 0) + points
+        if first and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.retry_interval if self._outbox else None)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            # Let more points collect into this batch
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush_async()
+            except Exception as e:
+                self.logger.error(f"Error sending scores: {str(e)}")
+
+    async def flush_async(self):
+        """Send coalesced points, behind anything still waiting in the outbox."""
+        async with self._flush_lock:
+            if self._pending and not self._seq_synced and time.monotonic() >= self._retry_at:
+                await self._sync_seq()
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                if pending:
+                    # A kiosk with no history anywhere starts from the clock,
+                    # past anything an earlier install under its id sent
+                    seq = self._last_seq = self._last_seq + 1 if self._last_seq else time.time_ns() // 1000
+                    self._unacked[seq] = pending
+            if pending:
+                self._save_seq(seq)
+                # Batches must reach the server in seq order, so nothing
+                # jumps ahead of the outbox
+                if self._outbox or not await self._send(seq, pending):
+                    self._append_outbox(seq, pending)
+            await self._drain_outbox()
+
+    async def _sync_seq(self):
+        """Continue numbering after the last batch the server accepted from us."""
+        try:
+            response = await self.connection.request({'op': 'info', 'client': self.client_id})
+        except UNREACHABLE + (ValueError,) as e:
+            self.logger.debug(f"Could not read the server's batch seq: {type(e).__name__} {e}")
+            self._retry_at = time.monotonic() + self.retry_interval
+            return
+        self._seq_synced = True
+        with self._lock:
+            self._last_seq = max(self._last_seq, int(response.get('client_seq', 0)))
+
+    def _save_seq(self, seq: int):
+        self.seq_file.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_json(self.seq_file, seq)
+
+    def flush(self, timeout: Optional[float] = None):
+        """Send coalesced points now, from another thread."""
+        if self._loop is not None:
+            self._call(self.flush_async(), timeout)
+
+    async def _send(self, seq: int, adds: Dict[Tuple[str, str, str], int]) -> bool:
+        """Send one batch; False if it must be kept for a resend."""
+        try:
+            response = await self.connection.request({
+                'op': 'add',
+                'client': self.client_id,
+                'seq': seq,
+                'adds': [[player, game_type, day, points] for (player, game_type, day), points in adds.items()]
+            })
+        except ValueError as e:
+            # Refused outright; sending it again cannot help
+            self.logger.error(f"Score server refused batch {seq}: {str(e)}")
+            self.counters['refused'] += 1
+            with self._lock:
+                self._unacked.pop(seq, None)
+            return True
+        except UNREACHABLE as e:
+            if self.online is not False:
+                self.logger.warning(f"Score server unreachable, keeping points locally: {type(e).__name__} {e}")
+            self.online = False
+            self._retry_at = time.monotonic() + self.retry_interval
+            return False
+
+        if self.online is False:
+            self.logger.info("Score server reachable again")
+        self.online = True
+        self.counters['batches_sent'] += 1
+        if response.get('duplicate'):
+            self.counters['duplicates'] += 1
+        self._acknowledge(seq, adds)
+        return True
+
+    def _acknowledge(self, seq, adds):
+        # Batches are acknowledged in seq order, so cached stats from
+        # before this batch now lack exactly this batch
+        with self._lock:
+            self._unacked.pop(seq, None)
+            for key, (fetched_at, client_seq, stats) in self._cache.items():
+                if client_seq < seq:
+                    _add_to_stats(stats, *key, adds)
+                    self._cache[key] = (fetched_at, seq, stats)
+
+    def _append_outbox(self, seq, adds):
+        self.outbox_file.parent.mkdir(parents=True, exist_ok=True)
+        entry = [seq, [[player, game_type, day, points] for (player, game_type, day), points in adds.items()]]
+        with open(self.outbox_file, 'a') as f:
+            f.write(json.dumps(entry, separators=(',', ':')) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._outbox.append(seq)
+        self.counters['outboxed'] += 1
+
+    async def _drain_outbox(self):
+        if not self._outbox or time.monotonic() < self._retry_at:
+            return
+        sent = 0
+        for seq in self._outbox:
+            with self._lock:
+                adds = self._unacked.get(seq, {})
+            if not await self._send(seq, adds):
+                break
+            sent += 1
+        if not sent:
+            return
+        self._outbox = self._outbox[sent:]
+        if not self._outbox:
+            self.outbox_file.unlink(missing_ok=True)
+            return
+        # A crash before this rewrite only means resending batches the
+        # server will recognise and skip
+        tmp_file = self.outbox_file.with_name(self.outbox_file.name + ".tmp")
+        with self._lock:
+            remaining = [(seq, self._unacked.get(seq, {})) for seq in self._outbox]
+        with open(tmp_file, 'w') as f:
+            for seq, adds in remaining:
+                entry = [seq, [[player, game_type, day, points] for (player, game_type, day), points in adds.items()]]
+                f.write(json.dumps(entry, separators=(',', ':')) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.outbox_file)
+
+    # Reads
+
+    async def fetch_stats(self, player: str, game_type: str, day: str) -> Dict[str, Any]:
+        """Ask the server for a player's stats and cache them."""
+        response = await self.connection.request({
+            'op': 'stats', 'client': self.client_id, 'player': player, 'game_type': game_type, 'day': day
+        })
+        key = (player, game_type, day)
+        with self._lock:
+            cached = self._cache.get(key)
+            # An acknowledgement may have moved the cache past this response
+            if cached is None or cached[1] <= response['client_seq']:
+                self._cache[key] = (time.monotonic(), response['client_seq'], response['stats'])
+            self._last_seq = max(self._last_seq, response['client_seq'])
+        self.online = True
+        return self.local_stats(player, game_type, day)
+
+    async def _refresh(self, key):
+        try:
+            await self.fetch_stats(*key)
+        except UNREACHABLE + (ValueError,) as e:
+            self.logger.debug(f"Could not refresh stats for {key}: {str(e)}")
+            with self._lock:
+                cached = self._cache.get(key)
+                # Keep serving what we have until the next refresh is due
+                self._cache[key] = (time.monotonic(),) + (cached[1:] if cached else (0, _offline_stats()))
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def local_stats(self, player: str, game_type: str, day: str) -> Dict[str, Any]:
+        """Cached stats plus the points the server has not counted yet; no I/O."""
+        with self._lock:
+            cached = self._cache.get((player, game_type, day))
+            client_seq, stats = (cached[1], dict(cached[2])) if cached else (0, _offline_stats())
+            for seq, adds in self._unacked.items():
+                if seq > client_seq:
+                    _add_to_stats(stats, player, game_type, day, adds)
+            _add_to_stats(stats, player, game_type, day, self._pending)
+        return stats
+
+    def get_stats(self, player: str, game_type: str, day: str) -> Dict[str, Any]:
+        """
+        Stats for a player's game; never waits on the network. Reads come
+        from the cache, refreshed in the background once stale. Until the
+        first fetch lands, only this kiosk's uncounted points are known.
+        """
+        key = (player, game_type, day)
+        with self._lock:
+            cached = self._cache.get(key)
+            stale = cached is None or time.monotonic() - cached[0] > self.cache_ttl
+            refresh = stale and key not in self._refreshing and self._loop is not None
+            if refresh:
+                self._refreshing.add(key)
+        if refresh:
+            asyncio.run_coroutine_threadsafe(self._refresh(key), self._loop)
+        return self.local_stats(player, game_type, day)
+
+    # Shutdown
+
+    async def aclose(self):
+        """Stop the flush loop, send what is left and close the connections."""
+        self._flush_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._flush_task
+        # A batch cancelled mid-send is kept for the next run
+        stranded = sorted(set(self._unacked) - set(self._outbox))
+        for seq in stranded:
+            self._append_outbox(seq, self._unacked[seq])
+        self._outbox.sort()
+        self._retry_at = 0.0
+        await self.flush_async()
+        await self.connection.close()
+
+    def close(self):
+        """Send outstanding points, or keep them in the outbox; call at shutdown."""
+        if self._closed or self._thread is None:
+            return
+        self._closed = True
+        try:
+            self._call(self.aclose(), self.timeout * 2 + 1)
+        except Exception as e:
+            self.logger.error(f"Error closing score client: {str(e)}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(self.timeout)
+
+
+class RemoteScoreManager:
+    """ScoreManager-compatible view of one player's game on the score server."""
+    def __init__(self, player: str, game_type: str, client: Optional[ScoreClient] = None):
+        self.player = player
+        self.game_type = game_type
+        self.client = client or get_score_client()
+
+    def add_points(self, points: int):
+        self.client.add_points(self.player, self.game_type, str(date.today()), points)
+
+    def get_today_score(self) -> int:
+        return self.get_stats()['today_score']
+
+    def get_stats(self) -> Dict[str, Any]:
+        return self.client.get_stats(self.player, self.game_type, str(date.today()))
+
+    def close(self):
+        pass
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_score_client() -> ScoreClient:
+    """Shared client, started on first use and closed at exit."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ScoreClient().start()
+        return _client
@@ -1,15 +1,149 @@
 # utils/score_manager.py
+import atexit
 import json
+import logging
+import os
+import threading
+import weakref
 from datetime import date
 from pathlib import Path
 from typing import Dict, Any
 
+from config import (
+    SAVE_DIR, SCORE_BACKEND, SCORE_PERSISTENCE, SCORE_FLUSH_INTERVAL,
+    SCORE_FLUSH_BATCH, SCORE_COMPACT_EVERY
+)
+
+
+# Callables notified as listener(player, game_type, day, points, scores) after
+# every add, where scores is the manager's in-memory document including it
+score_listeners = []
+
+
+def add_score_listener(listener):
+    if listener not in score_listeners:
+        score_listeners.append(listener)
+
+
+def remove_score_listener(listener):
+    if listener in score_listeners:
+        score_listeners.remove(listener)
+
+
+def notify_score_listeners(player: str, game_type: str, day: str, points: int, scores: Dict[str, Any]):
+    """Tell listeners about an applied add; a failing listener cannot undo it."""
+    for listener in list(score_listeners):
+        try:
+            listener(player, game_type, day, points, scores)
+        except Exception as e:
+            logging.getLogger("EllieViviGame").error(f"Error in score listener: {str(e)}")
+
+
+def atomic_write_json(path: Path, data, **dump_kwargs):
+    """Write JSON to a temp file, fsync it and rename it over the target."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, **dump_kwargs)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_journal(journal_file: Path, after_seq: int = 0):
+    """
+    Yield (seq, day, points) journal entries newer than after_seq.
+    A torn final line from a crash mid-write is ignored.
+    """
+    if not journal_file.exists():
+        return
+    with open(journal_file, 'r') as f:
+        for line in f:
+            try:
+                seq, day, points = json.loads(line)
+            except ValueError:
+                break
+            if seq > after_seq:
+                yield seq, day, points
+
+
+def empty_scores() -> Dict[str, Any]:
+    return {
+        'lifetime_score': 0,
+        'best_day_score': 0,
+        'best_day_date': '',
+        'daily_scores': {}
+    }
+
+
+def apply_points(scores: Dict[str, Any], day: str, points: int):
+    """Add points for a day to a scores document, updating the best day."""
+    # Update the day's score
+    if day not in scores['daily_scores']:
+        scores['daily_scores'][day] = 0
+    scores['daily_scores'][day] += points
+
+    # Update lifetime score
+    scores['lifetime_score'] += points
+
+    # Update best day if necessary
+    day_score = scores['daily_scores'][day]
+    if day_score > scores['best_day_score']:
+        scores['best_day_score'] = day_score
+        scores['best_day_date'] = day
+
+
+def load_saved_scores(save_file: Path) -> Dict[str, Any]:
+    """Read a save file and replay its journal without opening a manager."""
+    save_file = Path(save_file)
+    if save_file.exists():
+        with open(save_file, 'r') as f:
+            scores = json.load(f)
+    else:
+        scores = empty_scores()
+    for _, day, points in read_journal(save_file.with_suffix(".journal"), scores.get('journal_seq', 0)):
+        apply_points(scores, day, points)
+    return scores
+
+
+# Managers with a writer thread, closed by one exit handler without
+# keeping any of them alive
+_open_managers = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_managers():
+    for manager in list(_open_managers):
+        manager.close()
+
+
 class ScoreManager:
-    def __init__(self, player: str, game_type: str):
+    def __init__(self, player: str, game_type: str, persistence: str = SCORE_PERSISTENCE,
+                 save_dir: Path = SAVE_DIR):
+        """
+        Track a player's scores for one game.
+
+        Args:
+            player: Player name
+            game_type: Game identifier
+            persistence: "snapshot" rewrites the save file on every change,
+                "journal" appends deltas and writes them in the background
+            save_dir: Directory holding the save files
+        """
         self.player = player
         self.game_type = game_type
-        self.save_file = Path(f"saves/{player}_{game_type}_scores.json")
-        self.today = str(date.today())
+        self.persistence = persistence
+        self.save_file = Path(save_dir) / f"{player}_{game_type}_scores.json"
+        self.journal_file = self.save_file.with_suffix(".journal")
+
+        # Write-behind journal state
+        self._lock = threading.Lock()
+        self._pending = []
+        self._seq = 0
+        self._journal_entries = 0
+        self._wake = threading.Event()
+        self._stopping = False
+        self._writer = None
+
         self._load_scores()
 
     def _load_scores(self):
@@ -17,37 +151,111 @@ class ScoreManager:
             with open(self.save_file, 'r') as f:
                 self.scores = json.load(f)
         else:
-            self.scores = {
-                'lifetime_score': 0,
-                'best_day_score': 0,
-                'best_day_date': '',
-                'daily_scores': {}
-            }
+            self.scores = empty_scores()
             self._save_scores()
 
+        # Recover deltas written after the last snapshot
+        self._seq = self.scores.get('journal_seq', 0)
+        for seq, day, points in read_journal(self.journal_file, self._seq):
+            self._apply(day, points)
+            self._seq = seq
+            self._journal_entries += 1
+
     def _save_scores(self):
-        with open(self.save_file, 'w') as f:
-            json.dump(self.scores, f, indent=4)
+        self.save_file.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_json(self.save_file, self.scores, indent=4)
+
+    def _apply(self, day: str, points: int):
+        apply_points(self.scores, day, points)
 
     def add_points(self, points: int):
-        # Update today's score
-        if self.today not in self.scores['daily_scores']:
-            self.scores['daily_scores'][self.today] = 0
-        self.scores['daily_scores'][self.today] += points
+        # Read per call: a manager outlives the day it was created on
+        today = str(date.today())
+        if self.persistence != "journal":
+            self._apply(today, points)
+            self._save_scores()
+            self._notify(today, points)
+            return
+
+        with self._lock:
+            self._apply(today, points)
+            self._seq += 1
+            self._pending.append((self._seq, today, points))
+            pending = len(self._pending)
+
+        if self._writer is None:
+            self._start_writer()
+        if pending >= SCORE_FLUSH_BATCH:
+            self._wake.set()
+        self._notify(today, points)
+
+    def _notify(self, day: str, points: int):
+        notify_score_listeners(self.player, self.game_type, day, points, self.scores)
+
+    def _start_writer(self):
+        self._writer = threading.Thread(
+            target=self._writer_loop,
+            name=f"scores-{self.player}-{self.game_type}",
+            daemon=True
+        )
+        self._writer.start()
+        _open_managers.add(self)
 
-        # Update lifetime score
-        self.scores['lifetime_score'] += points
+    def _writer_loop(self):
+        while not self._stopping:
+            self._wake.wait(SCORE_FLUSH_INTERVAL)
+            self._wake.clear()
+            self.flush()
 
-        # Update best day if necessary
-        today_score = self.scores['daily_scores'][self.today]
-        if today_score > self.scores['best_day_score']:
-            self.scores['best_day_score'] = today_score
-            self.scores['best_day_date'] = self.today
+    def flush(self):
+        """Append pending deltas to the journal and compact when it grows."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return
 
-        self._save_scores()
+        self.save_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.journal_file, 'a') as f:
+            f.write("".join(
+                json.dumps(entry, separators=(',', ':')) + "\n" for entry in batch
+            ))
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_entries += len(batch)
+
+        if self._journal_entries >= SCORE_COMPACT_EVERY:
+            self.compact()
+
+    def compact(self):
+        """Fold the journal into the snapshot and start a fresh journal."""
+        with self._lock:
+            # Pending deltas are already applied in memory, so the snapshot
+            # covers every seq up to self._seq; replay skips anything older
+            self.scores['journal_seq'] = self._seq
+            snapshot = dict(self.scores, daily_scores=dict(self.scores['daily_scores']))
+
+        self.save_file.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_json(self.save_file, snapshot, separators=(',', ':'))
+
+        # A crash before this truncation is harmless: the old entries are
+        # at or below journal_seq and are skipped on the next load
+        open(self.journal_file, 'w').close()
+        self._journal_entries = 0
+
+    def close(self):
+        """Flush outstanding deltas and compact; call at shutdown."""
+        if self.persistence != "journal":
+            return
+        self._stopping = True
+        self._wake.set()
+        if self._writer is not None and self._writer is not threading.current_thread():
+            self._writer.join()
+        self.flush()
+        if self._journal_entries:
+            self.compact()
 
     def get_today_score(self) -> int:
-        return self.scores['daily_scores'].get(self.today, 0)
+        return self.scores['daily_scores'].get(str(date.today()), 0)
 
     def get_stats(self) -> Dict[str, Any]:
         return {
@@ -55,4 +263,32 @@ class ScoreManager:
             'lifetime_score': self.scores['lifetime_score'],
             'best_day_score': self.scores['best_day_score'],
             'best_day_date': self.scores['best_day_date']
-        }
\ No newline at end of file
+        }
+
+
+def create_score_manager(player: str, game_type: str, backend: str = SCORE_BACKEND):
+    """Build a score manager for the configured backend."""
+    if backend == "sqlite":
+        from utils.sqlite_score_store import SQLiteScoreManager
+        return SQLiteScoreManager(player, game_type)
+    if backend == "remote":
+        from utils.score_client import RemoteScoreManager
+        return RemoteScoreManager(player, game_type)
+    return ScoreManager(player, game_type)
+
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def get_score_manager(player: str, game_type: str, backend: str = SCORE_BACKEND):
+    """
+    Shared score manager for a player's game, so every screen instance
+    adds to the same save file, database row or server batch.
+    """
+    key = (player, game_type, backend)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = _managers[key] = create_score_manager(player, game_type, backend)
+        return manager
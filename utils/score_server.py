@@ -0,0 +1,317 @@
+# utils/score_server.py
+"""
+Score service shared by every kiosk in a classroom.
+
+    python -m utils.score_server [--address 0.0.0.0:8765 | /run/ellievivi.sock] [--db saves/scores.db]
+
+Kiosks run with ELLIEVIVI_SCORE_BACKEND=remote and ELLIEVIVI_SCORE_SERVER
+set to the same address (see utils.score_client).
+
+Requests and responses are one JSON object per line. Requests carry an "op":
+
+    add    {"client": id, "seq": n, "adds": [[player, game_type, day, points], ...]}
+           Answered once the adds are committed. A seq at or below the
+           client's last accepted one is acknowledged but not applied again,
+           so a kiosk can resend a batch it never heard back about.
+    stats  {"client": id, "player": ..., "game_type": ..., "day": ...}
+           Also returns the client's last accepted seq, so the kiosk knows
+           which of its own batches the stats already include.
+    info   {"client": id} (optional)
+           Server counters, and the client's last accepted seq, which a
+           kiosk numbers its next batch after
+
+Responses are {"ok": true, ...} or {"ok": false, "error": message}.
+
+The server is the only writer of its SQLite store. Adds arriving within
+SCORE_SERVER_COMMIT_INTERVAL of each other are coalesced per player, game
+and day into one transaction, and stats are answered from memory, loaded
+from the store once per player, game and day.
+"""
+import argparse
+import asyncio
+import json
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any, Dict, List, Tuple
+
+from config import SCORE_DB_PATH, SCORE_SERVER_ADDRESS, SCORE_SERVER_COMMIT_INTERVAL
+from utils.logger import setup_logger
+from utils.sqlite_score_store import SQLiteScoreStore
+
+# Longest request line accepted, in bytes
+MAX_MESSAGE = 1 << 20
+
+
+def parse_address(address: str):
+    """'host:port' -> (host, port); an address containing a slash is a Unix socket path."""
+    if "/" in address:
+        return address
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    return json.dumps(message, separators=(',', ':')).encode('utf-8') + b"\n"
+
+
+def _check_day(day) -> str:
+    # Raises ValueError before a bad day can reach, and fail, a commit
+    return str(date.fromisoformat(day))
+
+
+class _Totals:
+    """One player's game, kept current in memory as adds are accepted."""
+    __slots__ = ('lifetime_score', 'best_day_score', 'best_day_date', 'days')
+
+    def __init__(self, stored: Dict[str, Any]):
+        self.lifetime_score = stored['lifetime_score']
+        self.best_day_score = stored['best_day_score']
+        self.best_day_date = stored['best_day_date']
+        self.days: Dict[str, int] = {}
+
+    def apply(self, day: str, points: int):
+        score = self.days[day] = self.days[day] + points
+        self.lifetime_score += points
+        if score > self.best_day_score:
+            self.best_day_score = score
+            self.best_day_date = day
+
+    def stats(self, day: str) -> Dict[str, Any]:
+        return {
+            'today_score': self.days.get(day, 0),
+            'lifetime_score': self.lifetime_score,
+            'best_day_score': self.best_day_score,
+            'best_day_date': self.best_day_date
+        }
+
+
+class ScoreServer:
+    """Serves one SQLiteScoreStore to many kiosks."""
+    def __init__(self, store: SQLiteScoreStore, commit_interval: float = SCORE_SERVER_COMMIT_INTERVAL):
+        """
+        Args:
+            store: Store the server owns; nothing else may write to it
+            commit_interval: Seconds adds are collected before they are committed
+        """
+        self.store = store
+        self.commit_interval = commit_interval
+        self.logger = setup_logger()
+        self.counters = {
+            'connections': 0, 'requests': 0, 'batches': 0, 'duplicates': 0,
+            'adds': 0, 'commits': 0, 'committed_rows': 0
+        }
+
+        # The store is only touched from this one thread, in submission order
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="score-store")
+        self._client_seqs: Dict[str, int] = store.get_client_seqs()
+        self._totals: Dict[Tuple[str, str], _Totals] = {}
+        self._loading: Dict[Tuple[str, str, str], asyncio.Future] = {}
+
+        # Accepted but not yet committed
+        self._pending: Dict[Tuple[str, str, str], int] = {}
+        self._pending_seqs: Dict[str, int] = {}
+        self._waiters: List[asyncio.Future] = []
+
+        self._wake = None
+        self._commit_task = None
+        self._server = None
+        self._writers = set()
+
+    async def start(self, address: str = SCORE_SERVER_ADDRESS):
+        """Start listening; an address with port 0 picks a free port (see `address`)."""
+        self._wake = asyncio.Event()
+        self._commit_task = asyncio.create_task(self._commit_loop())
+        target = parse_address(address)
+        if isinstance(target, str):
+            self._server = await asyncio.start_unix_server(self._handle, path=target, limit=MAX_MESSAGE)
+        else:
+            self._server = await asyncio.start_server(self._handle, *target, limit=MAX_MESSAGE)
+        return self
+
+    @property
+    def address(self) -> str:
+        name = self._server.sockets[0].getsockname()
+        return name if isinstance(name, str) else f"{name[0]}:{name[1]}"
+
+    async def close(self):
+        """Stop listening, drop the kiosks' connections and commit what was accepted."""
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+        self._commit_task.cancel()
+        await self._commit()
+        self._executor.shutdown()
+
+    # Connections
+
+    async def _handle(self, reader, writer):
+        self.counters['connections'] += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = await self._dispatch(json.loads(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+                writer.write(encode_message(response))
+                await writer.drain()
+        except (ConnectionError, ValueError) as e:
+            # Dropped connection or an oversized line
+            self.logger.debug(f"Score client connection closed: {str(e)}")
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        self.counters['requests'] += 1
+        op = request['op']
+        if op == 'add':
+            return await self._add(request['client'], int(request['seq']), request['adds'])
+        if op == 'stats':
+            day = _check_day(request['day'])
+            totals = await self._totals_for(request['player'], request['game_type'], day)
+            return {
+                'ok': True,
+                'client_seq': self._client_seqs.get(request.get('client'), 0),
+                'stats': totals.stats(day)
+            }
+        if op == 'info':
+            return {
+                'ok': True,
+                'players': len(self._totals),
+                'client_seq': self._client_seqs.get(request.get('client'), 0),
+                **self.counters
+            }
+        raise ValueError(f"Unknown op: {op}")
+
+    # Reads
+
+    async def _totals_for(self, player: str, game_type: str, day: str) -> _Totals:
+        """In-memory totals with `day` loaded; the store is read once per key."""
+        totals = self._totals.get((player, game_type))
+        if totals is not None and day in totals.days:
+            return totals
+        key = (player, game_type, day)
+        loading = self._loading.get(key)
+        if loading is None:
+            loading = self._loading[key] = asyncio.ensure_future(self._load(player, game_type, day))
+        await asyncio.shield(loading)
+        return self._totals[(player, game_type)]
+
+    def _read(self, player, game_type, day):
+        return self.store.get_totals(player, game_type), self.store.get_day_score(player, game_type, day)
+
+    async def _load(self, player, game_type, day):
+        # Nothing for this player, game and day has been accepted yet (adds
+        # wait for this load), so the store alone is the whole truth
+        loop = asyncio.get_running_loop()
+        try:
+            stored, day_score = await loop.run_in_executor(self._executor, self._read, player, game_type, day)
+            totals = self._totals.get((player, game_type))
+            if totals is None:
+                totals = self._totals[(player, game_type)] = _Totals(stored)
+            totals.days.setdefault(day, day_score)
+        finally:
+            del self._loading[(player, game_type, day)]
+
+    # Writes
+
+    async def _add(self, client: str, seq: int, adds) -> Dict[str, Any]:
+        adds = [(str(player), str(game_type), _check_day(day), int(points)) for player, game_type, day, points in adds]
+        for player, game_type, day, _ in adds:
+            await self._totals_for(player, game_type, day)
+
+        # No awaits from the seq check until the adds are applied, so two
+        # copies of one batch can never both be accepted
+        duplicate = seq <= self._client_seqs.get(client, 0)
+        if duplicate:
+            self.counters['duplicates'] += 1
+        else:
+            self._client_seqs[client] = seq
+            self._pending_seqs[client] = seq
+            for player, game_type, day, points in adds:
+                self._totals[(player, game_type)].apply(day, points)
+                key = (player, game_type, day)
+                self._pending[key] = self._pending.get(key, 0) + points
+            self.counters['batches'] += 1
+            self.counters['adds'] += len(adds)
+
+        # Acknowledge after the next commit, which covers this batch or,
+        # for a duplicate, any earlier copy still waiting to be written
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._wake.set()
+        await waiter
+        return {'ok': True, 'duplicate': duplicate}
+
+    async def _commit_loop(self):
+        while True:
+            await self._wake.wait()
+            # Let adds from the other kiosks collect for one interval
+            await asyncio.sleep(self.commit_interval)
+            self._wake.clear()
+            if not await self._commit():
+                await asyncio.sleep(1.0)
+
+    async def _commit(self) -> bool:
+        pending, self._pending = self._pending, {}
+        seqs, self._pending_seqs = self._pending_seqs, {}
+        waiters, self._waiters = self._waiters, []
+        if not waiters:
+            return True
+        adds = [key + (points,) for key, points in pending.items() if points]
+        try:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self.store.add_batch, adds, seqs)
+        except Exception as e:
+            self.logger.error(f"Error committing scores: {str(e)}")
+            # Keep everything for the next attempt; the kiosks resend on timeout
+            for key, points in pending.items():
+                self._pending[key] = self._pending.get(key, 0) + points
+            for client, seq in seqs.items():
+                self._pending_seqs[client] = max(seq, self._pending_seqs.get(client, seq))
+            self._waiters.extend(waiters)
+            self._wake.set()
+            return False
+        self.counters['commits'] += 1
+        self.counters['committed_rows'] += len(adds)
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        return True
+
+
+async def serve(address: str = SCORE_SERVER_ADDRESS, db_path=SCORE_DB_PATH):
+    """Run a server until interrupted or terminated."""
+    store = SQLiteScoreStore(db_path)
+    server = await ScoreServer(store).start(address)
+    stop = asyncio.Event()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+    except (NotImplementedError, RuntimeError):
+        pass
+    print(f"Score server listening on {server.address}, store {db_path}", flush=True)
+    try:
+        await stop.wait()
+    finally:
+        await server.close()
+        store.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve scores to several kiosks")
+    parser.add_argument("--address", default=SCORE_SERVER_ADDRESS, help="host:port or a Unix socket path")
+    parser.add_argument("--db", default=str(SCORE_DB_PATH))
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.address, args.db))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# utils/session_recording.py
+"""
+Record a play session's input and replay it headless, frame for frame.
+
+    python main.py --record sessions/slow_menu.rec
+    python -m utils.session_recording sessions/slow_menu.rec [--render-mode full] [--slowest 10]
+
+A recording is gzipped JSON lines: a header with the random seed and the
+save files that steer gameplay, then one line per frame with its index,
+tick count and events, plus the mouse state whenever it changed. Replays
+restore the seed and the save files into a scratch directory and run
+every frame back to back, without the frame cap or idle waits, so a slow
+frame shows up at the same index every time.
+"""
+import argparse
+import atexit
+import base64
+import gzip
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+import pygame
+
+# Not taken from config: replays must set the save directory before config loads
+FORMAT = "ellievivi-session"
+VERSION = 1
+
+
+class Frame(NamedTuple):
+    index: int
+    ticks: int
+    events: List[pygame.event.Event]
+    pos: Tuple[int, int]
+    buttons: Tuple[bool, ...]
+
+
+class Session(NamedTuple):
+    header: Dict[str, Any]
+    frames: List[Frame]
+
+    @property
+    def seed(self) -> int:
+        return self.header['seed']
+
+
+def encode_event(event):
+    """Event as [type, attributes]; attributes that are not plain data are dropped."""
+    attributes = {}
+    for name, value in event.dict.items():
+        if isinstance(value, tuple):
+            value = list(value)
+        if isinstance(value, (bool, int, float, str, list)):
+            attributes[name] = value
+    return [event.type, attributes]
+
+
+def decode_event(record):
+    event_type, attributes = record
+    return pygame.event.Event(event_type, {
+        name: tuple(value) if isinstance(value, list) else value
+        for name, value in attributes.items()
+    })
+
+
+def _pack_buttons(buttons):
+    return sum(1 << i for i, pressed in enumerate(buttons) if pressed)
+
+
+def _unpack_buttons(mask):
+    return tuple(bool(mask >> i & 1) for i in range(3))
+
+
+class SessionRecorder:
+    """Writes one line per frame as the game loop runs."""
+    def __init__(self, path, save_dir=None, snapshot_pattern=None, skip_types=(), seed=None, **metadata):
+        """
+        Start a recording.
+
+        Args:
+            path: Recording file to create
+            save_dir: Directory holding the save files to embed
+            snapshot_pattern: Glob for the save files that affect gameplay
+            skip_types: Event types that are internal and not recorded
+            seed: Random seed for the session, random if None
+            **metadata: Extra header fields
+        """
+        self.path = Path(path)
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.skip_types = set(skip_types)
+        self.frames = 0
+        self._pos = None
+        self._buttons = None
+
+        files = {}
+        if save_dir is not None and snapshot_pattern:
+            for save_file in sorted(Path(save_dir).glob(snapshot_pattern)):
+                files[save_file.name] = base64.b64encode(save_file.read_bytes()).decode('ascii')
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = gzip.open(self.path, 'wt', encoding='utf-8')
+        self._write({'format': FORMAT, 'version': VERSION, 'seed': self.seed, 'files': files, **metadata})
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, separators=(',', ':')))
+        self._file.write("\n")
+
+    def record_frame(self, snapshot, events):
+        """
+        Append a frame.
+
+        Args:
+            snapshot: (ticks, mouse pos, mouse buttons) latched for the frame
+            events: The frame's events, after coalescing
+        """
+        ticks, pos, buttons = snapshot
+        record = [self.frames, ticks, [encode_event(event) for event in events if event.type not in self.skip_types]]
+        if pos != self._pos or buttons != self._buttons:
+            record.extend((list(pos), _pack_buttons(buttons)))
+            self._pos, self._buttons = pos, buttons
+        self._write(record)
+        self.frames += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def load_session(path) -> Session:
+    """Read a recording; raises ValueError if the file is not one."""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        header = json.loads(f.readline() or "null")
+        if not isinstance(header, dict) or header.get('format') != FORMAT or header.get('version') != VERSION:
+            raise ValueError(f"Not a version {VERSION} session recording: {path}")
+        frames = []
+        pos, buttons = (0, 0), (False, False, False)
+        for line in f:
+            record = json.loads(line)
+            if len(record) > 3:
+                pos, buttons = tuple(record[3]), _unpack_buttons(record[4])
+            frames.append(Frame(record[0], record[1], [decode_event(event) for event in record[2]], pos, buttons))
+    return Session(header, frames)
+
+
+def summarize(session, frame_times, slowest=10):
+    """Replay timings with the slowest frames and the events they handled."""
+    if not frame_times:
+        return {'frames': 0}
+    ordered = sorted(frame_times)
+    worst = sorted(range(len(frame_times)), key=frame_times.__getitem__, reverse=True)[:slowest]
+    return {
+        'frames': len(frame_times),
+        'recorded_frames': len(session.frames),
+        'total_ms': round(sum(frame_times), 2),
+        'mean_ms': round(sum(frame_times) / len(frame_times), 3),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        'max_ms': round(ordered[-1], 3),
+        'slowest': [
+            {
+                'frame': session.frames[index].index,
+                'ms': round(frame_times[index], 3),
+                'events': [pygame.event.event_name(event.type) for event in session.frames[index].events]
+            }
+            for index in worst
+        ]
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded session headless")
+    parser.add_argument("session", help="Recording made with main.py --record")
+    parser.add_argument("--render-mode", choices=["dirty", "full"], default=None)
+    parser.add_argument("--render-backend", choices=["surface", "texture"], default=None)
+    parser.add_argument("--slowest", type=int, default=10, help="Slowest frames to list")
+    args = parser.parse_args(argv)
+
+    session = load_session(args.session)
+
+    # Replays never touch the real saves: the embedded files go to a
+    # scratch directory that is removed after everything else at exit
+    save_dir = Path(tempfile.mkdtemp(prefix="ellievivi-replay-"))
+    atexit.register(shutil.rmtree, save_dir, True)
+    for name, data in session.header['files'].items():
+        (save_dir / name).write_bytes(base64.b64decode(data))
+    os.environ["ELLIEVIVI_SAVE_DIR"] = str(save_dir)
+    # Nor the classroom server: replayed points stay in the scratch saves
+    os.environ["ELLIEVIVI_SCORE_BACKEND"] = "json"
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    from main import Game
+    render_mode = args.render_mode or session.header.get('render_mode')
+    options = {'render_mode': render_mode, 'render_backend': args.render_backend}
+    game = Game(**{name: value for name, value in options.items() if value}, deterministic=True)
+    start = time.perf_counter()
+    frame_times = game.replay(session)
+    print(f"Replayed {len(frame_times)} frames in {(time.perf_counter() - start) * 1000:.1f} ms")
+    print(json.dumps(summarize(session, frame_times, args.slowest), indent=2))
+
+
+if __name__ == "__main__":
+    main()
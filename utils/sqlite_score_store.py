@@ -0,0 +1,336 @@
+# utils/sqlite_score_store.py
+"""
+SQLite-backed score storage with incrementally maintained rollups.
+
+    python -m utils.sqlite_score_store migrate [--save-dir saves] [--db saves/scores.db]
+"""
+import argparse
+import sqlite3
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from config import SAVE_DIR, SCORE_DB_PATH
+from utils.score_manager import load_saved_scores, notify_score_listeners, score_listeners
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_scores (
+    player TEXT NOT NULL,
+    game_type TEXT NOT NULL,
+    day TEXT NOT NULL,
+    points INTEGER NOT NULL,
+    PRIMARY KEY (player, game_type, day)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS weekly_scores (
+    player TEXT NOT NULL,
+    game_type TEXT NOT NULL,
+    week_start TEXT NOT NULL,
+    points INTEGER NOT NULL,
+    PRIMARY KEY (player, game_type, week_start)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS monthly_scores (
+    player TEXT NOT NULL,
+    game_type TEXT NOT NULL,
+    month TEXT NOT NULL,
+    points INTEGER NOT NULL,
+    PRIMARY KEY (player, game_type, month)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS totals (
+    player TEXT NOT NULL,
+    game_type TEXT NOT NULL,
+    lifetime_score INTEGER NOT NULL DEFAULT 0,
+    best_day_score INTEGER NOT NULL DEFAULT 0,
+    best_day_date TEXT NOT NULL DEFAULT '',
+    best_week_score INTEGER NOT NULL DEFAULT 0,
+    best_week_start TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (player, game_type)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS migrated_files (
+    name TEXT PRIMARY KEY,
+    days INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS client_batches (
+    client_id TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+_ROLLUP_UPSERT = """
+INSERT INTO {table} (player, game_type, {column}, points) VALUES (?, ?, ?, ?)
+ON CONFLICT (player, game_type, {column}) DO UPDATE SET points = points + excluded.points
+RETURNING points
+"""
+
+
+def week_start(day: str) -> str:
+    """ISO date of the Monday starting the week that contains day."""
+    parsed = date.fromisoformat(day)
+    return str(parsed - timedelta(days=parsed.weekday()))
+
+
+class SQLiteScoreStore:
+    """
+    One database for every player and game.
+    Each add updates the day row, the week and month rollups and the
+    per-player totals in a single transaction, so every query is an
+    index lookup or a short range scan.
+    """
+    def __init__(self, db_path=SCORE_DB_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def add_points(self, player: str, game_type: str, day: str, points: int):
+        with self._lock, self.conn:
+            self._add(player, game_type, day, points)
+
+    def add_batch(self, adds: Iterable[Tuple[str, str, str, int]], client_seqs: Optional[Dict[str, int]] = None):
+        """
+        Apply many adds in one transaction.
+
+        Args:
+            adds: (player, game_type, day, points) tuples
+            client_seqs: Remote client id -> last batch sequence number the
+                adds include, committed with them (see get_client_seqs)
+        """
+        with self._lock, self.conn:
+            for player, game_type, day, points in adds:
+                self._add(player, game_type, day, points)
+            self.conn.executemany(
+                """
+                INSERT INTO client_batches (client_id, seq) VALUES (?, ?)
+                ON CONFLICT (client_id) DO UPDATE SET seq = MAX(seq, excluded.seq)
+                """,
+                (client_seqs or {}).items()
+            )
+
+    def get_client_seqs(self) -> Dict[str, int]:
+        """Last committed batch sequence number per remote client."""
+        with self._lock:
+            return dict(self.conn.execute("SELECT client_id, seq FROM client_batches").fetchall())
+
+    def _add(self, player, game_type, day, points):
+        conn = self.conn
+        day_total = conn.execute(
+            _ROLLUP_UPSERT.format(table="daily_scores", column="day"),
+            (player, game_type, day, points)
+        ).fetchone()[0]
+        week = week_start(day)
+        week_total = conn.execute(
+            _ROLLUP_UPSERT.format(table="weekly_scores", column="week_start"),
+            (player, game_type, week, points)
+        ).fetchone()[0]
+        conn.execute(
+            _ROLLUP_UPSERT.format(table="monthly_scores", column="month"),
+            (player, game_type, day[:7], points)
+        ).fetchone()
+
+        conn.execute(
+            "INSERT OR IGNORE INTO totals (player, game_type) VALUES (?, ?)",
+            (player, game_type)
+        )
+        conn.execute(
+            """
+            UPDATE totals SET
+                lifetime_score = lifetime_score + ?,
+                best_day_date = CASE WHEN ? > best_day_score THEN ? ELSE best_day_date END,
+                best_day_score = MAX(best_day_score, ?),
+                best_week_start = CASE WHEN ? > best_week_score THEN ? ELSE best_week_start END,
+                best_week_score = MAX(best_week_score, ?)
+            WHERE player = ? AND game_type = ?
+            """,
+            (points, day_total, day, day_total, week_total, week, week_total, player, game_type)
+        )
+
+    def get_day_score(self, player: str, game_type: str, day: str) -> int:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT points FROM daily_scores WHERE player = ? AND game_type = ? AND day = ?",
+                (player, game_type, day)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def get_totals(self, player: str, game_type: str) -> Dict[str, Any]:
+        with self._lock:
+            row = self.conn.execute(
+                """
+                SELECT lifetime_score, best_day_score, best_day_date, best_week_score, best_week_start
+                FROM totals WHERE player = ? AND game_type = ?
+                """,
+                (player, game_type)
+            ).fetchone()
+        keys = ('lifetime_score', 'best_day_score', 'best_day_date', 'best_week_score', 'best_week_start')
+        return dict(zip(keys, row or (0, 0, '', 0, '')))
+
+    def get_scores(self, player: str, game_type: str) -> Dict[str, Any]:
+        """One player's game as a JSON save document (see score_manager.empty_scores)."""
+        totals = self.get_totals(player, game_type)
+        with self._lock:
+            daily = dict(self.conn.execute(
+                "SELECT day, points FROM daily_scores WHERE player = ? AND game_type = ?",
+                (player, game_type)
+            ).fetchall())
+        return {
+            'lifetime_score': totals['lifetime_score'],
+            'best_day_score': totals['best_day_score'],
+            'best_day_date': totals['best_day_date'],
+            'daily_scores': daily
+        }
+
+    def get_trend(self, player: str, game_type: str, end_day: str, days: int = 30) -> List[Tuple[str, int]]:
+        """Per-day points for the `days` days ending at end_day (missing days are 0)."""
+        end = date.fromisoformat(end_day)
+        start = str(end - timedelta(days=days - 1))
+        with self._lock:
+            rows = dict(self.conn.execute(
+                """
+                SELECT day, points FROM daily_scores
+                WHERE player = ? AND game_type = ? AND day BETWEEN ? AND ?
+                """,
+                (player, game_type, start, end_day)
+            ).fetchall())
+        return [
+            (str(end - timedelta(days=offset)), rows.get(str(end - timedelta(days=offset)), 0))
+            for offset in range(days - 1, -1, -1)
+        ]
+
+    def get_month_score(self, player: str, game_type: str, month: str) -> int:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT points FROM monthly_scores WHERE player = ? AND game_type = ? AND month = ?",
+                (player, game_type, month)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def migrate_json(self, save_file: Path, player: str, game_type: str) -> int:
+        """
+        Import one JSON save file (and its journal) unless a file of the
+        same name was imported before.
+
+        Returns:
+            int: Number of days imported (0 if it was already imported)
+        """
+        scores = load_saved_scores(save_file)
+        daily = scores.get('daily_scores', {})
+        with self._lock, self.conn:
+            done = self.conn.execute(
+                "SELECT 1 FROM migrated_files WHERE name = ?", (Path(save_file).name,)
+            ).fetchone()
+            if done:
+                return 0
+            for day in sorted(daily):
+                if daily[day]:
+                    self._add(player, game_type, day, daily[day])
+            # Same transaction as the adds, so a file is never half imported
+            self.conn.execute(
+                "INSERT INTO migrated_files (name, days) VALUES (?, ?)",
+                (Path(save_file).name, len(daily))
+            )
+        return len(daily)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+class SQLiteScoreManager:
+    """ScoreManager-compatible view of one player's game in a SQLiteScoreStore."""
+    def __init__(self, player: str, game_type: str, store: Optional[SQLiteScoreStore] = None):
+        self.player = player
+        self.game_type = game_type
+        self.store = store or get_default_store()
+
+    def add_points(self, points: int):
+        today = str(date.today())
+        self.store.add_points(self.player, self.game_type, today, points)
+        if score_listeners:
+            # Listeners get the same document a JSON ScoreManager passes
+            scores = self.store.get_scores(self.player, self.game_type)
+            notify_score_listeners(self.player, self.game_type, today, points, scores)
+
+    def get_today_score(self) -> int:
+        return self.store.get_day_score(self.player, self.game_type, str(date.today()))
+
+    def get_stats(self) -> Dict[str, Any]:
+        totals = self.store.get_totals(self.player, self.game_type)
+        return {
+            'today_score': self.get_today_score(),
+            'lifetime_score': totals['lifetime_score'],
+            'best_day_score': totals['best_day_score'],
+            'best_day_date': totals['best_day_date']
+        }
+
+    def get_best_week(self) -> Dict[str, Any]:
+        totals = self.store.get_totals(self.player, self.game_type)
+        return {'week_start': totals['best_week_start'], 'score': totals['best_week_score']}
+
+    def get_trend(self, days: int = 30) -> List[Tuple[str, int]]:
+        return self.store.get_trend(self.player, self.game_type, str(date.today()), days)
+
+    def close(self):
+        pass
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_store() -> SQLiteScoreStore:
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = SQLiteScoreStore()
+        return _default_store
+
+
+def parse_save_name(path: Path) -> Optional[Tuple[str, str]]:
+    """Split '{player}_{game_type}_scores.json' into (player, game_type)."""
+    stem = path.name[:-len("_scores.json")] if path.name.endswith("_scores.json") else None
+    if not stem or "_" not in stem:
+        return None
+    player, game_type = stem.split("_", 1)
+    return player, game_type
+
+
+def migrate_save_dir(save_dir=SAVE_DIR, store: Optional[SQLiteScoreStore] = None) -> Dict[str, int]:
+    """
+    Import every JSON save file into the SQLite store. Files imported
+    by an earlier run are skipped, so running it again is harmless.
+    """
+    store = store or get_default_store()
+    imported = {}
+    for save_file in sorted(Path(save_dir).glob("*_scores.json")):
+        names = parse_save_name(save_file)
+        if names is None:
+            continue
+        imported[save_file.name] = store.migrate_json(save_file, *names)
+    return imported
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SQLite score store tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    migrate = subparsers.add_parser("migrate", help="Import JSON save files")
+    migrate.add_argument("--save-dir", default=str(SAVE_DIR))
+    migrate.add_argument("--db", default=str(SCORE_DB_PATH))
+    args = parser.parse_args(argv)
+
+    if args.command == "migrate":
+        store = SQLiteScoreStore(args.db)
+        for name, days in migrate_save_dir(args.save_dir, store).items():
+            print(f"{name}: {days} days imported")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+# utils/stats_service.py
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from config import SAVE_DIR, STATS_REFRESH_INTERVAL
+from utils.score_manager import add_score_listener, apply_points, load_saved_scores
+from utils.sqlite_score_store import parse_save_name
+
+
+def _file_signature(path: Path) -> Tuple[float, int]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return (0.0, -1)
+    return (stat.st_mtime, stat.st_size)
+
+
+def _runs(ordinals: List[int]) -> Tuple[int, int, int]:
+    """Return (longest run, length of the final run, last ordinal) of sorted day ordinals."""
+    longest = run = 0
+    previous = None
+    for ordinal in ordinals:
+        run = run + 1 if previous is not None and ordinal == previous + 1 else 1
+        longest = max(longest, run)
+        previous = ordinal
+    return longest, run, previous
+
+
+class _Entry:
+    """Indexed scores for one save file."""
+    def __init__(self, player, game_type, scores, signature):
+        self.player = player
+        self.game_type = game_type
+        self.scores = scores
+        self.signature = signature
+        self.days = sorted(
+            date.fromisoformat(day).toordinal()
+            for day, points in scores['daily_scores'].items() if points > 0
+        )
+        self.longest, self.final_run, self.last_day = _runs(self.days)
+
+    def add(self, day: str, points: int):
+        was_played = self.scores['daily_scores'].get(day, 0) > 0
+        apply_points(self.scores, day, points)
+        if was_played or self.scores['daily_scores'][day] <= 0:
+            return
+        ordinal = date.fromisoformat(day).toordinal()
+        if self.last_day is None or ordinal > self.last_day:
+            # Common case: a new latest day extends or restarts the final run
+            self.days.append(ordinal)
+            contiguous = self.last_day is not None and ordinal == self.last_day + 1
+            self.final_run = self.final_run + 1 if contiguous else 1
+            self.longest = max(self.longest, self.final_run)
+            self.last_day = ordinal
+        else:
+            self.days.append(ordinal)
+            self.days.sort()
+            self.longest, self.final_run, self.last_day = _runs(self.days)
+
+    def current_streak(self, today_ordinal: int) -> int:
+        """Consecutive played days ending today or yesterday."""
+        if self.last_day is None or today_ordinal - self.last_day > 1:
+            return 0
+        return self.final_run
+
+
+class StatsService:
+    """
+    In-memory index over every save file for cross-player statistics.
+    Files are re-read only when their mtime or size changes, scores added
+    in-process are applied incrementally, and query results are cached
+    until the index changes, so screens can query it every frame.
+    """
+    def __init__(self, save_dir=SAVE_DIR, refresh_interval=STATS_REFRESH_INTERVAL):
+        self.save_dir = Path(save_dir)
+        self.refresh_interval = refresh_interval
+        self.entries: Dict[Tuple[str, str], _Entry] = {}
+        self.version = 0
+        self._lock = threading.RLock()
+        self._results = {}
+        self._last_refresh = None
+        self.file_loads = 0
+
+    def refresh(self):
+        """Re-scan the save directory, reloading only files that changed."""
+        with self._lock:
+            self._last_refresh = time.monotonic()
+            seen = set()
+            changed = False
+            for save_file in self.save_dir.glob("*_scores.json"):
+                names = parse_save_name(save_file)
+                if names is None:
+                    continue
+                seen.add(names)
+                signature = (
+                    _file_signature(save_file)
+                    + _file_signature(save_file.with_suffix(".journal"))
+                )
+                entry = self.entries.get(names)
+                if entry is not None and entry.signature in (None, signature):
+                    continue
+                scores = load_saved_scores(save_file)
+                self.entries[names] = _Entry(names[0], names[1], scores, signature)
+                self.file_loads += 1
+                changed = True
+
+            for names in set(self.entries) - seen:
+                # Entries updated in-process may not be on disk yet
+                if self.entries[names].signature is not None:
+                    del self.entries[names]
+                    changed = True
+
+            if changed:
+                self._invalidate()
+
+    def maybe_refresh(self):
+        """Refresh at most once per refresh_interval; cheap to call every frame."""
+        if self._last_refresh is None or time.monotonic() - self._last_refresh >= self.refresh_interval:
+            self.refresh()
+
+    def record_points(self, player: str, game_type: str, day: str, points: int,
+                      scores: Optional[Dict[str, Any]] = None):
+        """
+        Apply an in-process add_points without touching the disk.
+
+        Args:
+            scores: The manager's scores after the add; seeds a player's
+                game that is not indexed yet, since the files on disk may
+                still lack deltas waiting in the manager's journal queue
+        """
+        with self._lock:
+            entry = self.entries.get((player, game_type))
+            if entry is None and scores is not None:
+                entry = _Entry(player, game_type, dict(scores, daily_scores=dict(scores['daily_scores'])), None)
+                self.entries[(player, game_type)] = entry
+            else:
+                if entry is None:
+                    entry = _Entry(player, game_type, load_saved_scores(
+                        self.save_dir / f"{player}_{game_type}_scores.json"
+                    ), None)
+                    self.entries[(player, game_type)] = entry
+                entry.add(day, points)
+            # This process now owns the file and its journal may lag behind
+            # the in-memory scores, so refresh must not reload it from disk
+            entry.signature = None
+            self._invalidate()
+
+    def _invalidate(self):
+        self.version += 1
+        self._results.clear()
+
+    def _cached(self, key, compute):
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                result = self._results[key] = compute()
+            return result
+
+    def lifetime_totals(self) -> List[Tuple[str, int]]:
+        """Players ranked by lifetime points across all games."""
+        def compute():
+            totals = {}
+            for entry in self.entries.values():
+                totals[entry.player] = totals.get(entry.player, 0) + entry.scores['lifetime_score']
+            return sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+        return self._cached(('lifetime',), compute)
+
+    def best_days(self, game_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Best single day per player and game, highest first."""
+        def compute():
+            rows = [
+                {
+                    'player': entry.player,
+                    'game_type': entry.game_type,
+                    'score': entry.scores['best_day_score'],
+                    'date': entry.scores['best_day_date']
+                }
+                for entry in self.entries.values()
+                if game_type is None or entry.game_type == game_type
+            ]
+            return sorted(rows, key=lambda row: (-row['score'], row['player']))
+        return self._cached(('best_days', game_type), compute)
+
+    def streaks(self, today: Optional[date] = None) -> Dict[Tuple[str, str], Dict[str, int]]:
+        """Current and longest daily streaks per (player, game_type)."""
+        today_ordinal = (today or date.today()).toordinal()
+
+        def compute():
+            return {
+                key: {
+                    'current': entry.current_streak(today_ordinal),
+                    'longest': entry.longest
+                }
+                for key, entry in self.entries.items()
+            }
+        return self._cached(('streaks', today_ordinal), compute)
+
+    def player_streaks(self, today: Optional[date] = None) -> Dict[str, Dict[str, int]]:
+        """Streaks counting a day as played if the player scored in any game."""
+        today_ordinal = (today or date.today()).toordinal()
+
+        def compute():
+            days_by_player = {}
+            for entry in self.entries.values():
+                days_by_player.setdefault(entry.player, set()).update(entry.days)
+            result = {}
+            for player, days in days_by_player.items():
+                longest, final_run, last_day = _runs(sorted(days))
+                current = final_run if last_day is not None and today_ordinal - last_day <= 1 else 0
+                result[player] = {'current': current, 'longest': longest}
+            return result
+        return self._cached(('player_streaks', today_ordinal), compute)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_stats_service() -> StatsService:
+    """Shared service, indexed once and kept current by ScoreManager.add_points."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = StatsService()
+            _service.refresh()
+            add_score_listener(_service.record_points)
+        return _service
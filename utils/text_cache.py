@@ -0,0 +1,88 @@
+# utils/text_cache.py
+from collections import OrderedDict
+
+from config import TEXT_CACHE_MAX_BYTES, TEXT_CACHE_MAX_ENTRIES
+
+
+class TextCache:
+    """
+    LRU cache of rendered text surfaces.
+    Keyed by (font, text, antialias, color) so identical strings are
+    rasterized once and reused on every following frame.
+    """
+    def __init__(self, max_bytes=TEXT_CACHE_MAX_BYTES, max_entries=TEXT_CACHE_MAX_ENTRIES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Upper bound on the pixel memory held by cached surfaces
+            max_entries: Upper bound on the number of cached surfaces
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text, antialias, color):
+        """Return a surface for the text, rendering it only on a cache miss."""
+        key = (font, text, antialias, tuple(color))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        size = self._surface_bytes(surface)
+        if size > self.max_bytes:
+            # Too large to ever fit; hand it out without caching
+            return surface
+
+        self._surfaces[key] = surface
+        self.current_bytes += size
+        self._evict()
+        return surface
+
+    def _evict(self):
+        while self._surfaces and (
+            self.current_bytes > self.max_bytes
+            or len(self._surfaces) > self.max_entries
+        ):
+            _, surface = self._surfaces.popitem(last=False)
+            self.current_bytes -= self._surface_bytes(surface)
+            self.evictions += 1
+
+    @staticmethod
+    def _surface_bytes(surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def clear(self):
+        self._surfaces.clear()
+        self.current_bytes = 0
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._surfaces),
+            'bytes': self.current_bytes
+        }
+
+
+# Shared cache used by all screens and widgets
+text_cache = TextCache()
+
+
+def render_text(font, text, color, antialias=True):
+    """Render text through the shared cache."""
+    return text_cache.render(font, text, antialias, color)
@@ -0,0 +1,301 @@
+# utils/text_field.py
+import time
+from bisect import bisect_left
+from collections import deque
+
+import pygame
+from config import (
+    COLORS, TEXT_FIELD_MAX_LENGTH, TEXT_FIELD_PADDING, TEXT_FIELD_CARET_BLINK_MS,
+    TEXT_FIELD_KEY_REPEAT, TEXT_FIELD_LATENCY_WINDOW
+)
+from utils.input_state import input_state
+
+
+class TextField:
+    """
+    Single-line text input widget.
+
+    Text arrives through TEXTINPUT (and TEXTEDITING for IME composition),
+    editing keys through KEYDOWN. The text surface is rendered only when
+    the text changes, and the pixel width of every prefix is cached, so
+    caret placement and horizontal scrolling are lookups. The widget sets
+    `dirty` instead of drawing, so the screen redraws only its rect.
+    """
+    def __init__(self, rect, font, text_color=COLORS['BLACK'], allowed=None,
+                 max_length=TEXT_FIELD_MAX_LENGTH, padding=TEXT_FIELD_PADDING,
+                 on_change=None):
+        """
+        Initialize a text field.
+
+        Args:
+            rect: Pygame Rect of the field; text is clipped to it
+            font: Font used for the text
+            text_color: Text and caret color
+            allowed: Predicate for accepted characters (None accepts all)
+            max_length: Longest accepted text
+            padding: Horizontal space between the rect edge and the text
+            on_change: Called with no arguments after every text change
+        """
+        self.rect = pygame.Rect(rect)
+        self.font = font
+        self.text_color = text_color
+        self.allowed = allowed
+        self.max_length = max_length
+        self.padding = padding
+        self.on_change = on_change
+
+        self.text = ""
+        self.caret = 0
+        self.composition = ""
+        self.active = False
+        self.dirty = True
+        self.scroll_x = 0
+        self.caret_visible = True
+        self._blink_at = None
+
+        # _widths[i] is the rendered width of text[:i]
+        self._widths = [0]
+        self._surface = None
+        self._composition_surface = None
+
+        # Input-to-display latency
+        self._input_started = None
+        self.latencies = deque(maxlen=TEXT_FIELD_LATENCY_WINDOW)
+
+    @property
+    def inner_rect(self):
+        return self.rect.inflate(-2 * self.padding, 0)
+
+    # Focus
+
+    def set_active(self, active):
+        """Give or take keyboard focus, enabling key repeat and IME input."""
+        if active == self.active:
+            return
+        self.active = active
+        self.composition = ""
+        if active:
+            pygame.key.start_text_input()
+            pygame.key.set_text_input_rect(self.rect)
+            pygame.key.set_repeat(*TEXT_FIELD_KEY_REPEAT)
+            self._restart_blink()
+        else:
+            pygame.key.stop_text_input()
+            pygame.key.set_repeat(0, 0)
+        self._changed(text_changed=False)
+
+    # Editing
+
+    def set_text(self, text):
+        text = text[:self.max_length]
+        self.text = text
+        self.caret = len(text)
+        self._widths = [0]
+        self._measure_from(0)
+        self._changed()
+
+    def insert(self, text):
+        if self.allowed is not None:
+            text = "".join(char for char in text if self.allowed(char))
+        text = text[:self.max_length - len(self.text)]
+        if not text:
+            return False
+        self.text = self.text[:self.caret] + text + self.text[self.caret:]
+        start = self.caret
+        self.caret += len(text)
+        self._measure_from(start)
+        self._changed()
+        return True
+
+    def delete(self, start, end):
+        """Remove text[start:end] and leave the caret at start."""
+        start, end = max(0, start), min(len(self.text), end)
+        if start >= end:
+            return False
+        self.text = self.text[:start] + self.text[end:]
+        self.caret = start
+        self._measure_from(start)
+        self._changed()
+        return True
+
+    def move_caret(self, position):
+        position = max(0, min(len(self.text), position))
+        if position != self.caret:
+            self.caret = position
+            self._changed(text_changed=False)
+
+    def caret_at(self, x):
+        """Text index nearest to a display x coordinate."""
+        target = x - self.inner_rect.left + self.scroll_x
+        index = bisect_left(self._widths, target)
+        if index > 0 and (index == len(self._widths) or target - self._widths[index - 1] < self._widths[index] - target):
+            index -= 1
+        return min(index, len(self.text))
+
+    def _measure_from(self, start):
+        """Re-measure prefix widths from start, the first changed index."""
+        del self._widths[start + 1:]
+        size = self.font.size
+        text = self.text
+        self._widths.extend(size(text[:i])[0] for i in range(start + 1, len(text) + 1))
+
+    def _changed(self, text_changed=True):
+        if text_changed:
+            self._surface = None
+            if self.on_change is not None:
+                self.on_change()
+        self._scroll_to_caret()
+        self._restart_blink()
+        self.dirty = True
+
+    def _scroll_to_caret(self):
+        visible = self.inner_rect.width
+        caret_x = self.caret_x()
+        if caret_x - self.scroll_x > visible:
+            self.scroll_x = caret_x - visible
+        elif caret_x < self.scroll_x:
+            self.scroll_x = caret_x
+        # Never scroll past the end, so deleting pulls the text back into view
+        overflow = self._widths[-1] + caret_x - self._widths[self.caret] - visible
+        self.scroll_x = max(0, min(self.scroll_x, overflow))
+
+    def caret_x(self):
+        """Caret offset from the start of the text, including any IME composition."""
+        x = self._widths[self.caret]
+        if self.composition:
+            x += self.font.size(self.composition)[0]
+        return x
+
+    # Events
+
+    def handle_event(self, event):
+        """
+        Apply an input event.
+
+        Returns:
+            bool: True if the field consumed the event
+        """
+        started = time.perf_counter()
+        consumed = self._apply_event(event)
+        if consumed and self.dirty and self._input_started is None:
+            self._input_started = started
+        return consumed
+
+    def _apply_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            inside = self.rect.collidepoint(event.pos)
+            self.set_active(inside)
+            if inside:
+                self.move_caret(self.caret_at(event.pos[0]))
+            return inside
+        if not self.active:
+            return False
+
+        if event.type == pygame.TEXTINPUT:
+            self.composition = ""
+            self.insert(event.text)
+            return True
+        if event.type == pygame.TEXTEDITING:
+            self.composition = event.text
+            self._composition_surface = None
+            self._changed(text_changed=False)
+            return True
+        if event.type == pygame.KEYDOWN:
+            key = event.key
+            if key == pygame.K_BACKSPACE:
+                self.delete(self.caret - 1, self.caret)
+            elif key == pygame.K_DELETE:
+                self.delete(self.caret, self.caret + 1)
+            elif key == pygame.K_LEFT:
+                self.move_caret(self.caret - 1)
+            elif key == pygame.K_RIGHT:
+                self.move_caret(self.caret + 1)
+            elif key == pygame.K_HOME:
+                self.move_caret(0)
+            elif key == pygame.K_END:
+                self.move_caret(len(self.text))
+            else:
+                # Printable keys arrive again as TEXTINPUT
+                return False
+            return True
+        return False
+
+    # Caret blink
+
+    def _restart_blink(self):
+        self.caret_visible = True
+        if TEXT_FIELD_CARET_BLINK_MS and self.active:
+            self._blink_at = input_state.get_ticks() + TEXT_FIELD_CARET_BLINK_MS
+        else:
+            self._blink_at = None
+
+    def update(self, now=None):
+        """Toggle the caret when its blink timer expires."""
+        if self._blink_at is None:
+            return
+        now = input_state.get_ticks() if now is None else now
+        if now >= self._blink_at:
+            self.caret_visible = not self.caret_visible
+            self._blink_at = now + TEXT_FIELD_CARET_BLINK_MS
+            self.dirty = True
+
+    def next_wakeup(self):
+        """Tick count of the next caret blink, or None."""
+        return self._blink_at
+
+    # Drawing
+
+    def draw(self, surface):
+        """Draw the visible slice of the text and the caret onto a canvas."""
+        inner = self.inner_rect
+        if self._surface is None:
+            self._surface = self.font.render(self.text, True, self.text_color)
+        text_y = inner.centery - self._surface.get_height() // 2
+
+        previous_clip = surface.get_clip()
+        surface.set_clip(inner.clip(previous_clip))
+        left = inner.left - self.scroll_x
+        if self.composition:
+            # Show the IME composition, underlined, at the caret
+            split_x = self._widths[self.caret]
+            if self._composition_surface is None:
+                self._composition_surface = self.font.render(self.composition, True, self.text_color)
+            composition_width = self._composition_surface.get_width()
+            surface.blit(self._surface, (left, text_y), pygame.Rect(0, 0, split_x, self._surface.get_height()))
+            surface.blit(self._composition_surface, (left + split_x, text_y))
+            surface.blit(
+                self._surface,
+                (left + split_x + composition_width, text_y),
+                pygame.Rect(split_x, 0, self._surface.get_width() - split_x, self._surface.get_height())
+            )
+            underline_y = text_y + self._composition_surface.get_height() - 2
+            surface.draw_line(self.text_color, (left + split_x, underline_y),
+                              (left + split_x + composition_width, underline_y))
+        else:
+            surface.blit(self._surface, (left, text_y))
+
+        if self.active and self.caret_visible:
+            caret_x = left + self.caret_x()
+            surface.draw_line(self.text_color, (caret_x, text_y + 4),
+                              (caret_x, text_y + self._surface.get_height() - 4), 2)
+        surface.set_clip(previous_clip)
+
+    # Latency
+
+    def on_presented(self):
+        """Record input-to-display latency once the frame reached the screen."""
+        if self._input_started is not None:
+            self.latencies.append((time.perf_counter() - self._input_started) * 1000)
+            self._input_started = None
+
+    def get_latency_stats(self):
+        """p50/p95/max milliseconds from input dispatch to display update."""
+        if not self.latencies:
+            return {'samples': 0}
+        ordered = sorted(self.latencies)
+        return {
+            'samples': len(ordered),
+            'p50': round(ordered[len(ordered) // 2], 3),
+            'p95': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+            'max': round(ordered[-1], 3)
+        }